@@ -480,24 +480,10 @@ ON DUPLICATE KEY UPDATE name = name;
 
 DELIMITER $$
 
--- Trigger 1: Limpiar suspensiones expiradas automáticamente
+-- Trigger 1 (trg_check_suspension_on_login) eliminado: la reactivación de
+-- suspensiones vencidas la hace `python manage.py lift_expired_suspensions`
 DROP TRIGGER IF EXISTS trg_check_suspension_on_login$$
 
-CREATE TRIGGER trg_check_suspension_on_login
-BEFORE UPDATE ON users_user
-FOR EACH ROW
-BEGIN
-    -- Si usuario intenta iniciar sesión y su suspensión ya expiró, reactivar
-    IF NEW.last_login IS NOT NULL 
-       AND (OLD.last_login IS NULL OR NEW.last_login > OLD.last_login)
-       AND NEW.is_active = FALSE 
-       AND NEW.suspension_end_at IS NOT NULL 
-       AND NEW.suspension_end_at < CURDATE() THEN
-        SET NEW.is_active = TRUE;
-        SET NEW.suspension_end_at = NULL;
-    END IF;
-END$$
-
 -- Trigger 2: Validar mínimo 1 foto antes de marcar listing como disponible
 DROP TRIGGER IF EXISTS trg_listing_require_photos$$
 
@@ -774,34 +760,14 @@ END$$
 DELIMITER ;
 
 -- =====================================================
--- 📅 EVENTO PROGRAMADO: Auto-reactivación de usuarios
+-- 📅 REACTIVACIÓN DE SUSPENSIONES VENCIDAS
 -- =====================================================
--- Este evento se ejecuta diariamente para reactivar automáticamente
--- a los usuarios cuya suspensión ya expiró, sin necesidad de que
--- intenten hacer login.
-
--- Habilitar el programador de eventos (Event Scheduler)
-SET GLOBAL event_scheduler = ON;
-
-DELIMITER $$
-
-DROP EVENT IF EXISTS evt_auto_unsuspend_users$$
-
-CREATE EVENT evt_auto_unsuspend_users
-ON SCHEDULE EVERY 1 DAY
-STARTS CURRENT_TIMESTAMP
-DO
-BEGIN
-    -- Reactivar usuarios cuya suspensión ya expiró
-    UPDATE users_user
-    SET is_active = TRUE,
-        suspension_end_at = NULL
-    WHERE is_active = FALSE
-      AND suspension_end_at IS NOT NULL
-      AND suspension_end_at < CURDATE();
-END$$
+-- El antiguo EVENT evt_auto_unsuspend_users (y el event_scheduler) se
+-- reemplazó por el comando de Django `lift_expired_suspensions`, que
+-- funciona igual en MySQL y SQLite. Programarlo diariamente (cron) o
+-- ejecutarlo como worker con --interval.
 
-DELIMITER ;
+DROP EVENT IF EXISTS evt_auto_unsuspend_users;
 
 
 SET FOREIGN_KEY_CHECKS = 1;
@@ -878,3 +844,149 @@ ALTER TABLE review
 ADD CONSTRAINT unique_student_listing 
 UNIQUE (student_id, listing_id)
 COMMENT '1 review por student/listing (regla de negocio)';
+
+-- -------------------------------------------------------------------------
+-- FIX 3: Cola de moderación con lease (claimed_by / claimed_until)
+-- -------------------------------------------------------------------------
+-- Problema: Varios moderadores trabajan sobre el mismo changelist y revisan
+--           los mismos reportes a la vez
+-- Solución: Lease por reporte (inquiries.services.ModerationQueueService),
+--           tomado con SELECT ... FOR UPDATE SKIP LOCKED + UPDATE condicional
+
+ALTER TABLE report
+ADD COLUMN claimed_by BIGINT NULL COMMENT 'Admin que tiene el reporte tomado en la cola',
+ADD COLUMN claimed_until DATETIME NULL COMMENT 'Fin del lease de moderación';
+
+ALTER TABLE report
+ADD CONSTRAINT report_claimed_by_fk
+    FOREIGN KEY (claimed_by) REFERENCES admin(id)
+    ON DELETE SET NULL;
+
+CREATE INDEX ix_report_queue ON report(status, claimed_until);
+
+-- -------------------------------------------------------------------------
+-- FIX 4: Reactivación de suspensiones desde Django (sin EVENT ni trigger)
+-- -------------------------------------------------------------------------
+-- Problema: evt_auto_unsuspend_users requiere event_scheduler=ON y ni el
+--           EVENT ni trg_check_suspension_on_login existen en SQLite
+-- Solución: Comando `python manage.py lift_expired_suspensions`, que recorre
+--           users_user por suspension_end_at en lotes indexados
+
+DROP EVENT IF EXISTS evt_auto_unsuspend_users;
+DROP TRIGGER IF EXISTS trg_check_suspension_on_login;
+
+CREATE INDEX idx_users_user_suspension_end ON users_user(suspension_end_at);
+
+-- -------------------------------------------------------------------------
+-- FIX 5: Contadores de comentarios y reseñas por listing
+-- -------------------------------------------------------------------------
+-- Problema: La lista pública y el panel del arrendador necesitan
+--           COUNT/AVG por listing para mostrar comentarios y rating
+-- Solución: Contadores mantenidos por listings.services.ListingCounterService
+--           (UPDATE con F() desde las vistas); el comando
+--           `python manage.py reconcile_listing_counters` corrige desvíos.
+--           updated_at se reasigna a sí mismo para no disparar ON UPDATE
+
+ALTER TABLE listing
+ADD COLUMN comment_count INT UNSIGNED NOT NULL DEFAULT 0 COMMENT 'Comentarios y respuestas',
+ADD COLUMN review_count INT UNSIGNED NOT NULL DEFAULT 0 COMMENT 'Reseñas',
+ADD COLUMN rating_sum INT UNSIGNED NOT NULL DEFAULT 0 COMMENT 'Suma de ratings (promedio = rating_sum / review_count)';
+
+UPDATE listing l
+SET l.comment_count = (SELECT COUNT(*) FROM comment c WHERE c.listing_id = l.id),
+    l.review_count = (SELECT COUNT(*) FROM review r WHERE r.listing_id = l.id),
+    l.rating_sum = (SELECT COALESCE(SUM(r.rating), 0) FROM review r WHERE r.listing_id = l.id),
+    l.updated_at = l.updated_at;
+
+-- -------------------------------------------------------------------------
+-- FIX 6: Ruta materializada en comment (hilos de cualquier profundidad)
+-- -------------------------------------------------------------------------
+-- Problema: parent_comment_id es una lista de adyacencia; cargar un hilo
+--           requiere una query por nivel
+-- Solución: path = ids de ancestros y propio con 10 dígitos y '/' final
+--           ("0000000012/0000000045/"), depth = nivel (0 = primer nivel).
+--           Un hilo es path LIKE '<path raíz>%' sobre idx_comment_path.
+--           Comment.save() completa path/depth tras el INSERT (necesita el
+--           id); los triggers 4 y 5 siguen validando el mismo listing.
+--           ascii_bin: Django usa LIKE BINARY para startswith en MySQL
+
+ALTER TABLE comment
+ADD COLUMN path VARCHAR(255) CHARACTER SET ascii COLLATE ascii_bin NOT NULL DEFAULT '' COMMENT 'Ruta materializada del hilo',
+ADD COLUMN depth SMALLINT UNSIGNED NOT NULL DEFAULT 0 COMMENT 'Profundidad en el hilo (0 = primer nivel)';
+
+UPDATE comment c
+JOIN (
+    WITH RECURSIVE tree (id, path, depth) AS (
+        SELECT id, CAST(CONCAT(LPAD(id, 10, '0'), '/') AS CHAR(255)), 0
+          FROM comment
+         WHERE parent_comment_id IS NULL
+        UNION ALL
+        SELECT child.id, CONCAT(tree.path, LPAD(child.id, 10, '0'), '/'), tree.depth + 1
+          FROM comment child
+          JOIN tree ON child.parent_comment_id = tree.id
+    )
+    SELECT id, path, depth FROM tree
+) t ON t.id = c.id
+SET c.path = t.path,
+    c.depth = t.depth,
+    c.updated_at = c.updated_at;
+
+CREATE INDEX idx_comment_path ON comment(path);
+
+-- -------------------------------------------------------------------------
+-- FIX 7: Estadísticas diarias y mensuales por listing
+-- -------------------------------------------------------------------------
+-- Problema: listing.views es un contador total; el panel del arrendador no
+--           puede mostrar tendencias sin guardar eventos crudos
+-- Solución: Una fila por listing y día (listings.analytics.ListingStatsService,
+--           UPDATE con incremento y INSERT si no existe). Las vistas llegan
+--           agrupadas desde el buffer del beacon. `python manage.py
+--           compact_listing_stats` pasa los días viejos a listing_monthly_stats.
+--           La gráfica de 90 días lee ~90 filas agregadas por día
+
+CREATE TABLE listing_daily_stats (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    listing_id BIGINT NOT NULL,
+    day DATE NOT NULL,
+    views INT UNSIGNED NOT NULL DEFAULT 0,
+    favorites_added INT UNSIGNED NOT NULL DEFAULT 0,
+    comments INT UNSIGNED NOT NULL DEFAULT 0,
+    reviews INT UNSIGNED NOT NULL DEFAULT 0,
+    CONSTRAINT listing_daily_stats_listing_fk
+        FOREIGN KEY (listing_id)
+        REFERENCES listing(id)
+        ON DELETE CASCADE,
+    UNIQUE KEY uq_listing_daily_stats (listing_id, day),
+    INDEX idx_listing_daily_stats_day (day)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='Actividad diaria por listing (vistas, favoritos, comentarios, reseñas)';
+
+CREATE TABLE listing_monthly_stats (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    listing_id BIGINT NOT NULL,
+    month DATE NOT NULL COMMENT 'Primer día del mes',
+    views INT UNSIGNED NOT NULL DEFAULT 0,
+    favorites_added INT UNSIGNED NOT NULL DEFAULT 0,
+    comments INT UNSIGNED NOT NULL DEFAULT 0,
+    reviews INT UNSIGNED NOT NULL DEFAULT 0,
+    CONSTRAINT listing_monthly_stats_listing_fk
+        FOREIGN KEY (listing_id)
+        REFERENCES listing(id)
+        ON DELETE CASCADE,
+    UNIQUE KEY uq_listing_monthly_stats (listing_id, month)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+COMMENT='Actividad mensual por listing (días compactados)';
+
+-- Historial disponible: favoritos, comentarios y reseñas por fecha de creación
+-- (las vistas anteriores solo existen en listing.views)
+INSERT INTO listing_daily_stats (listing_id, day, favorites_added)
+SELECT listing_id, DATE(created_at), COUNT(*) FROM favorite GROUP BY listing_id, DATE(created_at)
+ON DUPLICATE KEY UPDATE favorites_added = favorites_added + VALUES(favorites_added);
+
+INSERT INTO listing_daily_stats (listing_id, day, comments)
+SELECT listing_id, DATE(created_at), COUNT(*) FROM comment GROUP BY listing_id, DATE(created_at)
+ON DUPLICATE KEY UPDATE comments = comments + VALUES(comments);
+
+INSERT INTO listing_daily_stats (listing_id, day, reviews)
+SELECT listing_id, DATE(created_at), COUNT(*) FROM review GROUP BY listing_id, DATE(created_at)
+ON DUPLICATE KEY UPDATE reviews = reviews + VALUES(reviews);
@@ -0,0 +1,80 @@
+"""
+Configuración de gunicorn para UMIGO.
+
+Uso (docker-compose.prod.yaml):
+    gunicorn -c gunicorn.conf.py
+
+Dos modos, elegidos con GUNICORN_APP:
+- wsgi (default): umigo.wsgi:application con workers gthread. Un request
+  lento (p. ej. el envío SMTP del registro) solo ocupa un thread, no el worker.
+- asgi: umigo.asgi:application con workers de uvicorn (paquete uvicorn-worker).
+  Conviene cuando las vistas async están habilitadas; las vistas sync corren
+  en un único thread por worker bajo ASGI. En este modo settings fuerza
+  CONN_MAX_AGE=0 (sin conexiones persistentes, como recomienda Django).
+
+Todos los valores se pueden sobreescribir con variables GUNICORN_*.
+"""
+import multiprocessing
+import os
+import shutil
+
+app_mode = os.getenv('GUNICORN_APP', 'wsgi').lower()
+cpu_count = multiprocessing.cpu_count()
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+if app_mode == 'asgi':
+    wsgi_app = 'umigo.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    # Event loop: un worker por CPU es suficiente
+    workers = int(os.getenv('GUNICORN_WORKERS', cpu_count))
+else:
+    wsgi_app = 'umigo.wsgi:application'
+    worker_class = 'gthread'
+    workers = int(os.getenv('GUNICORN_WORKERS', cpu_count * 2 + 1))
+    # Cada thread mantiene su propia conexión a MySQL si DB_CONN_MAX_AGE > 0:
+    # workers * threads no debería superar max_connections del servidor
+    threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+# Requests colgados se matan a los 30s; al reiniciar se dan 30s para terminar
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+# nginx mantiene conexiones keep-alive hacia gunicorn
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+# Reciclar workers periódicamente (fugas de memoria); el jitter evita que
+# todos se reinicien a la vez
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+# El heartbeat de los workers en /dev/shm evita bloqueos por disco en Docker
+worker_tmp_dir = os.getenv('GUNICORN_WORKER_TMP_DIR', '/dev/shm')
+
+# GUNICORN_ACCESSLOG vacío desactiva el access log
+accesslog = os.getenv('GUNICORN_ACCESSLOG', '-') or None
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOGLEVEL', 'info')
+
+
+# Métricas Prometheus en modo multiproceso (umigo/metrics.py): cada worker
+# escribe en PROMETHEUS_MULTIPROC_DIR. Se vacía al arrancar el master y se
+# descartan los archivos de los workers que terminan.
+prometheus_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+
+
+def on_starting(server):
+    if prometheus_dir:
+        shutil.rmtree(prometheus_dir, ignore_errors=True)
+        os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if prometheus_dir:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
+
+
+# Visitas acumuladas en el worker (listings/analytics.py): se escriben antes de salir
+def worker_exit(server, worker):
+    from listings.analytics import view_buffer
+    view_buffer.flush()
@@ -1,10 +1,16 @@
 from django.contrib import admin
 from django.contrib.admin import ModelAdmin
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
 from django.utils.html import format_html
-from django.urls import reverse
+from django.urls import path, reverse
 from django.db import transaction
+from django.utils import timezone
 from .models import Report, UserReport, ListingReport
 from .admin_forms import ReportAdminForm
+from .services import ModerationQueueService, ReportTargetService
 from operations.models import Admin
 
 
@@ -24,13 +30,25 @@ class ReportAdmin(ModelAdmin):
     Note: Moderation is handled by Report.save() in models.py
     """
     form = ReportAdminForm  # Custom form that auto-assigns reviewed_by
-    list_display = ('id', 'reporter_link', 'target_display', 'reason_short', 'status', 'created_at', 'reviewed_by_link')
+    list_display = ('id', 'reporter_link', 'target_display', 'reason_short', 'status', 'created_at', 'reviewed_by_link', 'claim_display')
     list_filter = ('status', 'created_at', 'updated_at')
     search_fields = ('reason', 'reporter__username', 'reporter__email')
     readonly_fields = ('reporter', 'created_at', 'updated_at')
     date_hierarchy = 'created_at'
     ordering = ('-created_at',)
-    actions = ['accept_reports', 'reject_reports']
+    actions = ['accept_reports', 'reject_reports', 'release_reports']
+    list_select_related = (
+        'reporter',
+        'reviewed_by__user',
+        'claimed_by__user',
+        'userreport__reported_user',
+        'listingreport__listing',
+    )
+
+    # Cuántos reportes toma un moderador con "Tomar siguientes"
+    QUEUE_BATCH_SIZE = 10
+    # Objetivos por página en la vista agrupada
+    TARGETS_PER_PAGE = 50
 
     fieldsets = (
         ('Report Information', {
@@ -57,18 +75,16 @@ class ReportAdmin(ModelAdmin):
     def target_display(self, obj):
         """Display the target (user or listing) with admin link."""
         try:
-            user_report = UserReport.objects.get(report_id=obj.id)
-            if user_report.reported_user:
-                url = reverse('admin:users_user_change', args=[user_report.reported_user.pk])
-                return format_html('👤 <a href="{}">User: {}</a>', url, user_report.reported_user.username)
+            reported_user = obj.userreport.reported_user
+            url = reverse('admin:users_user_change', args=[reported_user.pk])
+            return format_html('👤 <a href="{}">User: {}</a>', url, reported_user.username)
         except UserReport.DoesNotExist:
             pass
 
         try:
-            listing_report = ListingReport.objects.get(report_id=obj.id)
-            if listing_report.listing:
-                url = reverse('admin:listings_listing_change', args=[listing_report.listing.pk])
-                return format_html('🏠 <a href="{}">Listing: {}</a>', url, listing_report.listing.location_text)
+            listing = obj.listingreport.listing
+            url = reverse('admin:listings_listing_change', args=[listing.pk])
+            return format_html('🏠 <a href="{}">Listing: {}</a>', url, listing.location_text)
         except ListingReport.DoesNotExist:
             pass
 
@@ -90,6 +106,103 @@ class ReportAdmin(ModelAdmin):
             return format_html('<a href="{}">{}</a>', url, username)
         return '-'
     reviewed_by_link.short_description = 'Reviewed By'
+
+    def claim_display(self, obj):
+        """Show who holds the moderation lease, if it is still valid."""
+        if obj.claimed_by_id and obj.claimed_until and obj.claimed_until > timezone.now():
+            return f"{obj.claimed_by} (hasta {timezone.localtime(obj.claimed_until):%H:%M})"
+        return '-'
+    claim_display.short_description = 'Claimed By'
+
+    def _get_admin_profile(self, request):
+        """Get or create the Admin profile of the current staff user."""
+        admin_obj = getattr(request.user, 'admin_profile', None)
+        if admin_obj is None:
+            admin_obj = Admin.objects.create(user=request.user)
+        return admin_obj
+
+    def get_urls(self):
+        """Add the moderation queue endpoint before the default admin URLs."""
+        custom_urls = [
+            path(
+                'claim-next/',
+                self.admin_site.admin_view(self.claim_next_view),
+                name='inquiries_report_claim_next',
+            ),
+            path(
+                'targets/',
+                self.admin_site.admin_view(self.targets_view),
+                name='inquiries_report_targets',
+            ),
+            path(
+                'targets/resolve/',
+                self.admin_site.admin_view(self.resolve_target_view),
+                name='inquiries_report_resolve_target',
+            ),
+        ]
+        return custom_urls + super().get_urls()
+
+    def claim_next_view(self, request):
+        """
+        Claim the next QUEUE_BATCH_SIZE reports by priority for the current
+        moderator and show them in the changelist.
+        """
+        changelist_url = reverse('admin:inquiries_report_changelist')
+        if request.method != 'POST' or not request.user.is_staff:
+            return redirect(changelist_url)
+
+        reports = ModerationQueueService.claim(
+            self._get_admin_profile(request),
+            limit=self.QUEUE_BATCH_SIZE,
+        )
+        if not reports:
+            self.message_user(request, 'No hay reportes pendientes en la cola.')
+            return redirect(changelist_url)
+
+        self.message_user(request, f'{len(reports)} report(s) claimed.')
+        ids = ','.join(str(report.pk) for report in reports)
+        return redirect(f'{changelist_url}?id__in={ids}')
+
+    def targets_view(self, request):
+        """
+        One row per reported user/listing with pending reports: count, first
+        and last report time and a few sample reasons.
+        """
+        paginator = Paginator(ReportTargetService.pending_targets(), self.TARGETS_PER_PAGE)
+        page = paginator.get_page(request.GET.get('page'))
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Reportes pendientes por objetivo',
+            'page_obj': page,
+            'targets': ReportTargetService.decorate_targets(page.object_list),
+        }
+        return TemplateResponse(request, 'admin/inquiries/report/targets.html', context)
+
+    def resolve_target_view(self, request):
+        """Accept or reject every pending report of one target."""
+        targets_url = reverse('admin:inquiries_report_targets')
+        if request.method != 'POST' or not request.user.is_staff:
+            return redirect(targets_url)
+
+        decision = request.POST.get('decision')
+        status = {'accept': 'ACCEPTED', 'reject': 'REJECTED'}.get(decision)
+        try:
+            resolved = ReportTargetService.resolve_target(
+                request.POST.get('target_type'),
+                int(request.POST.get('target_id', 0)),
+                status,
+                self._get_admin_profile(request),
+            )
+        except (ValidationError, ValueError) as e:
+            error_msg = e.messages[0] if hasattr(e, 'messages') and e.messages else str(e)
+            self.message_user(request, error_msg, level='error')
+            return redirect(targets_url)
+
+        verb = 'accepted' if status == 'ACCEPTED' else 'rejected'
+        self.message_user(request, f'{resolved} report(s) {verb} successfully.')
+        return redirect(targets_url)
     
     def get_form(self, request, obj=None, **kwargs):
         """Inject request into the form so it can access current user."""
@@ -149,6 +262,15 @@ class ReportAdmin(ModelAdmin):
                     count += 1
         self.message_user(request, f'{count} report(s) rejected successfully.')
 
+    @admin.action(description='↩️ Release selected reports back to the queue')
+    def release_reports(self, request, queryset):
+        """Bulk action to give back reports claimed by the current moderator."""
+        admin_obj = getattr(request.user, 'admin_profile', None)
+        count = 0
+        if admin_obj is not None:
+            count = queryset.filter(claimed_by=admin_obj).update(claimed_by=None, claimed_until=None)
+        self.message_user(request, f'{count} report(s) released.')
+
 
 @admin.register(UserReport)
 class UserReportAdmin(ModelAdmin):
@@ -36,6 +36,21 @@ class Report(models.Model):
         help_text='Administrador que revisó el reporte'
     )
     reviewed_at = models.DateTimeField(null=True, blank=True)
+    # Lease de la cola de moderación (ver ModerationQueueService)
+    claimed_by = models.ForeignKey(
+        Admin,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_column='claimed_by',
+        related_name='claimed_reports',
+        help_text='Administrador que tiene el reporte tomado en la cola'
+    )
+    claimed_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Fin del lease; después de esta fecha otro moderador puede tomarlo'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -46,6 +61,7 @@ class Report(models.Model):
             models.Index(fields=['reporter'], name='ix_report_reporter'),
             models.Index(fields=['status'], name='ix_report_status'),
             models.Index(fields=['reviewed_by'], name='ix_report_reviewer'),
+            models.Index(fields=['status', 'claimed_until'], name='ix_report_queue'),
         ]
 
     def __str__(self):
@@ -117,6 +133,11 @@ class Report(models.Model):
         # Auto-establecer reviewed_at cuando se cambia el status (emula trigger trg_report_review_validation)
         if self.status != 'UNDER_REVIEW' and self.reviewed_by and not self.reviewed_at:
             self.reviewed_at = timezone.now()
+
+        # Un reporte resuelto sale de la cola: liberar el lease
+        if self.status != 'UNDER_REVIEW':
+            self.claimed_by = None
+            self.claimed_until = None
         
         self.clean()
         super().save(*args, **kwargs)
@@ -14,7 +14,9 @@ Note: Auto-moderation logic is in inquiries/models.py Report._apply_user_moderat
 This service only handles report creation and validation.
 """
 from datetime import timedelta
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, Max, Min, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from .models import Report, UserReport, ListingReport
@@ -330,3 +332,328 @@ class ReportService:
             return (True, "")
         except ValidationError as e:
             return (False, str(e))
+
+
+class ModerationQueueService:
+    """
+    Cola de moderación sobre Report para varios moderadores en paralelo.
+
+    Los reportes UNDER_REVIEW se ordenan por prioridad y se "toman" con un
+    lease (claimed_by / claimed_until). Mientras el lease está vigente ningún
+    otro moderador recibe ese reporte; si expira, vuelve a la cola.
+
+    Prioridad (mayor primero):
+        - Reportes pendientes contra el mismo objetivo (usuario o listing)
+        - Historial del reporter: + reportes aceptados, - reportes rechazados
+        - Antigüedad: los reportes con más de STALE_AFTER_HOURS suben
+    Empates: el más antiguo primero.
+
+    Usage:
+        reports = ModerationQueueService.claim(admin, limit=10)
+        ...
+        ModerationQueueService.release(report, admin)
+    """
+
+    LEASE_MINUTES = 15
+    STALE_AFTER_HOURS = 48
+
+    TARGET_WEIGHT = 10
+    REPORTER_ACCEPTED_WEIGHT = 5
+    REPORTER_REJECTED_WEIGHT = 5
+    STALE_BOOST = 20
+
+    @classmethod
+    def _count_subquery(cls, queryset, group_field):
+        """COUNT(*) correlacionado, 0 si no hay filas."""
+        counted = (
+            queryset
+            .order_by()
+            .values(group_field)
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        return Coalesce(Subquery(counted[:1]), Value(0))
+
+    @classmethod
+    def pending(cls, now=None):
+        """
+        Reportes disponibles en la cola (sin lease vigente), anotados con
+        target_reports, reporter_accepted, reporter_rejected y priority.
+
+        Args:
+            now (datetime, optional): Instante de referencia (para tests)
+
+        Returns:
+            QuerySet: Reports ordenados por prioridad
+        """
+        now = now or timezone.now()
+        stale_threshold = now - timedelta(hours=cls.STALE_AFTER_HOURS)
+
+        user_target_reports = cls._count_subquery(
+            UserReport.objects.filter(
+                reported_user_id=OuterRef('userreport__reported_user_id'),
+                report__status='UNDER_REVIEW',
+            ),
+            'reported_user_id',
+        )
+        listing_target_reports = cls._count_subquery(
+            ListingReport.objects.filter(
+                listing_id=OuterRef('listingreport__listing_id'),
+                report__status='UNDER_REVIEW',
+            ),
+            'listing_id',
+        )
+        reporter_accepted = cls._count_subquery(
+            Report.objects.filter(reporter_id=OuterRef('reporter_id'), status='ACCEPTED'),
+            'reporter_id',
+        )
+        reporter_rejected = cls._count_subquery(
+            Report.objects.filter(reporter_id=OuterRef('reporter_id'), status='REJECTED'),
+            'reporter_id',
+        )
+
+        return (
+            Report.objects
+            .filter(status='UNDER_REVIEW')
+            .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lte=now))
+            .annotate(
+                target_reports=user_target_reports + listing_target_reports,
+                reporter_accepted=reporter_accepted,
+                reporter_rejected=reporter_rejected,
+                stale_boost=Case(
+                    When(created_at__lte=stale_threshold, then=Value(cls.STALE_BOOST)),
+                    default=Value(0),
+                ),
+            )
+            .annotate(
+                priority=(
+                    F('target_reports') * cls.TARGET_WEIGHT
+                    + F('reporter_accepted') * cls.REPORTER_ACCEPTED_WEIGHT
+                    - F('reporter_rejected') * cls.REPORTER_REJECTED_WEIGHT
+                    + F('stale_boost')
+                )
+            )
+            .order_by('-priority', 'created_at', 'id')
+        )
+
+    @classmethod
+    def _candidate_ids(cls, now, limit):
+        """
+        IDs candidatos en orden de prioridad. Donde la BD lo soporta (MySQL 8)
+        se usa SELECT ... FOR UPDATE SKIP LOCKED para que dos moderadores
+        concurrentes no compitan por las mismas filas.
+        """
+        queryset = cls.pending(now)
+        if connection.features.has_select_for_update_skip_locked:
+            lock_kwargs = {'skip_locked': True}
+            if connection.features.has_select_for_update_of:
+                lock_kwargs['of'] = ('self',)
+            queryset = queryset.select_for_update(**lock_kwargs)
+            return list(queryset.values_list('id', flat=True)[:limit])
+        # Sin SKIP LOCKED (p. ej. SQLite) pedimos margen extra: el UPDATE
+        # condicional de claim() descarta los que otro moderador ya tomó.
+        return list(queryset.values_list('id', flat=True)[:limit * 2])
+
+    @classmethod
+    @transaction.atomic
+    def claim(cls, admin, limit=1, now=None):
+        """
+        Toma hasta `limit` reportes de la cola para `admin`.
+
+        El lease se asigna con un UPDATE condicional por fila (compare-and-set
+        sobre claimed_until), así que es seguro aunque la BD no soporte
+        SKIP LOCKED.
+
+        Args:
+            admin (Admin): Moderador que toma los reportes
+            limit (int): Máximo de reportes a tomar
+            now (datetime, optional): Instante de referencia (para tests)
+
+        Returns:
+            list[Report]: Reportes tomados, en orden de prioridad
+        """
+        now = now or timezone.now()
+        lease_until = now + timedelta(minutes=cls.LEASE_MINUTES)
+
+        claimed_ids = []
+        for report_id in cls._candidate_ids(now, limit):
+            updated = (
+                Report.objects
+                .filter(pk=report_id, status='UNDER_REVIEW')
+                .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lte=now))
+                .update(claimed_by=admin, claimed_until=lease_until, updated_at=now)
+            )
+            if updated:
+                claimed_ids.append(report_id)
+            if len(claimed_ids) >= limit:
+                break
+
+        reports = Report.objects.in_bulk(claimed_ids)
+        return [reports[report_id] for report_id in claimed_ids]
+
+    @classmethod
+    def renew(cls, report, admin, now=None):
+        """
+        Extiende el lease de un reporte que `admin` tiene tomado.
+
+        Returns:
+            bool: True si el lease seguía siendo de `admin` y se extendió
+        """
+        now = now or timezone.now()
+        return bool(
+            Report.objects
+            .filter(pk=report.pk, status='UNDER_REVIEW', claimed_by=admin)
+            .update(claimed_until=now + timedelta(minutes=cls.LEASE_MINUTES))
+        )
+
+    @classmethod
+    def release(cls, report, admin):
+        """
+        Devuelve a la cola un reporte tomado por `admin` sin resolverlo.
+
+        Returns:
+            bool: True si el reporte estaba tomado por `admin`
+        """
+        return bool(
+            Report.objects
+            .filter(pk=report.pk, claimed_by=admin)
+            .update(claimed_by=None, claimed_until=None)
+        )
+
+
+class ReportTargetService:
+    """
+    Agrupa los reportes pendientes por objetivo (usuario o listing) para
+    revisarlos y resolverlos en bloque desde el admin.
+
+    Usage:
+        rows = ReportTargetService.pending_targets()
+        ReportTargetService.resolve_target('USER', user_id, 'ACCEPTED', admin)
+    """
+
+    REASON_SAMPLES = 3
+
+    @classmethod
+    def _target_filter(cls, target_type, target_id):
+        if target_type == 'USER':
+            return Q(userreport__reported_user_id=target_id)
+        if target_type == 'LISTING':
+            return Q(listingreport__listing_id=target_id)
+        raise ValidationError("Tipo de objetivo inválido. Debe ser 'USER' o 'LISTING'")
+
+    @classmethod
+    def pending_targets(cls):
+        """
+        Una fila por objetivo con reportes UNDER_REVIEW, en un solo GROUP BY.
+        Los reportes sin UserReport ni ListingReport no tienen objetivo y
+        se omiten.
+
+        Returns:
+            QuerySet: dicts con reported_user_id, listing_id, report_count,
+                      first_reported_at y last_reported_at
+        """
+        return (
+            Report.objects
+            .filter(status='UNDER_REVIEW')
+            .exclude(userreport__isnull=True, listingreport__isnull=True)
+            .values(
+                reported_user_id=F('userreport__reported_user_id'),
+                listing_id=F('listingreport__listing_id'),
+            )
+            .annotate(
+                report_count=Count('id'),
+                first_reported_at=Min('created_at'),
+                last_reported_at=Max('created_at'),
+            )
+            .order_by('-report_count', 'first_reported_at')
+        )
+
+    @classmethod
+    def decorate_targets(cls, rows):
+        """
+        Completa una página de pending_targets() con el objeto reportado y
+        hasta REASON_SAMPLES motivos recientes, con una consulta por tipo.
+
+        Args:
+            rows (iterable): Filas de pending_targets() (ya paginadas)
+
+        Returns:
+            list[dict]: Filas con target_type, target_id, target y reasons
+        """
+        rows = [dict(row) for row in rows]
+        user_ids = [row['reported_user_id'] for row in rows if row['reported_user_id']]
+        listing_ids = [row['listing_id'] for row in rows if row['listing_id']]
+
+        users = User.objects.in_bulk(user_ids)
+        listings = Listing.objects.in_bulk(listing_ids)
+
+        reasons = {}
+        samples = (
+            Report.objects
+            .filter(status='UNDER_REVIEW')
+            .filter(Q(userreport__reported_user_id__in=user_ids) | Q(listingreport__listing_id__in=listing_ids))
+            .order_by('-created_at')
+            .values_list('userreport__reported_user_id', 'listingreport__listing_id', 'reason')
+        )
+        for reported_user_id, listing_id, reason in samples:
+            key = ('USER', reported_user_id) if reported_user_id else ('LISTING', listing_id)
+            bucket = reasons.setdefault(key, [])
+            if len(bucket) < cls.REASON_SAMPLES:
+                bucket.append(reason)
+
+        for row in rows:
+            if row['reported_user_id']:
+                row['target_type'], row['target_id'] = 'USER', row['reported_user_id']
+                row['target'] = users.get(row['target_id'])
+            else:
+                row['target_type'], row['target_id'] = 'LISTING', row['listing_id']
+                row['target'] = listings.get(row['target_id'])
+            row['reasons'] = reasons.get((row['target_type'], row['target_id']), [])
+        return rows
+
+    @classmethod
+    @transaction.atomic
+    def resolve_target(cls, target_type, target_id, status, admin):
+        """
+        Acepta o rechaza de una vez todos los reportes pendientes de un objetivo.
+
+        La moderación automática (suspensión / eliminación) se aplica una sola
+        vez con el total de reportes aceptados, con el mismo resultado que
+        aceptarlos uno por uno.
+
+        Args:
+            target_type (str): 'USER' o 'LISTING'
+            target_id (int): ID del usuario o listing reportado
+            status (str): 'ACCEPTED' o 'REJECTED'
+            admin (Admin): Moderador que resuelve
+
+        Returns:
+            int: Número de reportes resueltos
+        """
+        if status not in ('ACCEPTED', 'REJECTED'):
+            raise ValidationError("El estado debe ser 'ACCEPTED' o 'REJECTED'")
+        if admin is None:
+            raise ValidationError(
+                "Los reportes aceptados o rechazados deben tener un administrador asignado"
+            )
+
+        pending = Report.objects.filter(
+            cls._target_filter(target_type, target_id),
+            status='UNDER_REVIEW',
+        )
+        sample = pending.first()
+        now = timezone.now()
+        resolved = pending.update(
+            status=status,
+            reviewed_by=admin,
+            reviewed_at=now,
+            claimed_by=None,
+            claimed_until=None,
+            updated_at=now,
+        )
+
+        if resolved and status == 'ACCEPTED' and target_type == 'USER':
+            sample.refresh_from_db(fields=['status'])
+            sample._apply_user_moderation_on_accept()
+
+        return resolved
@@ -0,0 +1,186 @@
+"""
+Estadísticas por anuncio en el tiempo para el panel del arrendador.
+
+ListingStatsService:
+    Una fila por anuncio y día en listing_daily_stats (vistas, favoritos
+    agregados, comentarios, reseñas). Las vistas de escritura suman con
+    record(): UPDATE con F() y, si la fila del día no existe, INSERT.
+    La gráfica de 90 días agrega por día en BD (~90 filas). compact() pasa
+    los días viejos a listing_monthly_stats (comando compact_listing_stats).
+
+ViewCounterBuffer:
+    Las visitas (listingViewBeacon) se acumulan en memoria del worker y se
+    escriben agrupadas, un UPDATE de listing.views y un record() por anuncio,
+    cada LISTING_VIEWS_FLUSH_SECONDS o al juntar LISTING_VIEWS_FLUSH_MAX.
+    Con LISTING_VIEWS_FLUSH_SECONDS=0 (default) se escribe en cada visita.
+    gunicorn.conf.py vacía el buffer al terminar cada worker.
+
+is_new_view:
+    El beacon es anónimo y sin CSRF: cada visitante (view_visitor) cuenta una
+    vez por anuncio cada LISTING_VIEW_DEDUP_SECONDS, con una llave en la
+    cache "ratelimit" (compartida entre workers salvo con locmem).
+"""
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Listing, ListingDailyStats, ListingMonthlyStats
+
+
+class ListingStatsService:
+    """Escritura, lectura y compactación de listing_daily_stats."""
+
+    FIELDS = ('views', 'favorites_added', 'comments', 'reviews')
+    CHART_DAYS = 90
+    KEEP_DAYS = 400
+
+    @staticmethod
+    def _increment(model, lookup, deltas):
+        """Suma `deltas` a la fila de `lookup`, creándola si no existe."""
+        increments = {field: F(field) + value for field, value in deltas.items()}
+        if model.objects.filter(**lookup).update(**increments):
+            return
+        try:
+            with transaction.atomic():
+                model.objects.create(**lookup, **deltas)
+        except IntegrityError:
+            # Otro request creó la fila entre el UPDATE y el INSERT
+            model.objects.filter(**lookup).update(**increments)
+
+    @classmethod
+    def record(cls, listing_id, day=None, **deltas):
+        """Ej: record(listing.pk, comments=1)."""
+        deltas = {field: value for field, value in deltas.items() if value}
+        if deltas:
+            cls._increment(
+                ListingDailyStats,
+                {'listing_id': listing_id, 'day': day or timezone.localdate()},
+                deltas,
+            )
+
+    @classmethod
+    def daily_series(cls, landlord, days=None, today=None):
+        """
+        Totales por día de los anuncios de `landlord` en los últimos `days`
+        días, con ceros en los días sin actividad. Cada día trae `height`
+        (% del día con más vistas) para la gráfica.
+        """
+        days = days or cls.CHART_DAYS
+        today = today or timezone.localdate()
+        start = today - timedelta(days=days - 1)
+        rows = (
+            ListingDailyStats.objects
+            .filter(listing__owner=landlord, day__gte=start, day__lte=today)
+            .values('day')
+            .annotate(**{field: Sum(field) for field in cls.FIELDS})
+            .order_by('day')
+        )
+        by_day = {row['day']: row for row in rows}
+
+        series = []
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            row = by_day.get(day, {})
+            series.append({'day': day, **{field: row.get(field) or 0 for field in cls.FIELDS}})
+
+        peak = max(point['views'] for point in series) or 1
+        for point in series:
+            point['height'] = round(point['views'] * 100 / peak)
+        return series
+
+    @classmethod
+    def compact(cls, keep_days=None, today=None):
+        """
+        Suma en listing_monthly_stats los meses completos anteriores a
+        hoy - keep_days y borra esas filas diarias.
+        Devuelve (filas mensuales tocadas, filas diarias borradas).
+        """
+        today = today or timezone.localdate()
+        cutoff = (today - timedelta(days=keep_days or cls.KEEP_DAYS)).replace(day=1)
+        old = ListingDailyStats.objects.filter(day__lt=cutoff)
+        totals = (
+            old
+            .annotate(month=TruncMonth('day'))
+            .values('listing_id', 'month')
+            .annotate(**{f'total_{field}': Sum(field) for field in cls.FIELDS})
+            .order_by()
+        )
+
+        months = 0
+        with transaction.atomic():
+            for row in totals.iterator():
+                cls._increment(
+                    ListingMonthlyStats,
+                    {'listing_id': row['listing_id'], 'month': row['month']},
+                    {field: row[f'total_{field}'] for field in cls.FIELDS},
+                )
+                months += 1
+            deleted, _ = old.delete()
+        return months, deleted
+
+
+class ViewCounterBuffer:
+    """Visitas pendientes por anuncio en este proceso."""
+
+    def __init__(self):
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def add(self, listing_id):
+        with self._lock:
+            self._pending[listing_id] += 1
+            due = (
+                time.monotonic() - self._last_flush >= settings.LISTING_VIEWS_FLUSH_SECONDS
+                or sum(self._pending.values()) >= settings.LISTING_VIEWS_FLUSH_MAX
+            )
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Escribe las visitas pendientes. Devuelve cuántas se escribieron."""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._last_flush = time.monotonic()
+
+        written = 0
+        for listing_id, count in pending.items():
+            # updated_at=F('updated_at'): una vista no es una edición (MySQL tiene
+            # ON UPDATE CURRENT_TIMESTAMP y cambiaría la llave de los fragmentos)
+            updated = Listing.objects.filter(pk=listing_id).update(
+                views=F('views') + count,
+                updated_at=F('updated_at'),
+            )
+            if updated:
+                ListingStatsService.record(listing_id, views=count)
+                written += count
+        return written
+
+
+view_buffer = ViewCounterBuffer()
+
+
+def view_visitor(request):
+    """Usuario autenticado o, si no, IP del cliente."""
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    # nginx agrega la IP del cliente al final (proxy_add_x_forwarded_for)
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+    ip = forwarded.rsplit(',', 1)[-1].strip() or request.META.get('REMOTE_ADDR', '')
+    return f'ip:{ip}'
+
+
+def is_new_view(listing_id, visitor):
+    """True si `visitor` no vio el anuncio en los últimos LISTING_VIEW_DEDUP_SECONDS."""
+    timeout = settings.LISTING_VIEW_DEDUP_SECONDS
+    if not timeout:
+        return True
+    return caches['ratelimit'].add(f'listing:{listing_id}:viewed:{visitor}', 1, timeout=timeout)
@@ -0,0 +1,181 @@
+"""
+API JSON de solo lectura para listings (cliente móvil).
+
+    GET /listings/api/listings/                 búsqueda (mismos filtros que la lista pública)
+    GET /listings/api/listings/<pk>/            detalle
+    GET /listings/api/listings/<pk>/photos/     fotos
+
+`fields=id,price,...` limita las columnas (values() sobre API_FIELDS; los
+nombres desconocidos responden 400). Cada respuesta lleva un ETag fuerte
+calculado de updated_at y de los contadores (que se actualizan sin tocar
+updated_at); en /photos/ de las filas de fotos. Con If-None-Match igual se
+responde 304 sin cuerpo.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage, Paginator
+from django.http import Http404, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.views.generic import View
+
+from .models import Listing, ListingPhoto
+from .views import apply_public_filters
+
+# Nombre en la API -> campo para values()
+API_FIELDS = {
+    'id': 'id',
+    'price': 'price',
+    'utilities_price': 'utilities_price',
+    'location_text': 'location_text',
+    'lat': 'lat',
+    'lng': 'lng',
+    'zone_id': 'zone_id',
+    'zone_name': 'zone__name',
+    'rooms': 'rooms',
+    'bathrooms': 'bathrooms',
+    'shared_with_people': 'shared_with_people',
+    'available': 'available',
+    'views': 'views',
+    'comment_count': 'comment_count',
+    'review_count': 'review_count',
+    'rating_sum': 'rating_sum',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+
+
+class ApiError(Exception):
+    pass
+
+
+def requested_fields(params):
+    """Campos pedidos en `fields=` (todos si no viene). ApiError si hay desconocidos."""
+    raw = params.get('fields', '').strip()
+    if not raw:
+        return list(API_FIELDS)
+    fields = list(dict.fromkeys(name.strip() for name in raw.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in API_FIELDS]
+    if unknown:
+        raise ApiError(f"Campos desconocidos: {', '.join(unknown)}. Disponibles: {', '.join(API_FIELDS)}")
+    return fields
+
+
+# Columnas del ETag: contadores de ListingCounterService y de las visitas se
+# actualizan con updated_at=F('updated_at'), así que updated_at no basta
+ETAG_FIELDS = ('id', 'updated_at', 'views', 'comment_count', 'review_count', 'rating_sum')
+
+
+def listing_values(queryset, fields):
+    """values() con las columnas pedidas más las de ETAG_FIELDS."""
+    sources = {API_FIELDS[name] for name in fields} | set(ETAG_FIELDS)
+    return queryset.values(*sources)
+
+
+def row_stamp(row):
+    return ':'.join(str(row[field]) for field in ETAG_FIELDS)
+
+
+def serialize(row, fields):
+    return {name: row[API_FIELDS[name]] for name in fields}
+
+
+def strong_etag(*parts):
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+def conditional_json(request, etag, build_payload):
+    """304 si If-None-Match coincide; si no, JSON de build_payload() con el ETag."""
+    not_modified = get_conditional_response(request, etag=etag)
+    response = not_modified or JsonResponse(build_payload())
+    response.headers['ETag'] = etag
+    # El cliente puede guardar la respuesta, pero debe revalidar cada vez
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def error_response(message, status=400):
+    return JsonResponse({'error': message}, status=status)
+
+
+class ListingSearchApiView(View):
+    """Búsqueda paginada con `page` y `page_size` (máximo max_page_size)."""
+    page_size = 12
+    max_page_size = 50
+
+    def get(self, request):
+        try:
+            fields = requested_fields(request.GET)
+            page_size = min(int(request.GET.get('page_size') or self.page_size), self.max_page_size)
+            if page_size < 1:
+                raise ValueError
+            queryset = apply_public_filters(Listing.objects.filter(available=True), request.GET)
+            page = Paginator(listing_values(queryset, fields), page_size).page(request.GET.get('page') or 1)
+            rows = list(page.object_list)
+        except ApiError as exc:
+            return error_response(str(exc))
+        except (ValueError, ValidationError):
+            return error_response('Parámetros inválidos.')
+        except InvalidPage:
+            raise Http404("Página inválida.")
+
+        # La página ya se leyó (son columnas livianas); el 304 ahorra serializar y transferir
+        etag = strong_etag(
+            request.GET.urlencode(),
+            page.paginator.count,
+            *(row_stamp(row) for row in rows),
+        )
+        return conditional_json(request, etag, lambda: {
+            'count': page.paginator.count,
+            'page': page.number,
+            'num_pages': page.paginator.num_pages,
+            'results': [serialize(row, fields) for row in rows],
+        })
+
+
+class ListingDetailApiView(View):
+    """Un anuncio (no suma vistas)."""
+
+    def get(self, request, pk):
+        try:
+            fields = requested_fields(request.GET)
+        except ApiError as exc:
+            return error_response(str(exc))
+
+        row = listing_values(Listing.objects.filter(pk=pk), fields).first()
+        if row is None:
+            raise Http404("No se encontró el anuncio.")
+
+        etag = strong_etag(row_stamp(row), ','.join(fields))
+        return conditional_json(request, etag, lambda: serialize(row, fields))
+
+
+class ListingPhotosApiView(View):
+    """Fotos de un anuncio en orden; el ETag sale de sus filas (máximo 5)."""
+
+    def get(self, request, pk):
+        if not Listing.objects.filter(pk=pk).exists():
+            raise Http404("No se encontró el anuncio.")
+
+        photos = list(ListingPhoto.objects.filter(listing_id=pk))
+        # sort_order entra al ETag: reordenar no cambia created_at ni la cantidad
+        etag = strong_etag(pk, *(
+            f'{photo.pk}:{photo.image.name}:{photo.mime_type}:{photo.sort_order}' for photo in photos
+        ))
+
+        def payload():
+            return {
+                'listing_id': pk,
+                'photos': [
+                    {
+                        'id': photo.pk,
+                        'url': request.build_absolute_uri(photo.image.url),
+                        'mime_type': photo.mime_type,
+                        'sort_order': photo.sort_order,
+                    }
+                    for photo in photos
+                ],
+            }
+
+        return conditional_json(request, etag, payload)
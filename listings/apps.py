@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ListingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'listings'
+
+    def ready(self):
+        """
+        Registra los signals de listings/signals.py (versiones de cache de
+        comentarios y reseñas).
+        """
+        import listings.signals  # noqa: F401
@@ -0,0 +1,217 @@
+"""
+Helpers de fragment caching para listings.
+
+Tarjetas y carrusel:
+    Se cachean con {% cache %} usando como llave listing.pk, updated_at y el
+    "sello" de fotos (with_photo_stamp): la fecha de la foto más reciente y
+    la cantidad de fotos. Cualquier edición del listing o de sus fotos cambia
+    la llave, así que no hace falta invalidar nada.
+
+    El sello sale de subqueries correlacionadas (sin JOIN ni GROUP BY sobre la
+    lista filtrada, y el COUNT del Paginator queda simple). Las miniaturas no
+    se precargan: attach_thumbnails deja en cada anuncio un callable que,
+    la primera vez que un fragmento falta en cache, trae las primeras fotos
+    de toda la página en una query.
+
+Comentarios y reseñas:
+    Dependen de objetos hijos, no del listing. Cada sección tiene una versión
+    en cache que se renueva (bump_section_version) al crear o borrar un
+    comentario/reseña (ver listings/signals.py). Las versiones se inician con
+    time.time_ns(), así que si la llave se pierde la nueva versión nunca
+    coincide con un fragmento viejo.
+
+Fragmentos y versiones viven en la cache "fragments" (ver CACHES en settings).
+
+Con CACHE_BACKEND=locmem cada worker tendría sus propias versiones y un
+comentario creado en otro worker no invalidaría nada. Por eso, si la cache
+"fragments" no es compartida (shared_fragment_cache), las versiones salen de
+la BD: fecha del último comentario/reseña y cantidad, en la misma query del
+sello del detalle.
+
+GET condicional del detalle:
+    with_detail_stamp anota, en una sola query, las fechas y conteos del
+    listing (vistas incluidas), sus fotos y favoritos. Comentarios y reseñas
+    entran por sus versiones de sección (detail_versions): con una cache
+    compartida una visita con todo en cache no toca esas tablas.
+    detail_validators arma con eso el ETag (débil: el HTML lleva tokens CSRF
+    distintos en cada render) y Last-Modified.
+"""
+import hashlib
+import time
+from functools import partial
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery
+from django.utils.cache import quote_etag
+from django.utils.functional import cached_property
+
+from .models import Comment, Favorite, Listing, ListingPhoto, Review
+
+FRAGMENT_CACHE = 'fragments'
+SECTIONS = ('comments', 'reviews')
+SECTION_MODELS = {'comments': Comment, 'reviews': Review}
+
+
+def shared_fragment_cache():
+    """False con locmem: la cache es del proceso, no del conjunto de workers."""
+    return not isinstance(caches[FRAGMENT_CACHE], LocMemCache)
+
+
+def _version_key(listing_id, section):
+    return f'listing:{listing_id}:{section}:version'
+
+
+def section_versions(listing_id):
+    """
+    Versiones actuales de las secciones del detalle: {'comments': ..., 'reviews': ...}.
+    Una sola lectura a la cache; las que falten se crean.
+    """
+    cache = caches[FRAGMENT_CACHE]
+    keys = {section: _version_key(listing_id, section) for section in SECTIONS}
+    found = cache.get_many(keys.values())
+
+    versions = {}
+    for section, key in keys.items():
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+        versions[section] = found[key]
+    return versions
+
+
+async def asection_versions(listing_id):
+    """Variante async de section_versions() para ListingDetailAsyncView."""
+    cache = caches[FRAGMENT_CACHE]
+    keys = {section: _version_key(listing_id, section) for section in SECTIONS}
+    found = await cache.aget_many(keys.values())
+
+    versions = {}
+    for section, key in keys.items():
+        if key not in found:
+            await cache.aadd(key, time.time_ns(), timeout=None)
+            found[key] = await cache.aget(key)
+        versions[section] = found[key]
+    return versions
+
+
+def bump_section_version(listing_id, section):
+    """Invalida los fragmentos cacheados de una sección de un listing."""
+    caches[FRAGMENT_CACHE].set(_version_key(listing_id, section), time.time_ns(), timeout=None)
+
+
+def _per_listing(model, aggregate, output_field=None):
+    return Subquery(
+        model.objects
+        .filter(listing=OuterRef('pk'))
+        .order_by()
+        .values('listing')
+        .annotate(value=aggregate)
+        .values('value'),
+        output_field=output_field,
+    )
+
+
+def with_photo_stamp(queryset):
+    """Anota last_photo_at y photo_count para las llaves de fragmentos."""
+    return queryset.annotate(
+        last_photo_at=_per_listing(ListingPhoto, Max('created_at')),
+        photo_count=_per_listing(ListingPhoto, Count('pk'), IntegerField()),
+    )
+
+
+def with_detail_stamp(queryset):
+    """with_photo_stamp más favorite_count, todo con subqueries (sin joins que multipliquen filas)."""
+    return with_photo_stamp(queryset).annotate(
+        favorite_count=_per_listing(Favorite, Count('pk'), IntegerField()),
+    )
+
+
+class PageThumbnails:
+    """Primera foto (ordering de ListingPhoto) de cada anuncio de una página."""
+
+    def __init__(self, listings):
+        self.listing_ids = [listing.pk for listing in listings]
+
+    @cached_property
+    def photos(self):
+        first = {}
+        for photo in ListingPhoto.objects.filter(listing_id__in=self.listing_ids):
+            first.setdefault(photo.listing_id, photo)
+        return first
+
+    def get(self, listing_id):
+        return self.photos.get(listing_id)
+
+
+def attach_thumbnails(listings):
+    """
+    Deja en cada anuncio `thumbnail`, un callable (el template lo llama) que
+    devuelve su primera foto o None. Nada se consulta si todos los
+    fragmentos de la página están en cache.
+    """
+    thumbnails = PageThumbnails(listings)
+    for listing in listings:
+        listing.thumbnail = partial(thumbnails.get, listing.pk)
+    return listings
+
+
+# views también: detail.html muestra las visitas y la popularidad
+DETAIL_STAMP_FIELDS = ('updated_at', 'views', 'last_photo_at', 'photo_count', 'favorite_count')
+
+
+def detail_stamp(listing_id):
+    """
+    Queryset de values() con el sello del detalle; .first() es None si no
+    existe. Sin cache compartida suma <sección>_last y <sección>_total.
+    """
+    queryset = with_detail_stamp(Listing.objects.filter(pk=listing_id))
+    fields = list(DETAIL_STAMP_FIELDS)
+    if not shared_fragment_cache():
+        for section, model in SECTION_MODELS.items():
+            queryset = queryset.annotate(**{
+                f'{section}_last': _per_listing(model, Max('created_at')),
+                f'{section}_total': _per_listing(model, Count('pk'), IntegerField()),
+            })
+            fields += [f'{section}_last', f'{section}_total']
+    return queryset.values(*fields)
+
+
+def _stamp_versions(stamp):
+    if 'comments_total' not in stamp:
+        return None
+    return {section: f"{stamp[f'{section}_last']}:{stamp[f'{section}_total']}" for section in SECTIONS}
+
+
+def detail_versions(listing_id, stamp):
+    """Versiones de sección del detalle: del sello si lo trae, si no de la cache."""
+    return _stamp_versions(stamp) or section_versions(listing_id)
+
+
+async def adetail_versions(listing_id, stamp):
+    """Variante async de detail_versions()."""
+    return _stamp_versions(stamp) or await asection_versions(listing_id)
+
+
+def detail_validators(stamp, versions, user):
+    """
+    (etag, last_modified) del detalle para `user`, a partir del sello y de
+    section_versions(). El HTML cambia según el usuario (permisos, favorito),
+    así que su id es parte del ETag. last_modified es un timestamp entero,
+    como espera get_conditional_response.
+    """
+    viewer = user.pk if user.is_authenticated else 'anon'
+    raw = '|'.join(
+        [str(stamp[field]) for field in DETAIL_STAMP_FIELDS]
+        + [str(versions[section]) for section in SECTIONS]
+    )
+    etag = 'W/' + quote_etag(hashlib.sha1(f'{viewer}|{raw}'.encode()).hexdigest())
+    dates = [stamp['updated_at'], stamp['last_photo_at']]
+    if 'comments_total' in stamp:
+        dates += [stamp[f'{section}_last'] for section in SECTIONS]
+        changes = []
+    else:
+        # Versiones de la cache: time_ns del último cambio
+        changes = [versions[section] / 1e9 for section in SECTIONS]
+    changes += [date.timestamp() for date in dates if date]
+    return etag, int(max(changes))
@@ -0,0 +1,38 @@
+"""
+Compacta las estadísticas diarias viejas de los anuncios en filas mensuales.
+
+Los meses completos anteriores a hoy - --keep-days se suman en
+listing_monthly_stats y sus filas de listing_daily_stats se borran, así la
+tabla diaria se mantiene en ~--keep-days filas por anuncio activo.
+Pensado para correr una vez al mes (o a diario: es idempotente).
+
+Uso:
+    python manage.py compact_listing_stats
+    python manage.py compact_listing_stats --keep-days 180
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from listings.analytics import ListingStatsService
+
+
+class Command(BaseCommand):
+    help = "Pasa las estadísticas diarias viejas de los anuncios a totales mensuales."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-days',
+            type=int,
+            default=ListingStatsService.KEEP_DAYS,
+            help=f'Días que se conservan con detalle diario (default: {ListingStatsService.KEEP_DAYS})',
+        )
+
+    def handle(self, *args, **options):
+        if options['keep_days'] < ListingStatsService.CHART_DAYS:
+            raise CommandError(
+                f"--keep-days debe ser al menos {ListingStatsService.CHART_DAYS} (la gráfica del panel usa esos días)."
+            )
+
+        months, deleted = ListingStatsService.compact(keep_days=options['keep_days'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{deleted} filas diarias compactadas en {months} totales mensuales."
+        ))
@@ -0,0 +1,42 @@
+"""
+Recalcula comment_count, review_count y rating_sum de cada listing.
+
+Los contadores los mantienen las vistas (listings.services.ListingCounterService);
+este comando corrige desvíos por cambios hechos fuera de ellas (admin, shell,
+borrados directos en BD). Recorre la tabla en lotes por id y solo actualiza
+los anuncios cuyos contadores no coinciden.
+
+Uso:
+    python manage.py reconcile_listing_counters
+    python manage.py reconcile_listing_counters --batch-size 500 --dry-run
+"""
+from django.core.management.base import BaseCommand
+
+from listings.services import ListingCounterService
+
+
+class Command(BaseCommand):
+    help = "Corrige los contadores de comentarios y reseñas de los anuncios."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Anuncios revisados por lote (default: 1000)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo cuenta los anuncios con contadores desviados',
+        )
+
+    def handle(self, *args, **options):
+        checked, fixed = ListingCounterService.reconcile(
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+        verb = 'se corregirían' if options['dry_run'] else 'corregidos'
+        self.stdout.write(self.style.SUCCESS(
+            f"{checked} anuncios revisados, {fixed} {verb}."
+        ))
@@ -0,0 +1,381 @@
+"""
+Genera datos sintéticos de Bogotá en volumen para pruebas de rendimiento.
+
+A diferencia de tests/factories (un INSERT por objeto), todo se inserta con
+bulk_create en lotes, con un solo hash de contraseña compartido por todos los
+usuarios generados. Las zonas salen de zones.json; cada anuncio cae dentro de
+un recuadro aproximado de su localidad y su precio depende de la zona.
+
+Uso:
+    python manage.py seed_umigo --listings 100000 --landlords 5000 --students 20000
+    python manage.py seed_umigo --listings 100000 --workers 4 --seed 7
+
+Misma semilla y mismos parámetros => mismos datos (el reparto en lotes no
+depende de --workers). Los usuarios se llaman <prefix>_l<n> / <prefix>_s<n>
+y comparten la contraseña --password; para volver a sembrar en la misma BD
+usar otro --prefix.
+"""
+import io
+import itertools
+import json
+import math
+import multiprocessing
+import random
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from listings.models import Comment, Favorite, Listing, ListingPhoto, Review, Zone
+from listings.services import CommentThreadService
+from users.models import Landlord, Student, User
+
+# Recuadro aproximado (lat_min, lat_max, lng_min, lng_max), factor de precio
+# y peso relativo de anuncios por localidad (zonas de estudiantes pesan más)
+ZONE_PROFILES = {
+    'Usaquén': ((4.68, 4.76, -74.06, -74.02), 1.35, 8),
+    'Chapinero': ((4.63, 4.67, -74.07, -74.04), 1.5, 12),
+    'Santa Fe': ((4.59, 4.62, -74.08, -74.05), 0.9, 5),
+    'San Cristóbal': ((4.54, 4.58, -74.10, -74.06), 0.7, 3),
+    'Usme': ((4.45, 4.53, -74.14, -74.09), 0.6, 2),
+    'Tunjuelito': ((4.56, 4.59, -74.15, -74.12), 0.7, 2),
+    'Bosa': ((4.59, 4.64, -74.21, -74.17), 0.65, 3),
+    'Kennedy': ((4.60, 4.66, -74.17, -74.12), 0.8, 6),
+    'Fontibón': ((4.66, 4.70, -74.16, -74.12), 0.95, 4),
+    'Engativá': ((4.68, 4.73, -74.13, -74.08), 0.9, 6),
+    'Suba': ((4.71, 4.80, -74.11, -74.04), 1.0, 8),
+    'Barrios Unidos': ((4.66, 4.69, -74.08, -74.06), 1.1, 5),
+    'Teusaquillo': ((4.62, 4.66, -74.10, -74.07), 1.2, 10),
+    'Los Mártires': ((4.60, 4.62, -74.10, -74.08), 0.75, 3),
+    'Antonio Nariño': ((4.58, 4.60, -74.11, -74.09), 0.75, 2),
+    'Puente Aranda': ((4.60, 4.64, -74.13, -74.10), 0.8, 3),
+    'La Candelaria': ((4.59, 4.60, -74.08, -74.06), 1.0, 5),
+    'Rafael Uribe Uribe': ((4.55, 4.59, -74.13, -74.10), 0.7, 2),
+    'Ciudad Bolívar': ((4.50, 4.58, -74.18, -74.13), 0.55, 2),
+    'Sumapaz': ((4.00, 4.30, -74.35, -74.10), 0.5, 0.1),
+}
+DEFAULT_PROFILE = ((4.55, 4.75, -74.15, -74.03), 1.0, 1)
+
+# Arriendo base de una habitación para estudiante (COP), lognormal alrededor de la mediana
+BASE_PRICE = 850_000
+PRICE_SIGMA = 0.35
+
+ROOM_WEIGHTS = {1: 50, 2: 25, 3: 15, 4: 7, 5: 3}
+STREET_TYPES = ('Calle', 'Carrera', 'Avenida Calle', 'Avenida Carrera', 'Diagonal', 'Transversal')
+COMMENT_TEXTS = (
+    '¿El precio incluye internet?',
+    '¿Se admiten mascotas?',
+    '¿Qué tan cerca queda de la universidad?',
+    '¿Sigue disponible para el próximo semestre?',
+    '¿La habitación tiene baño privado?',
+    '¿Cómo es el transporte público en la zona?',
+)
+REPLY_TEXTS = (
+    'Sí, incluye internet y servicios.',
+    'Sigue disponible, puedes escribirme para agendar visita.',
+    'Queda a 10 minutos caminando.',
+)
+REVIEW_TEXTS = (
+    'Muy buen lugar, el arrendador responde rápido.',
+    'La zona es tranquila y bien ubicada.',
+    'El precio es justo para lo que ofrece.',
+    'Algo ruidoso en las noches, pero cómodo.',
+)
+PLACEHOLDER_PHOTOS = 5
+PLACEHOLDER_COLORS = ('#4e79a7', '#f28e2b', '#59a14f', '#e15759', '#76b7b2')
+
+
+def load_zones(path):
+    """Zonas de zones.json como lista de (pk, nombre, ciudad)."""
+    with open(path, encoding='utf-8') as f:
+        return [(row['pk'], row['fields']['name'], row['fields']['city']) for row in json.load(f)]
+
+
+def placeholder_photo_names():
+    """Crea (una vez) las imágenes compartidas por las fotos sembradas."""
+    from PIL import Image
+
+    names = []
+    for i, color in enumerate(PLACEHOLDER_COLORS[:PLACEHOLDER_PHOTOS]):
+        name = f'listing_photos/seed/placeholder_{i}.jpg'
+        if not default_storage.exists(name):
+            buffer = io.BytesIO()
+            Image.new('RGB', (800, 600), color).save(buffer, format='JPEG')
+            name = default_storage.save(name, ContentFile(buffer.getvalue()))
+        names.append(name)
+    return names
+
+
+def random_listing(rng, owner_id, zones):
+    zone_id, zone_name = rng.choices(zones['choices'], weights=zones['weights'])[0]
+    (lat_min, lat_max, lng_min, lng_max), factor, _ = ZONE_PROFILES.get(zone_name, DEFAULT_PROFILE)
+    rooms = rng.choices(list(ROOM_WEIGHTS), weights=list(ROOM_WEIGHTS.values()))[0]
+    price = round(rng.lognormvariate(math.log(BASE_PRICE * factor), PRICE_SIGMA) * (1 + 0.35 * (rooms - 1)), -4)
+    return Listing(
+        owner_id=owner_id,
+        zone_id=zone_id,
+        price=Decimal(price).quantize(Decimal('0.01')),
+        utilities_price=Decimal(round(price * rng.uniform(0.08, 0.15), -3)).quantize(Decimal('0.01')),
+        location_text=f'{rng.choice(STREET_TYPES)} {rng.randint(1, 200)} # {rng.randint(1, 120)}-{rng.randint(1, 99)}',
+        lat=Decimal(rng.uniform(lat_min, lat_max)).quantize(Decimal('0.000001')),
+        lng=Decimal(rng.uniform(lng_min, lng_max)).quantize(Decimal('0.000001')),
+        rooms=rooms,
+        bathrooms=rng.randint(1, min(rooms, 3)),
+        shared_with_people=rng.randint(0, 4),
+        available=rng.random() < 0.85,
+        views=int(rng.expovariate(1 / 150)),
+    )
+
+
+def seed_chunk(task):
+    """
+    Inserta los anuncios de un grupo de arrendadores con sus fotos, reseñas y
+    comentarios. Corre en el proceso principal o en un worker (--workers).
+    """
+    rng = random.Random(f"{task['seed']}-{task['index']}")
+    options = task['options']
+    student_ids = task['student_ids']
+    student_user_ids = task['student_user_ids']
+    batch_size = options['batch_size']
+
+    with transaction.atomic():
+        Listing.objects.bulk_create(
+            [
+                random_listing(rng, owner_id, task['zones'])
+                for owner_id, count in task['owners']
+                for _ in range(count)
+            ],
+            batch_size=batch_size,
+        )
+        # MySQL no devuelve los ids de bulk_create: se leen por dueño
+        listings = list(
+            Listing.objects
+            .filter(owner_id__in=[owner_id for owner_id, _ in task['owners']])
+            .order_by('id')
+            .values_list('id', 'owner_id')
+        )
+
+        photos, reviews, comments = [], [], []
+        for listing_id, _ in listings:
+            for order in range(rng.randint(1, options['photos'])):
+                photos.append(ListingPhoto(
+                    listing_id=listing_id,
+                    image=rng.choice(task['photo_names']),
+                    mime_type='image/jpeg',
+                    size_bytes=rng.randint(80_000, 900_000),
+                    sort_order=order,
+                ))
+            reviewers = rng.sample(student_ids, min(len(student_ids), rng.randint(0, options['reviews'])))
+            for student_id in reviewers:
+                reviews.append(Review(
+                    listing_id=listing_id,
+                    author_id=student_id,
+                    rating=rng.choices((1, 2, 3, 4, 5), weights=(3, 5, 15, 40, 37))[0],
+                    text=rng.choice(REVIEW_TEXTS),
+                ))
+            for _ in range(rng.randint(0, options['comments'])):
+                comments.append(Comment(
+                    listing_id=listing_id,
+                    author_id=rng.choice(student_user_ids),
+                    text=rng.choice(COMMENT_TEXTS),
+                ))
+
+        ListingPhoto.objects.bulk_create(photos, batch_size=batch_size)
+        Review.objects.bulk_create(reviews, batch_size=batch_size)
+        Comment.objects.bulk_create(comments, batch_size=batch_size)
+
+        # Respuestas del dueño a ~1 de cada 3 comentarios
+        owner_user_ids = task['owner_user_ids']
+        owners = dict(listings)
+        questions = (
+            Comment.objects
+            .filter(listing_id__in=owners, parent__isnull=True)
+            .order_by('id')
+            .values_list('id', 'listing_id')
+        )
+        replies = [
+            Comment(
+                listing_id=listing_id,
+                author_id=owner_user_ids[owners[listing_id]],
+                parent_id=comment_id,
+                text=rng.choice(REPLY_TEXTS),
+            )
+            for comment_id, listing_id in questions
+            if rng.random() < 0.33
+        ]
+        Comment.objects.bulk_create(replies, batch_size=batch_size)
+        # bulk_create no pasa por Comment.save(): path y depth se completan aparte
+        CommentThreadService.rebuild_paths(owners, batch_size=batch_size)
+
+        # Ni por ListingCounterService: los contadores salen de lo generado
+        counters = {listing_id: Listing(pk=listing_id) for listing_id in owners}
+        for review in reviews:
+            counters[review.listing_id].review_count += 1
+            counters[review.listing_id].rating_sum += review.rating
+        for comment in itertools.chain(comments, replies):
+            counters[comment.listing_id].comment_count += 1
+        Listing.objects.bulk_update(
+            counters.values(),
+            ['comment_count', 'review_count', 'rating_sum'],
+            batch_size=batch_size,
+        )
+
+    return {
+        'listings': len(listings),
+        'photos': len(photos),
+        'reviews': len(reviews),
+        'comments': len(comments) + len(replies),
+    }
+
+
+class Command(BaseCommand):
+    help = "Genera datos sintéticos (arrendadores, estudiantes, anuncios, fotos, reseñas, comentarios y favoritos) con bulk_create."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--landlords', type=int, default=100, help='Arrendadores (default: 100)')
+        parser.add_argument('--students', type=int, default=500, help='Estudiantes (default: 500)')
+        parser.add_argument('--listings', type=int, default=1000, help='Anuncios en total (default: 1000)')
+        parser.add_argument('--photos', type=int, default=3, help='Máximo de fotos por anuncio (default: 3)')
+        parser.add_argument('--reviews', type=int, default=3, help='Máximo de reseñas por anuncio (default: 3)')
+        parser.add_argument('--comments', type=int, default=4, help='Máximo de comentarios por anuncio (default: 4)')
+        parser.add_argument('--favorites', type=int, default=5, help='Máximo de favoritos por estudiante (default: 5)')
+        parser.add_argument('--seed', type=int, default=42, help='Semilla del generador (default: 42)')
+        parser.add_argument('--prefix', default='seed', help='Prefijo de username/email (default: seed)')
+        parser.add_argument('--password', default='umigo-seed-123', help='Contraseña de todos los usuarios generados')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Filas por INSERT (default: 2000)')
+        parser.add_argument(
+            '--chunk-landlords',
+            type=int,
+            default=200,
+            help='Arrendadores por unidad de trabajo; cada una es una transacción (default: 200)',
+        )
+        parser.add_argument('--workers', type=int, default=1, help='Procesos en paralelo (default: 1)')
+        parser.add_argument(
+            '--zones-file',
+            default=str(Path(settings.BASE_DIR) / 'zones.json'),
+            help='Fixture de zonas (default: zones.json)',
+        )
+
+    def handle(self, *args, **options):
+        if options['landlords'] < 1 or options['students'] < 1:
+            raise CommandError('Se necesita al menos un arrendador y un estudiante.')
+        if options['photos'] < 1:
+            raise CommandError('Cada anuncio necesita al menos una foto (--photos >= 1).')
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=f'{prefix}_').exists():
+            raise CommandError(f'Ya hay usuarios con el prefijo "{prefix}_"; usa otro --prefix.')
+
+        start = time.perf_counter()
+        rng = random.Random(options['seed'])
+        zones = self.ensure_zones(options['zones_file'])
+        password = make_password(options['password'])
+
+        landlord_users = self.create_users(f'{prefix}_l', options['landlords'], password, options['batch_size'])
+        student_users = self.create_users(f'{prefix}_s', options['students'], password, options['batch_size'])
+        Landlord.objects.bulk_create(
+            [
+                Landlord(user_id=user_id, national_id=str(rng.randint(10**9, 10**10 - 1)), id_url='identificationCards/seed.pdf')
+                for user_id in landlord_users
+            ],
+            batch_size=options['batch_size'],
+        )
+        Student.objects.bulk_create([Student(user_id=user_id) for user_id in student_users], batch_size=options['batch_size'])
+        landlords = dict(Landlord.objects.filter(user_id__in=landlord_users).values_list('id', 'user_id'))
+        students = list(Student.objects.filter(user_id__in=student_users).order_by('id').values_list('id', flat=True))
+
+        tasks = self.plan_tasks(options, zones, landlords, students, student_users)
+        if options['workers'] > 1:
+            # Los workers heredan el estado de Django por fork: se cierran las
+            # conexiones antes para que cada proceso abra la suya
+            connections.close_all()
+            context = multiprocessing.get_context('fork')
+            with context.Pool(options['workers']) as pool:
+                results = pool.map(seed_chunk, tasks)
+        else:
+            results = [seed_chunk(task) for task in tasks]
+
+        favorites = self.create_favorites(rng, students, list(landlords), options)
+
+        totals = {key: sum(result[key] for result in results) for key in ('listings', 'photos', 'reviews', 'comments')}
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(landlords)} arrendadores, {len(students)} estudiantes, {totals['listings']} anuncios, "
+            f"{totals['photos']} fotos, {totals['reviews']} reseñas, {totals['comments']} comentarios y "
+            f"{favorites} favoritos en {time.perf_counter() - start:.1f}s."
+        ))
+
+    def ensure_zones(self, path):
+        """Crea las zonas de zones.json que falten y devuelve opciones ponderadas."""
+        try:
+            rows = load_zones(path)
+        except OSError as exc:
+            raise CommandError(f'No se pudo leer {path}: {exc}')
+
+        existing = set(Zone.objects.filter(pk__in=[pk for pk, _, _ in rows]).values_list('pk', flat=True))
+        Zone.objects.bulk_create([Zone(pk=pk, name=name, city=city) for pk, name, city in rows if pk not in existing])
+
+        choices = [(pk, name) for pk, name, _ in rows]
+        weights = [ZONE_PROFILES.get(name, DEFAULT_PROFILE)[2] for _, name in choices]
+        return {'choices': choices, 'weights': weights}
+
+    def create_users(self, username_prefix, count, password, batch_size):
+        """Crea `count` usuarios con el mismo hash y devuelve sus ids en orden."""
+        usernames = [f'{username_prefix}{i}' for i in range(1, count + 1)]
+        User.objects.bulk_create(
+            [
+                User(username=username, email=f'{username}@seed.umigo.co', password=password, is_active=True)
+                for username in usernames
+            ],
+            batch_size=batch_size,
+        )
+        ids = dict(User.objects.filter(username__startswith=username_prefix).values_list('username', 'id'))
+        return [ids[username] for username in usernames]
+
+    def plan_tasks(self, options, zones, landlords, students, student_users):
+        """
+        Reparte los anuncios entre arrendadores (equitativo) y agrupa a los
+        arrendadores en unidades de --chunk-landlords, cada una con su semilla.
+        """
+        landlord_ids = sorted(landlords)
+        per_landlord, remainder = divmod(options['listings'], len(landlord_ids))
+        owners = [
+            (landlord_id, per_landlord + (1 if i < remainder else 0))
+            for i, landlord_id in enumerate(landlord_ids)
+        ]
+        photo_names = placeholder_photo_names()
+        limits = {key: options[key] for key in ('photos', 'reviews', 'comments', 'batch_size')}
+        size = max(1, options['chunk_landlords'])
+        return [
+            {
+                'index': index,
+                'seed': options['seed'],
+                'options': limits,
+                'owners': owners[offset:offset + size],
+                'owner_user_ids': landlords,
+                'zones': zones,
+                'student_ids': students,
+                'student_user_ids': student_users,
+                'photo_names': photo_names,
+            }
+            for index, offset in enumerate(range(0, len(owners), size))
+        ]
+
+    def create_favorites(self, rng, students, landlord_ids, options):
+        """Favoritos de cada estudiante sobre anuncios sembrados (sin repetir)."""
+        # Con --workers > 1 los lotes se insertan en cualquier orden: el id no
+        # es estable entre corridas, el orden dentro de cada arrendador sí
+        listing_ids = list(
+            Listing.objects.filter(owner_id__in=landlord_ids).order_by('owner_id', 'id').values_list('id', flat=True)
+        )
+        favorites = [
+            Favorite(student_id=student_id, listing_id=listing_id)
+            for student_id in students
+            for listing_id in rng.sample(listing_ids, min(len(listing_ids), rng.randint(0, options['favorites'])))
+        ]
+        Favorite.objects.bulk_create(favorites, batch_size=options['batch_size'])
+        return len(favorites)
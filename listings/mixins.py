@@ -10,4 +10,4 @@ class LandlordRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     def handle_no_permission(self):
         if not self.request.user.is_authenticated:
             return super().handle_no_permission()
-        return redirect('listing_public_list')
+        return redirect('listings:listing_public_list')
@@ -69,6 +69,11 @@ class Listing(models.Model):
     views = models.PositiveIntegerField(default=0)
     popularity = models.FloatField(default=0.0)
 
+    # Contadores desnormalizados (listings.services.ListingCounterService)
+    comment_count = models.PositiveIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+
     favorited_by = models.ManyToManyField(
         Student, 
         through='Favorite',
@@ -88,6 +93,13 @@ class Listing(models.Model):
         for student in favoritedStudents:
             student.receiveAvailabilityNotification(domain, self)
     
+    @property
+    def rating_average(self):
+        """Promedio de reseñas a partir de los contadores (None sin reseñas)."""
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 1)
+
     def __str__(self):
         return f"{self.location_text} ({self.price})"
 
@@ -128,23 +140,57 @@ class Comment(models.Model):
         on_delete=models.CASCADE,
         db_column='parent_comment_id'
     )
+    # Ruta materializada: ids de los ancestros y el propio, "0000000012/0000000045/".
+    # Un hilo completo es path LIKE '<path de la raíz>%' (rango sobre idx_comment_path)
+    path = models.CharField(max_length=255, default='', editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # 21 segmentos de 11 caracteres caben en path (VARCHAR 255)
+    MAX_DEPTH = 20
+    PATH_DIGITS = 10
+
     class Meta:
         managed = False
         db_table = 'comment'
         ordering = ['-created_at']
-    
+
+    @classmethod
+    def path_segment(cls, pk):
+        return f'{pk:0{cls.PATH_DIGITS}d}/'
+
+    @property
+    def accepts_replies(self):
+        return self.depth < self.MAX_DEPTH
+
     def clean(self):
         """
-        Validación: Un reply debe estar en el mismo listing que su parent.
+        Validación: Un reply debe estar en el mismo listing que su parent
+        (se comparan ids, sin cargar los listings) y no pasar de MAX_DEPTH.
         """
         super().clean()
-        if self.parent and self.parent.listing != self.listing:
+        if self.parent_id is None:
+            return
+        if self.parent.listing_id != self.listing_id:
             raise ValidationError(
                 'Un reply debe estar en el mismo listing que su comentario padre.'
             )
+        if not self.parent.accepts_replies:
+            raise ValidationError('El hilo alcanzó la profundidad máxima de respuestas.')
+
+    def save(self, *args, **kwargs):
+        # El path incluye el id propio: se completa con un UPDATE tras el INSERT
+        creating = self._state.adding
+        super().save(*args, **kwargs)
+        if creating:
+            if self.parent_id:
+                self.path = self.parent.path + self.path_segment(self.pk)
+                self.depth = self.parent.depth + 1
+            else:
+                self.path = self.path_segment(self.pk)
+                self.depth = 0
+            Comment.objects.filter(pk=self.pk).update(path=self.path, depth=self.depth)
 
     def __str__(self):
         return f'Comment {self.id} on listing {self.listing_id}'
@@ -204,4 +250,42 @@ class Favorite(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f'{self.student.user.username} → Listing {self.listing_id}'
\ No newline at end of file
+        return f'{self.student.user.username} → Listing {self.listing_id}'
+
+class ListingDailyStats(models.Model):
+    """
+    Actividad de un anuncio en un día (listings.analytics.ListingStatsService).
+    Las filas viejas se compactan en ListingMonthlyStats (compact_listing_stats).
+    """
+    listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    favorites_added = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+    reviews = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        managed = False
+        db_table = 'listing_daily_stats'
+        unique_together = [['listing', 'day']]
+
+    def __str__(self):
+        return f'Listing {self.listing_id} @ {self.day}'
+
+
+class ListingMonthlyStats(models.Model):
+    """Actividad de un anuncio en un mes (`month` es el primer día del mes)."""
+    listing = models.ForeignKey(Listing, on_delete=models.CASCADE, related_name='monthly_stats')
+    month = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    favorites_added = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+    reviews = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        managed = False
+        db_table = 'listing_monthly_stats'
+        unique_together = [['listing', 'month']]
+
+    def __str__(self):
+        return f'Listing {self.listing_id} @ {self.month:%Y-%m}'
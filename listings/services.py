@@ -0,0 +1,443 @@
+"""
+Servicios de listings.
+
+CommentThreadService pagina los comentarios del detalle por cursor: primera
+página en el HTML y el resto (y las respuestas de cada hilo) bajo demanda
+desde los endpoints JSON de listings/views.py.
+
+ListingCounterService mantiene los contadores desnormalizados de Listing
+(comment_count, review_count, rating_sum) para que la lista pública y el panel
+del arrendador muestren "12 comentarios · 4.3★ (8)" sin COUNT/AVG por anuncio.
+
+- Altas y bajas desde las vistas: un UPDATE con F() por operación. Las altas
+  también suman en las estadísticas diarias (listings.analytics).
+- Borrar un comentario borra en cascada sus respuestas; se descuentan todas.
+- Cambios por otras vías (admin, shell) se corrigen con
+  `python manage.py reconcile_listing_counters`.
+
+updated_at=F('updated_at'): en MySQL la columna tiene ON UPDATE
+CURRENT_TIMESTAMP y un contador no es una edición del anuncio (además
+cambiaría la llave de los fragmentos cacheados).
+
+ListingExportService arma la exportación CSV/JSON del arrendador: lotes de
+CHUNK_SIZE anuncios con sus agregados, paginados por llave (pk > último; no
+iterator(), que en MySQL/mysqlclient trae todo el resultado al cliente) y
+escritos por trozos (StreamingHttpResponse), así la memoria no crece con la
+cantidad de anuncios. achunks() es la variante async para ASGI.
+"""
+import base64
+import csv
+import json
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
+
+from .analytics import ListingStatsService
+from .models import Comment, Listing, Review
+
+
+class ListingCounterService:
+
+    @staticmethod
+    def adjust(listing_id, **deltas):
+        """
+        Suma (o resta) deltas a los contadores, sin bajar de 0.
+
+        Las columnas son INT UNSIGNED: en MySQL `comment_count - 3` con
+        comment_count < 3 falla (error 1690) antes de cualquier GREATEST, así
+        que las restas sólo se evalúan cuando el resultado no es negativo.
+        """
+        changes = {}
+        for field, delta in deltas.items():
+            if delta > 0:
+                changes[field] = F(field) + Value(delta)
+            elif delta < 0:
+                changes[field] = Case(
+                    When(**{f'{field}__gte': -delta}, then=F(field) - Value(-delta)),
+                    default=Value(0),
+                )
+        if changes:
+            Listing.objects.filter(pk=listing_id).update(updated_at=F('updated_at'), **changes)
+
+    @classmethod
+    def comment_created(cls, comment):
+        cls.adjust(comment.listing_id, comment_count=1)
+        ListingStatsService.record(comment.listing_id, comments=1)
+
+    @staticmethod
+    def thread_size(comment):
+        """El comentario más todas sus respuestas (a cualquier profundidad)."""
+        return CommentThreadService.thread(comment).count()
+
+    @classmethod
+    def delete_comment(cls, comment):
+        """Borra el comentario (y sus respuestas en cascada) y descuenta todo el hilo."""
+        with transaction.atomic():
+            removed = cls.thread_size(comment)
+            comment.delete()
+            cls.adjust(comment.listing_id, comment_count=-removed)
+        return removed
+
+    @classmethod
+    def review_created(cls, review):
+        cls.adjust(review.listing_id, review_count=1, rating_sum=review.rating)
+        ListingStatsService.record(review.listing_id, reviews=1)
+
+    @classmethod
+    def delete_review(cls, review):
+        with transaction.atomic():
+            review.delete()
+            cls.adjust(review.listing_id, review_count=-1, rating_sum=-review.rating)
+
+    @staticmethod
+    def actual_counts(queryset):
+        """Anota real_comments, real_reviews y real_rating_sum calculados en BD."""
+        def scalar(model, aggregate):
+            return Coalesce(
+                Subquery(
+                    model.objects
+                    .filter(listing=OuterRef('pk'))
+                    .order_by()
+                    .values('listing')
+                    .annotate(total=aggregate)
+                    .values('total'),
+                    output_field=IntegerField(),
+                ),
+                Value(0),
+            )
+
+        return queryset.annotate(
+            real_comments=scalar(Comment, Count('pk')),
+            real_reviews=scalar(Review, Count('pk')),
+            real_rating_sum=scalar(Review, Sum('rating')),
+        )
+
+    @classmethod
+    def reconcile(cls, batch_size=1000, dry_run=False):
+        """
+        Recorre listing por rangos de id y corrige los contadores desviados.
+
+        Returns:
+            tuple: (anuncios revisados, anuncios corregidos)
+        """
+        checked = fixed = 0
+        last_id = 0
+        while True:
+            ids = list(
+                Listing.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            last_id = ids[-1]
+            checked += len(ids)
+
+            drifted = (
+                cls.actual_counts(Listing.objects.filter(pk__in=ids))
+                .filter(
+                    ~Q(comment_count=F('real_comments'))
+                    | ~Q(review_count=F('real_reviews'))
+                    | ~Q(rating_sum=F('real_rating_sum'))
+                )
+                .values_list('pk', 'real_comments', 'real_reviews', 'real_rating_sum')
+            )
+            for pk, comments, reviews, rating_sum in drifted:
+                fixed += 1
+                if not dry_run:
+                    Listing.objects.filter(pk=pk).update(
+                        comment_count=comments,
+                        review_count=reviews,
+                        rating_sum=rating_sum,
+                        updated_at=F('updated_at'),
+                    )
+        return checked, fixed
+
+
+class CommentPage:
+    """
+    Una página de comentarios. Lazy: la query (size + 1 filas, para saber si
+    hay más) corre al leer `comments`, así el template puede no evaluarla si
+    el fragmento está en cache. La vista async la precarga con `rows`.
+    """
+
+    def __init__(self, queryset, size, rows=None):
+        self.queryset = queryset
+        self.size = size
+        if rows is not None:
+            self.__dict__['_rows'] = rows
+
+    @cached_property
+    def _rows(self):
+        return list(self.queryset[:self.size + 1])
+
+    @property
+    def comments(self):
+        return self._rows[:self.size]
+
+    @property
+    def has_more(self):
+        return len(self._rows) > self.size
+
+    @property
+    def next_cursor(self):
+        if not self.has_more:
+            return None
+        return CommentThreadService.encode_cursor(self.comments[-1])
+
+
+class CommentThreadService:
+    """Comentarios de primer nivel por cursor (created_at, id) y respuestas por hilo."""
+
+    PAGE_SIZE = 10
+
+    @staticmethod
+    def encode_cursor(comment):
+        raw = f'{comment.created_at.isoformat()}|{comment.pk}'
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """(created_at, id) del último comentario visto. ValueError si es inválido."""
+        try:
+            created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit('|', 1)
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError) as exc:
+            raise ValueError('Cursor inválido') from exc
+
+    @staticmethod
+    def with_reply_count(queryset):
+        """Anota reply_count: respuestas del hilo a cualquier profundidad (rango sobre path)."""
+        descendants = (
+            Comment.objects
+            .filter(
+                listing_id=OuterRef('listing_id'),
+                path__startswith=OuterRef('path'),
+                depth__gt=OuterRef('depth'),
+            )
+            .order_by()
+            .values('listing_id')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        return (
+            queryset
+            .select_related('author')
+            .annotate(reply_count=Coalesce(Subquery(descendants, output_field=IntegerField()), 0))
+        )
+
+    @staticmethod
+    def thread(comment):
+        """El comentario y todo su hilo en una sola query de rango, en orden de lectura."""
+        return (
+            Comment.objects
+            .filter(listing_id=comment.listing_id, path__startswith=comment.path)
+            .order_by('path')
+        )
+
+    @classmethod
+    def top_level(cls, listing_id, cursor=None):
+        """Queryset de comentarios de primer nivel, del más antiguo al más nuevo."""
+        queryset = Comment.objects.filter(listing_id=listing_id, parent__isnull=True)
+        if cursor:
+            created_at, pk = cls.decode_cursor(cursor)
+            queryset = queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, pk__gt=pk))
+        return cls.with_reply_count(queryset).order_by('created_at', 'pk')
+
+    @classmethod
+    def page(cls, listing_id, cursor=None, size=None):
+        return CommentPage(cls.top_level(listing_id, cursor), size or cls.PAGE_SIZE)
+
+    @classmethod
+    def replies(cls, comment):
+        """
+        Todas las respuestas del hilo de `comment`, en orden de lectura y con
+        indent (profundidad relativa a `comment`, desde 0) para el template.
+        """
+        return (
+            cls.thread(comment)
+            .filter(depth__gt=comment.depth)
+            .select_related('author')
+            .annotate(indent=F('depth') - comment.depth - 1)
+        )
+
+    @staticmethod
+    def rebuild_paths(listing_ids, batch_size=1000):
+        """
+        Recalcula path y depth de los comentarios de `listing_ids`. Para filas
+        creadas con bulk_create, que no pasan por Comment.save().
+        Devuelve cuántos comentarios se actualizaron.
+        """
+        rows = (
+            Comment.objects
+            .filter(listing_id__in=listing_ids)
+            .order_by('pk')
+            .values_list('pk', 'parent_id', 'path', 'depth')
+        )
+        # Un padre siempre tiene un id menor que sus respuestas
+        paths, changed = {}, []
+        for pk, parent_id, path, depth in rows:
+            parent_path, parent_depth = paths.get(parent_id, ('', -1))
+            paths[pk] = (parent_path + Comment.path_segment(pk), parent_depth + 1)
+            if paths[pk] != (path, depth):
+                changed.append(Comment(pk=pk, path=paths[pk][0], depth=paths[pk][1]))
+        Comment.objects.bulk_update(changed, ['path', 'depth'], batch_size=batch_size)
+        return len(changed)
+
+
+class _Echo:
+    """Buffer de csv.writer que devuelve la línea en vez de guardarla."""
+
+    def write(self, value):
+        return value
+
+
+class _CsvEncoder:
+    def __init__(self, columns):
+        self.columns = columns
+        self.writer = csv.writer(_Echo())
+
+    def start(self):
+        return self.writer.writerow([header for _, header in self.columns])
+
+    def encode(self, rows):
+        return ''.join(
+            self.writer.writerow(['' if row[key] is None else row[key] for key, _ in self.columns])
+            for row in rows
+        )
+
+    def end(self):
+        return ''
+
+
+class _JsonEncoder:
+    """Un arreglo JSON escrito lote por lote."""
+
+    def __init__(self, columns):
+        self.empty = True
+
+    def start(self):
+        return '['
+
+    def encode(self, rows):
+        chunk = ','.join(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) for row in rows)
+        if chunk and not self.empty:
+            chunk = ',' + chunk
+        self.empty = self.empty and not chunk
+        return chunk
+
+    def end(self):
+        return ']'
+
+
+class ListingExportService:
+    """Anuncios de un arrendador con vistas, favoritos, comentarios y reseñas."""
+
+    CHUNK_SIZE = 500
+
+    # (clave, encabezado CSV)
+    COLUMNS = (
+        ('id', 'id'),
+        ('location_text', 'direccion'),
+        ('zone', 'zona'),
+        ('price', 'precio'),
+        ('available', 'disponible'),
+        ('views', 'vistas'),
+        ('favorites', 'favoritos'),
+        ('comments', 'comentarios'),
+        ('reviews', 'resenas'),
+        ('rating_average', 'calificacion_promedio'),
+        ('created_at', 'creado'),
+    )
+
+    ENCODERS = {'csv': _CsvEncoder, 'json': _JsonEncoder}
+
+    @staticmethod
+    def queryset(landlord):
+        """
+        Comentarios y reseñas salen de los contadores de Listing; favoritos es
+        el único COUNT (un solo join, no multiplica filas). Orden por pk para
+        paginar por llave.
+        """
+        return (
+            Listing.objects
+            .filter(owner=landlord)
+            .annotate(favorite_total=Count('favorites'))
+            .order_by('pk')
+            .values(
+                'id', 'location_text', 'zone__name', 'price', 'available', 'views',
+                'favorite_total', 'comment_count', 'review_count', 'rating_sum', 'created_at',
+            )
+        )
+
+    @staticmethod
+    def export_row(row):
+        return {
+            'id': row['id'],
+            'location_text': row['location_text'],
+            'zone': row['zone__name'],
+            'price': row['price'],
+            'available': row['available'],
+            'views': row['views'],
+            'favorites': row['favorite_total'],
+            'comments': row['comment_count'],
+            'reviews': row['review_count'],
+            'rating_average': (
+                round(row['rating_sum'] / row['review_count'], 1) if row['review_count'] else None
+            ),
+            'created_at': row['created_at'],
+        }
+
+    @classmethod
+    def batches(cls, landlord, chunk_size=None):
+        """Listas de filas de exportación; una query (pk > último, LIMIT) por lote."""
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        queryset = cls.queryset(landlord)
+        last = 0
+        while True:
+            batch = [cls.export_row(row) for row in queryset.filter(pk__gt=last)[:chunk_size]]
+            if batch:
+                yield batch
+            if len(batch) < chunk_size:
+                return
+            last = batch[-1]['id']
+
+    @classmethod
+    async def abatches(cls, landlord, chunk_size=None):
+        """Variante async de batches()."""
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        queryset = cls.queryset(landlord)
+        last = 0
+        while True:
+            batch = [cls.export_row(row) async for row in queryset.filter(pk__gt=last)[:chunk_size]]
+            if batch:
+                yield batch
+            if len(batch) < chunk_size:
+                return
+            last = batch[-1]['id']
+
+    @classmethod
+    def rows(cls, landlord, chunk_size=None):
+        for batch in cls.batches(landlord, chunk_size):
+            yield from batch
+
+    @classmethod
+    def chunks(cls, landlord, fmt, chunk_size=None):
+        """Texto de la exportación en `fmt` ('csv' o 'json'), un trozo por lote."""
+        encoder = cls.ENCODERS[fmt](cls.COLUMNS)
+        yield encoder.start()
+        for batch in cls.batches(landlord, chunk_size):
+            yield encoder.encode(batch)
+        yield encoder.end()
+
+    @classmethod
+    async def achunks(cls, landlord, fmt, chunk_size=None):
+        """Variante async de chunks(): bajo ASGI StreamingHttpResponse la consume sin bufferizar."""
+        encoder = cls.ENCODERS[fmt](cls.COLUMNS)
+        yield encoder.start()
+        async for batch in cls.abatches(landlord, chunk_size):
+            yield encoder.encode(batch)
+        yield encoder.end()
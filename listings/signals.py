@@ -0,0 +1,23 @@
+"""
+Signals para el módulo de listings.
+
+Renuevan la versión cacheada de las secciones de comentarios y reseñas del
+detalle cuando cambian (ver listings/cache.py).
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from listings.cache import bump_section_version
+from listings.models import Comment, Review
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def bump_comments_version(sender, instance: Comment, **kwargs):
+    """Comentario o respuesta creado/editado/borrado → invalida la sección."""
+    bump_section_version(instance.listing_id, 'comments')
+
+
+@receiver([post_save, post_delete], sender=Review)
+def bump_reviews_version(sender, instance: Review, **kwargs):
+    """Reseña creada/editada/borrada → invalida la sección."""
+    bump_section_version(instance.listing_id, 'reviews')
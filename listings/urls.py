@@ -1,12 +1,25 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, views
 
 app_name = 'listings'
 
+
+def sync_or_async(name, sync_view, async_view):
+    """
+    Vista async para `name` si está en settings.LISTINGS_ASYNC_VIEWS
+    (variable LISTINGS_ASYNC_VIEWS, p. ej. "listing_public_list,listing_detail").
+    Pensado para despliegues ASGI (GUNICORN_APP=asgi).
+    """
+    view = async_view if name in settings.LISTINGS_ASYNC_VIEWS else sync_view
+    return view.as_view()
+
+
 urlpatterns = [
     # Público
-    path('listings/', views.ListingPublicListView.as_view(), name='listing_public_list'),
-    path('listing/<int:pk>/', views.ListingDetailView.as_view(), name='listing_detail'),
+    path('listings/', sync_or_async('listing_public_list', views.ListingPublicListView, views.ListingPublicListAsyncView), name='listing_public_list'),
+    path('listing/<int:pk>/', sync_or_async('listing_detail', views.ListingDetailView, views.ListingDetailAsyncView), name='listing_detail'),
+    path('listing/<int:pk>/view/', views.listingViewBeacon, name='listing_view_beacon'),
     path('listing/<int:pk>/addFavorite', views.listingAddFavoriteView, name='addFavorite'),
     path('listing/<int:pk>/removeFavorite', views.listingRemoveFavoriteView, name='removeFavorite'),
 
@@ -17,12 +30,20 @@ urlpatterns = [
     path('landlord/listings/<int:pk>/delete/', views.ListingDeleteView.as_view(), name='listing_delete'),
     path('landlord/listings/<int:pk>/toggle/', views.ListingToggleAvailabilityView.as_view(), name='listing_toggle'),
     path('landlord/listings/stats/', views.LandlordListingStatsView.as_view(), name='landlord_listing_stats'),
+    path('landlord/listings/stats/export.<str:fmt>', views.LandlordListingExportView.as_view(), name='landlord_listing_export'),
 
     #Comentarios
     path('listing/<int:pk>/comment/', views.CommentCreateView.as_view(), name='comment_create'),
     path('comment/<int:pk>/delete/', views.CommentDeleteView.as_view(), name='comment_delete'),
+    path('listing/<int:pk>/comments/', views.commentPageView, name='comment_page'),
+    path('comment/<int:pk>/replies/', views.commentRepliesView, name='comment_replies'),
 
     #Reviews
     path('listing/<int:pk>/review/', views.ReviewCreateView.as_view(), name='review_create'),
     path('review/<int:pk>/delete/', views.ReviewDeleteView.as_view(), name='review_delete'),
+
+    # API JSON (solo lectura)
+    path('api/listings/', api.ListingSearchApiView.as_view(), name='api_listing_search'),
+    path('api/listings/<int:pk>/', api.ListingDetailApiView.as_view(), name='api_listing_detail'),
+    path('api/listings/<int:pk>/photos/', api.ListingPhotosApiView.as_view(), name='api_listing_photos'),
 ]
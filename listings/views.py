@@ -1,21 +1,141 @@
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage, Paginator
+from django.db import models, transaction
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.views.generic import (
     ListView, DetailView, CreateView, UpdateView, DeleteView, View
 )
-from django.http import HttpResponseForbidden
+from django.http import (
+    Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, HttpResponseRedirect, JsonResponse,
+    StreamingHttpResponse,
+)
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils import timezone
+from django.utils.http import http_date
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.handlers.asgi import ASGIRequest
 
-from .models import Listing, ListingPhoto, Comment, Review, Zone
+from .models import Listing, ListingPhoto, Comment, Favorite, Review, Zone
 from .forms import ListingForm, CommentForm, ReviewForm
 from .mixins import LandlordRequiredMixin
+from .analytics import ListingStatsService, is_new_view, view_buffer, view_visitor
+from .cache import (
+    adetail_versions, attach_thumbnails, detail_stamp, detail_validators, detail_versions, with_photo_stamp,
+)
+from .services import CommentPage, CommentThreadService, ListingCounterService, ListingExportService
+from users.models import Student, Landlord
 
 
 # --------- VISTAS PÚBLICAS (estudiante / cualquiera) ----------
 
+def filter_public_listings(params):
+    """
+    Queryset de anuncios disponibles con los filtros de la lista pública
+    (búsqueda, precio, zona, habitaciones, baños y orden).
+
+    Compartido por ListingPublicListView y ListingPublicListAsyncView.
+    El sello de fotos (with_photo_stamp) es parte de la llave del fragmento
+    cacheado de la tarjeta; la miniatura se carga con attach_thumbnails solo
+    si algún fragmento de la página no está en cache.
+    """
+    qs = with_photo_stamp(
+        Listing.objects
+        .filter(available=True)
+        .select_related('zone')
+    )
+    return apply_public_filters(qs, params)
+
+
+def apply_public_filters(qs, params):
+    """
+    Filtros y orden de la lista pública sobre cualquier queryset de Listing.
+    La API JSON (listings/api.py) los aplica sin fotos ni select_related.
+    """
+    # Búsqueda por texto (dirección / ubicación)
+    search = params.get('q', '').strip()
+    if search:
+        qs = qs.filter(location_text__icontains=search)
+
+    # Precio mínimo y máximo
+    price_min = params.get('price_min')
+    price_max = params.get('price_max')
+    if price_min:
+        qs = qs.filter(price__gte=price_min)
+    if price_max:
+        qs = qs.filter(price__lte=price_max)
+
+    # Zonas (uno o varios IDs)
+    zone_ids = params.getlist('zone')
+    if zone_ids:
+        qs = qs.filter(zone_id__in=zone_ids)
+
+    # Habitaciones y baños mínimos
+    rooms_min = params.get('rooms_min')
+    baths_min = params.get('baths_min')
+    if rooms_min:
+        qs = qs.filter(rooms__gte=rooms_min)
+    if baths_min:
+        qs = qs.filter(bathrooms__gte=baths_min)
+
+    # Ordenamiento
+    order = params.get('order', 'recent')
+    if order == 'price_asc':
+        qs = qs.order_by('price')
+    elif order == 'price_desc':
+        qs = qs.order_by('-price')
+    else:
+        qs = qs.order_by('-created_at')
+
+    return qs
+
+
+def query_without_page(params):
+    """Query string actual sin `page`, para los enlaces de paginación."""
+    params = params.copy()
+    params.pop('page', None)
+    return params.urlencode()
+
+
+def public_list_filters(params):
+    """Filtros actuales para re-pintar el formulario de la lista pública."""
+    return {
+        'q': params.get('q', '').strip(),
+        'price_min': params.get('price_min', ''),
+        'price_max': params.get('price_max', ''),
+        'rooms_min': params.get('rooms_min', ''),
+        'baths_min': params.get('baths_min', ''),
+        'order': params.get('order', 'recent'),
+        'zone_ids': params.getlist('zone'),
+    }
+
+
+def listing_detail_flags(listing, student, landlord, is_favorited, has_review):
+    """
+    Permisos del detalle a partir de los perfiles ya cargados del usuario
+    (None si no aplica). Compartido por las variantes sync y async.
+    """
+    is_owner_landlord = bool(landlord and listing.owner_id == landlord.id)
+    return {
+        'can_comment': bool(student) or is_owner_landlord,
+        'can_report_users': bool(student or landlord),
+        'can_add_favorite': bool(student) and not is_favorited,
+        'can_remove_favorite': bool(student) and is_favorited,
+        'can_review': bool(student) and not has_review,
+        'back_url': (
+            'listings:landlord_listing_list'
+            if is_owner_landlord
+            else 'listings:listing_public_list'
+        ),
+    }
+
+
 class ListingPublicListView(ListView):
     """
     Lista pública de anuncios para estudiantes/usuarios,
@@ -26,64 +146,80 @@ class ListingPublicListView(ListView):
     paginate_by = 12
 
     def get_queryset(self):
-        qs = Listing.objects.filter(available=True).select_related('zone')
-
-        request = self.request
-        params = request.GET
-
-        # Búsqueda por texto (dirección / ubicación)
-        search = params.get('q', '').strip()
-        if search:
-            qs = qs.filter(location_text__icontains=search)
-
-        # Precio mínimo y máximo
-        price_min = params.get('price_min')
-        price_max = params.get('price_max')
-        if price_min:
-            qs = qs.filter(price__gte=price_min)
-        if price_max:
-            qs = qs.filter(price__lte=price_max)
-
-        # Zonas (uno o varios IDs)
-        zone_ids = params.getlist('zone')
-        if zone_ids:
-            qs = qs.filter(zone_id__in=zone_ids)
-
-        # Habitaciones y baños mínimos
-        rooms_min = params.get('rooms_min')
-        baths_min = params.get('baths_min')
-        if rooms_min:
-            qs = qs.filter(rooms__gte=rooms_min)
-        if baths_min:
-            qs = qs.filter(bathrooms__gte=baths_min)
-
-        # Ordenamiento
-        order = params.get('order', 'recent')
-        if order == 'price_asc':
-            qs = qs.order_by('price')
-        elif order == 'price_desc':
-            qs = qs.order_by('-price')
-        else:
-            qs = qs.order_by('-created_at')
-
-        return qs
+        return filter_public_listings(self.request.GET)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        params = self.request.GET
 
+        attach_thumbnails(context['object_list'])
         context['zones'] = Zone.objects.all().order_by('city', 'name')
+        context['current_filters'] = public_list_filters(self.request.GET)
+        context['query_without_page'] = query_without_page(self.request.GET)
+        return context
+
+
+class ListingPublicListAsyncView(View):
+    """
+    Variante async de ListingPublicListView (mismo template y contexto).
+
+    Todas las queries usan el ORM async (acount / async for); solo el render
+    del template corre en un thread. Se activa por URL con
+    settings.LISTINGS_ASYNC_VIEWS (ver listings/urls.py).
+    """
+    template_name = ListingPublicListView.template_name
+    paginate_by = ListingPublicListView.paginate_by
 
-        context['current_filters'] = {
-            'q': params.get('q', '').strip(),
-            'price_min': params.get('price_min', ''),
-            'price_max': params.get('price_max', ''),
-            'rooms_min': params.get('rooms_min', ''),
-            'baths_min': params.get('baths_min', ''),
-            'order': params.get('order', 'recent'),
-            'zone_ids': params.getlist('zone'),
+    async def get(self, request):
+        queryset = filter_public_listings(request.GET)
+
+        paginator = Paginator(queryset, self.paginate_by)
+        # count es un cached_property: precargarlo evita el COUNT sync en page()
+        paginator.count = await queryset.acount()
+
+        page_number = request.GET.get('page') or 1
+        try:
+            if page_number == 'last':
+                page_number = paginator.num_pages
+            page = paginator.page(int(page_number))
+        except (ValueError, InvalidPage):
+            raise Http404("Página inválida.")
+
+        page.object_list = attach_thumbnails([listing async for listing in page.object_list])
+
+        context = {
+            'view': self,
+            'paginator': paginator,
+            'page_obj': page,
+            'is_paginated': paginator.num_pages > 1,
+            'object_list': page.object_list,
+            'listing_list': page.object_list,
+            'zones': [zone async for zone in Zone.objects.order_by('city', 'name')],
+            'current_filters': public_list_filters(request.GET),
+            'query_without_page': query_without_page(request.GET),
         }
-        return context
+        request.user = await request.auser()
+        return await sync_to_async(render)(request, self.template_name, context)
+
+
+def detail_not_modified(request, validators):
+    """
+    304 del detalle si el cliente ya tiene esta versión. Nunca con mensajes
+    pendientes: el 304 no los mostraría y quedarían para la página siguiente.
+    """
+    if len(messages.get_messages(request)):
+        return None
+    etag, last_modified = validators
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def with_detail_validators(response, validators):
+    etag, last_modified = validators
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = http_date(last_modified)
+    # Privado (depende del usuario) y siempre revalidado
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Cookie',))
+    return response
 
 
 class ListingDetailView(DetailView):
@@ -92,15 +228,26 @@ class ListingDetailView(DetailView):
     Aquí mostramos SIEMPRE los comentarios, y dejamos comentar a:
       - estudiantes (en cualquier anuncio)
       - landlord dueño del anuncio
+
+    Responde 304 (sin render) si el ETag/Last-Modified del cliente sigue
+    vigente (listings.cache.detail_validators: una query más las versiones
+    de sección en cache). Las visitas las
+    suma listingViewBeacon desde el navegador, también tras un 304.
     """
     model = Listing
     template_name = 'listings/detail.html'
 
-    def get_object(self, queryset=None):
-        obj = super().get_object(queryset)
-        Listing.objects.filter(pk=obj.pk).update(views=models.F('views') + 1)
-        obj.refresh_from_db(fields=['views'])
-        return obj
+    def get(self, request, *args, **kwargs):
+        stamp = detail_stamp(kwargs['pk']).first()
+        if stamp is None:
+            raise Http404("No se encontró el anuncio.")
+        self.section_versions = detail_versions(kwargs['pk'], stamp)
+        validators = detail_validators(stamp, self.section_versions, request.user)
+        response = detail_not_modified(request, validators) or super().get(request, *args, **kwargs)
+        return with_detail_validators(response, validators)
+
+    def get_queryset(self):
+        return with_photo_stamp(Listing.objects.select_related('zone', 'owner__user'))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -111,69 +258,170 @@ class ListingDetailView(DetailView):
 
         context['photos'] = listing.photos.all().order_by('sort_order')
 
-        context['comments'] = (
-            Comment.objects
-            .filter(listing=listing, parent__isnull=True)
-            .select_related('author')
-            .prefetch_related('replies__author')
-            .order_by('created_at')
-        )
+        # Primera página de hilos; el resto y las respuestas van por comment_page / comment_replies
+        context['comment_page'] = CommentThreadService.page(listing.pk)
 
         context['reviews'] = (
             Review.objects
             .filter(listing=listing)
-            .select_related('author')
+            .select_related('author__user')
             .order_by('created_at')
         )
 
-        can_comment = False
-        if user.is_authenticated:
-            is_student = hasattr(user, 'student_profile')
-            landlord = getattr(user, 'landlord_profile', None)
-            is_owner_landlord = bool(landlord and listing.owner_id == landlord.id)
-            if is_student or is_owner_landlord:
-                can_comment = True
+        student = getattr(user, 'student_profile', None) if user.is_authenticated else None
+        landlord = getattr(user, 'landlord_profile', None) if user.is_authenticated else None
+        is_favorited = bool(student) and listing.favorited_by.filter(pk=student.pk).exists()
+        has_review = bool(student) and Review.objects.filter(listing=listing, author=student).exists()
 
-        context['can_comment'] = can_comment
+        context.update(listing_detail_flags(listing, student, landlord, is_favorited, has_review))
         context['comment_form'] = CommentForm()
+        context['review_form'] = ReviewForm()
+        context['landlord_user'] = listing.owner.user if listing.owner else None
 
-        can_add_favorite = False
-        can_remove_favorite = False
-        if user.is_authenticated and hasattr(user, 'student_profile'):
-            student = getattr(user, 'student_profile', None)
-            is_favorited = listing.favorited_by.filter(pk=student.pk).exists()
-            if is_favorited:
-                can_remove_favorite = True
-            else:
-                can_add_favorite = True
+        # Comentarios y reseñas solo se cachean para visitantes anónimos
+        if not user.is_authenticated:
+            context['section_versions'] = self.section_versions
 
-        context['can_add_favorite'] = can_add_favorite
-        context['can_remove_favorite'] = can_remove_favorite
+        return context
 
-        context['landlord_user'] = listing.owner.user if listing.owner else None
 
-        can_review = False
+class ListingDetailAsyncView(View):
+    """
+    Variante async de ListingDetailView (mismo template y contexto).
+
+    Listing y perfiles del usuario se cargan con el ORM async (aget / afirst /
+    aexists); solo el render del template corre en un thread.
+
+    Las secciones que el template cachea (carrusel siempre; comentarios y
+    reseñas para anónimos) se pasan como querysets lazy: solo se consultan,
+    dentro del render, si el fragmento no está en cache. Para usuarios
+    autenticados comentarios y reseñas se cargan con async for.
+
+    Mismo GET condicional (304) que ListingDetailView.
+    """
+    template_name = ListingDetailView.template_name
+
+    async def get(self, request, pk):
+        stamp = await detail_stamp(pk).afirst()
+        if stamp is None:
+            raise Http404("No se encontró el anuncio.")
+        user = await request.auser()
+        versions = await adetail_versions(pk, stamp)
+        validators = detail_validators(stamp, versions, user)
+        response = detail_not_modified(request, validators) or await self.render_detail(request, pk, user, versions)
+        return with_detail_validators(response, validators)
+
+    async def render_detail(self, request, pk, user, versions):
+        listings = with_photo_stamp(Listing.objects.select_related('zone', 'owner__user'))
+        try:
+            listing = await listings.aget(pk=pk)
+        except Listing.DoesNotExist:
+            raise Http404("No se encontró el anuncio.")
+
+        student = landlord = None
         if user.is_authenticated:
-            student = getattr(user, 'student_profile', None)
-            can_review = student and not Review.objects.filter(
-                listing=listing, author=student
+            student = await Student.objects.filter(user_id=user.pk).afirst()
+            landlord = await Landlord.objects.filter(user_id=user.pk).afirst()
+        is_favorited = bool(student) and await listing.favorited_by.filter(pk=student.pk).aexists()
+        has_review = bool(student) and await Review.objects.filter(listing=listing, author=student).aexists()
+
+        comment_page = CommentThreadService.page(listing.pk)
+        reviews = (
+            Review.objects
+            .filter(listing=listing)
+            .select_related('author__user')
+            .order_by('created_at')
+        )
+
+        if user.is_authenticated:
+            comment_page = CommentPage(
+                comment_page.queryset,
+                comment_page.size,
+                rows=[comment async for comment in comment_page.queryset[:comment_page.size + 1]],
             )
+            reviews = [review async for review in reviews]
+
+        context = {
+            'view': self,
+            'object': listing,
+            'listing': listing,
+            'favorited_by': await listing.favorited_by.acount(),
+            'photos': listing.photos.order_by('sort_order'),
+            'comment_page': comment_page,
+            'reviews': reviews,
+            'comment_form': CommentForm(),
+            'review_form': ReviewForm(),
+            'landlord_user': listing.owner.user if listing.owner else None,
+            **listing_detail_flags(listing, student, landlord, is_favorited, has_review),
+        }
+        if not user.is_authenticated:
+            context['section_versions'] = versions
+        request.user = user
+        return await sync_to_async(render)(request, self.template_name, context)
 
-        context['can_review'] = can_review
-        context['review_form'] = ReviewForm()
 
-        is_owner_landlord = (
-            hasattr(user, 'landlord_profile')
-            and listing.owner_id == getattr(user, 'landlord_profile').id
-        ) if user.is_authenticated else False
+@csrf_exempt
+@require_POST
+def listingViewBeacon(request, pk):
+    """
+    Suma una visita al anuncio. La envía detail.html con navigator.sendBeacon
+    al cargar, así que cuenta también las visitas servidas con 304.
+    Un mismo visitante (usuario o IP) cuenta una vez por anuncio cada
+    LISTING_VIEW_DEDUP_SECONDS; los repetidos responden 204 sin contar.
+    La escritura va por el buffer de listings.analytics (agrupada por anuncio).
+    """
+    if not Listing.objects.filter(pk=pk).exists():
+        raise Http404("No se encontró el anuncio.")
+    if is_new_view(pk, view_visitor(request)):
+        view_buffer.add(pk)
+    return HttpResponse(status=204)
+
+
+def comment_viewer_flags(request, listing):
+    """Flags de listing_detail_flags que usan los partials de comentarios."""
+    user = request.user
+    student = getattr(user, 'student_profile', None) if user.is_authenticated else None
+    landlord = getattr(user, 'landlord_profile', None) if user.is_authenticated else None
+    flags = listing_detail_flags(listing, student, landlord, False, False)
+    return {
+        'can_comment': flags['can_comment'],
+        'can_report_users': flags['can_report_users'],
+    }
+
+
+def render_comments(request, listing, comments, extra=None):
+    html = render_to_string('listings/comment_list.html', {
+        'comments': comments,
+        'comment_form': CommentForm(),
+        **comment_viewer_flags(request, listing),
+    }, request=request)
+    return JsonResponse({'html': html, **(extra or {})})
+
+
+@require_GET
+def commentPageView(request, pk):
+    """
+    Siguiente página de hilos de un anuncio (JSON con el HTML ya renderizado).
+    ?cursor= es el next_cursor de la página anterior.
+    """
+    listing = get_object_or_404(Listing, pk=pk)
+    try:
+        page = CommentThreadService.page(listing.pk, request.GET.get('cursor'))
+        comments = page.comments
+    except ValueError:
+        return HttpResponseBadRequest("Cursor inválido.")
+    return render_comments(request, listing, comments, {
+        'has_more': page.has_more,
+        'next_cursor': page.next_cursor,
+    })
 
-        context['back_url'] = (
-            'listings:landlord_listing_list'
-            if is_owner_landlord
-            else 'listings:listing_public_list'
-        )
 
-        return context
+@require_GET
+def commentRepliesView(request, pk):
+    """Hilo completo bajo un comentario (JSON con el HTML ya renderizado)."""
+    comment = get_object_or_404(Comment.objects.select_related('listing'), pk=pk)
+    replies = list(CommentThreadService.replies(comment))
+    return render_comments(request, comment.listing, replies)
 
 
 def listingAddFavoriteView(request, pk):
@@ -181,7 +429,9 @@ def listingAddFavoriteView(request, pk):
     if request.method == "POST":
         user = request.user
         student = getattr(user, 'student_profile', None)
-        listing.favorited_by.add(student)
+        _, created = Favorite.objects.get_or_create(student=student, listing=listing)
+        if created:
+            ListingStatsService.record(listing.pk, favorites_added=1)
     return redirect('listings:listing_detail', pk=listing.pk)
 
 
@@ -205,7 +455,13 @@ class LandlordListingListView(LandlordRequiredMixin, ListView):
 
     def get_queryset(self):
         landlord = self.request.user.landlord_profile
-        return Listing.objects.filter(owner=landlord).order_by('-created_at')
+        return with_photo_stamp(Listing.objects.filter(owner=landlord)).order_by('-created_at')
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # La miniatura se consulta solo si su fragmento no está en cache
+        attach_thumbnails(context['object_list'])
+        return context
 
 
 class ListingCreateView(LandlordRequiredMixin, CreateView):
@@ -362,17 +618,33 @@ class CommentDeleteView(LoginRequiredMixin, DeleteView):
     model = Comment
     template_name = 'listings/comment_confirm_delete.html'
 
+    def get_queryset(self):
+        return Comment.objects.select_related('listing')
+
+    def get_object(self, queryset=None):
+        # dispatch y post/delete comparten el comentario ya cargado
+        if getattr(self, 'object', None) is None:
+            self.object = super().get_object(queryset)
+        return self.object
+
     def get_success_url(self):
         return reverse_lazy('listings:listing_detail', kwargs={'pk': self.object.listing_id})
 
+    def form_valid(self, form):
+        # Borra el hilo completo y descuenta comment_count
+        success_url = self.get_success_url()
+        ListingCounterService.delete_comment(self.object)
+        return HttpResponseRedirect(success_url)
+
     def dispatch(self, request, *args, **kwargs):
         comment = self.get_object()
         user = request.user
 
-        is_author = (comment.author == user)
+        # Comparación por ids: sin cargar author ni listing.owner
+        is_author = (comment.author_id == user.pk)
 
-        has_landlord_profile = hasattr(user, 'landlord_profile')
-        is_listing_owner = has_landlord_profile and (comment.listing.owner == user.landlord_profile)
+        landlord = getattr(user, 'landlord_profile', None) if user.is_authenticated else None
+        is_listing_owner = landlord is not None and comment.listing.owner_id == landlord.pk
 
         if user.is_superuser or is_author or is_listing_owner:
             return super().dispatch(request, *args, **kwargs)
@@ -390,6 +662,46 @@ class LandlordListingStatsView(LandlordRequiredMixin, ListView):
         landlord = self.request.user.landlord_profile
         return Listing.objects.filter(owner=landlord).order_by('-views')
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Una query agregada por día sobre listing_daily_stats
+        series = ListingStatsService.daily_series(self.request.user.landlord_profile)
+        context['daily_stats'] = series
+        context['daily_totals'] = {
+            field: sum(point[field] for point in series)
+            for field in ListingStatsService.FIELDS
+        }
+        return context
+
+
+class LandlordListingExportView(LandlordRequiredMixin, View):
+    """
+    Exportación CSV o JSON de los anuncios del arrendador con sus
+    estadísticas (ListingExportService), enviada en streaming.
+
+    Bajo ASGI el contenido es un iterador async: con uno sync Django lo
+    leería entero (sync_to_async(list)) antes de enviar el primer byte.
+    """
+    content_types = {
+        'csv': 'text/csv; charset=utf-8',
+        'json': 'application/json',
+    }
+
+    def get(self, request, fmt):
+        if fmt not in self.content_types:
+            raise Http404("Formato de exportación no soportado.")
+
+        landlord = request.user.landlord_profile
+        if isinstance(request, ASGIRequest):
+            chunks = ListingExportService.achunks(landlord, fmt)
+        else:
+            chunks = ListingExportService.chunks(landlord, fmt)
+
+        response = StreamingHttpResponse(chunks, content_type=self.content_types[fmt])
+        filename = f"umigo-anuncios-{timezone.localdate():%Y%m%d}.{fmt}"
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
 
 class CommentCreateView(View):
     """
@@ -421,10 +733,12 @@ class CommentCreateView(View):
             comment.author = user
 
             parent = form.cleaned_data.get("parent")
-            if parent is not None and parent.listing_id == listing.id:
+            if parent is not None and parent.listing_id == listing.id and parent.accepts_replies:
                 comment.parent = parent
 
-            comment.save()
+            with transaction.atomic():
+                comment.save()
+                ListingCounterService.comment_created(comment)
 
         return redirect('listings:listing_detail', pk=listing.pk)
 
@@ -452,7 +766,9 @@ class ReviewCreateView(View):
             review = form.save(commit=False)
             review.listing = listing
             review.author = student
-            review.save()
+            with transaction.atomic():
+                review.save()
+                ListingCounterService.review_created(review)
 
         return redirect('listings:listing_detail', pk=listing.pk)
 
@@ -464,6 +780,11 @@ class ReviewDeleteView(LoginRequiredMixin, DeleteView):
     def get_success_url(self):
         return reverse_lazy('listings:listing_detail', kwargs={'pk': self.object.listing_id})
 
+    def form_valid(self, form):
+        success_url = self.get_success_url()
+        ListingCounterService.delete_review(self.object)
+        return HttpResponseRedirect(success_url)
+
     def dispatch(self, request, *args, **kwargs):
         review = self.get_object()
         user = request.user
@@ -4,4 +4,8 @@ register = template.Library()
 
 @register.filter('inGroup')
 def inGroup(user, group_name):
-    return user.groups.filter(name=group_name).exists()
\ No newline at end of file
+    # Una sola query por request: el layout y la página consultan varios grupos
+    group_names = getattr(user, '_group_names', None)
+    if group_names is None:
+        group_names = user._group_names = frozenset(user.groups.values_list('name', flat=True))
+    return group_name in group_names
\ No newline at end of file
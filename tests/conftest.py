@@ -77,6 +77,15 @@ def setup_test_environment(settings):
         shutil.rmtree(media_root, ignore_errors=True)
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Clear every configured cache before each test (fragment cache keys reuse pks)."""
+    from django.core.cache import caches
+    for cache in caches.all():
+        cache.clear()
+    yield
+
+
 @pytest.fixture(autouse=True)
 def clear_email_outbox():
     """Clear Django's email outbox before each test."""
@@ -363,6 +372,63 @@ def django_assert_num_queries():
     return AssertNumQueries
 
 
+@pytest.fixture
+def query_budget(request):
+    """
+    Falla si un bloque ejecuta más queries que su presupuesto y registra el
+    conteo para compararlo con tests/query_baseline.json (ver tests/query_budget.py).
+
+    Usage:
+        with query_budget(6):
+            client.get(url)
+
+        @pytest.mark.query_budget(6)     # presupuesto por defecto del test
+        def test_view(query_budget, client):
+            with query_budget():
+                client.get(url)
+            with query_budget(label='page 2'):
+                client.get(url + '?page=2')
+    """
+    from django.test.utils import CaptureQueriesContext
+    from django.db import connection
+    from tests import query_budget as budgets
+
+    marker = request.node.get_closest_marker('query_budget')
+    default = marker.args[0] if marker else None
+
+    class QueryBudget:
+        def __init__(self, limit=None, label=None):
+            self.limit = default if limit is None else limit
+            if self.limit is None:
+                raise ValueError('query_budget() sin presupuesto ni marker @pytest.mark.query_budget(n)')
+            self.key = f"{request.node.nodeid}::{label}" if label else request.node.nodeid
+            self.context = CaptureQueriesContext(connection)
+
+        def __enter__(self):
+            self.context.__enter__()
+            return self
+
+        def __exit__(self, exc_type, *args):
+            self.context.__exit__(exc_type, *args)
+            if exc_type is not None:
+                return
+            executed = len(self.context.captured_queries)
+            budgets.recorded[self.key] = executed
+            if executed > self.limit:
+                queries = '\n'.join(q['sql'] for q in self.context.captured_queries)
+                pytest.fail(
+                    f"{executed} queries, presupuesto {self.limit} ({self.key})\n{queries}",
+                    pytrace=False,
+                )
+
+    return QueryBudget
+
+
+def pytest_terminal_summary(terminalreporter):
+    from tests import query_budget as budgets
+    budgets.finish(terminalreporter)
+
+
 # ============================================================================
 # EMAIL TESTING
 # ============================================================================
@@ -0,0 +1,150 @@
+# tests/integration/test_async_listing_views.py
+"""
+Tests para las variantes async de la lista pública y el detalle de listings
+
+IMPORTANTE: Son tests de INTEGRACIÓN porque prueban:
+- Selección sync/async por URL (settings.LISTINGS_ASYNC_VIEWS)
+- Mismo contexto que las vistas sync (filtros, paginación, permisos)
+- Incremento de vistas del detalle con el ORM async
+"""
+
+import importlib
+
+import pytest
+from django.contrib.auth.models import Group
+from django.urls import clear_url_caches, resolve, reverse
+
+from listings.models import Listing
+from listings.views import ListingDetailAsyncView, ListingPublicListAsyncView
+from listings.services import CommentThreadService
+from tests.factories import CommentFactory, ListingFactory, StudentFactory
+
+
+def reload_urlconf():
+    import listings.urls
+    import umigo.urls
+
+    importlib.reload(listings.urls)
+    importlib.reload(umigo.urls)
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_listing_views(settings):
+    """Sirve listing_public_list y listing_detail con las vistas async."""
+    original = settings.LISTINGS_ASYNC_VIEWS
+    settings.LISTINGS_ASYNC_VIEWS = {'listing_public_list', 'listing_detail'}
+    reload_urlconf()
+    yield
+    settings.LISTINGS_ASYNC_VIEWS = original
+    reload_urlconf()
+
+
+@pytest.fixture
+def student_client(client):
+    student = StudentFactory()
+    student.user.groups.add(Group.objects.get_or_create(name='Students')[0])
+    client.force_login(student.user)
+    client.student = student
+    return client
+
+
+@pytest.mark.django_db
+class TestAsyncListingViews:
+    """Tests para ListingPublicListAsyncView y ListingDetailAsyncView"""
+
+    def test_urls_select_async_views(self, async_listing_views):
+        """✅ Las URLs configuradas resuelven a las vistas async"""
+        list_match = resolve(reverse('listings:listing_public_list'))
+        detail_match = resolve(reverse('listings:listing_detail', args=[1]))
+
+        assert list_match.func.view_class is ListingPublicListAsyncView
+        assert detail_match.func.view_class is ListingDetailAsyncView
+
+    def test_public_list_filters_and_paginates(self, async_listing_views, student_client):
+        """✅ La lista async aplica filtros y pagina igual que la sync"""
+        ListingFactory.create_batch(13, available=True, price=500000)
+        ListingFactory(available=True, price=2000000)
+        ListingFactory(available=False, price=500000)
+
+        response = student_client.get(
+            reverse('listings:listing_public_list'),
+            {'price_max': 1000000, 'page': 2},
+        )
+
+        assert response.status_code == 200
+        assert response.context['paginator'].count == 13
+        assert response.context['is_paginated'] is True
+        assert len(response.context['object_list']) == 1
+        assert response.context['current_filters']['price_max'] == '1000000'
+
+    def test_sync_and_async_lists_match(self, student_client, settings):
+        """✅ La vista sync y la async devuelven los mismos listings"""
+        ListingFactory.create_batch(3, available=True, rooms=2)
+        ListingFactory(available=True, rooms=1)
+        params = {'rooms_min': 2, 'order': 'price_asc'}
+        url = reverse('listings:listing_public_list')
+
+        sync_ids = [l.pk for l in student_client.get(url, params).context['object_list']]
+        settings.LISTINGS_ASYNC_VIEWS = {'listing_public_list'}
+        reload_urlconf()
+        try:
+            async_ids = [l.pk for l in student_client.get(url, params).context['object_list']]
+        finally:
+            settings.LISTINGS_ASYNC_VIEWS = set()
+            reload_urlconf()
+
+        assert len(sync_ids) == 3
+        assert sync_ids == async_ids
+
+    def test_public_list_invalid_page_is_404(self, async_listing_views, student_client):
+        """✅ Página fuera de rango → 404"""
+        ListingFactory(available=True)
+
+        response = student_client.get(reverse('listings:listing_public_list'), {'page': 5})
+
+        assert response.status_code == 404
+
+    def test_detail_counts_view_and_sets_flags(self, async_listing_views, student_client):
+        """✅ El detalle async calcula permisos del estudiante; la visita la suma el beacon"""
+        listing = ListingFactory(available=True, views=3)
+
+        response = student_client.get(reverse('listings:listing_detail', args=[listing.pk]))
+        student_client.post(reverse('listings:listing_view_beacon', args=[listing.pk]))
+
+        assert response.status_code == 200
+        assert response.context['object'].views == 3
+        assert Listing.objects.get(pk=listing.pk).views == 4
+        assert response.context['can_comment'] is True
+        assert response.context['can_review'] is True
+        assert response.context['can_add_favorite'] is True
+        assert response.context['back_url'] == 'listings:listing_public_list'
+
+    def test_detail_prefetches_first_comment_page(self, async_listing_views, student_client):
+        """✅ El detalle async carga la primera página de hilos con el ORM async"""
+        listing = ListingFactory(available=True)
+        for _ in range(CommentThreadService.PAGE_SIZE + 1):
+            CommentFactory(listing=listing)
+
+        response = student_client.get(reverse('listings:listing_detail', args=[listing.pk]))
+
+        comment_page = response.context['comment_page']
+        assert len(comment_page.comments) == CommentThreadService.PAGE_SIZE
+        assert comment_page.has_more is True
+        assert response.content.count(b'class="comment-item"') == CommentThreadService.PAGE_SIZE
+
+    def test_detail_not_modified(self, async_listing_views, student_client):
+        """✅ El detalle async también responde 304 con el mismo ETag"""
+        listing = ListingFactory(available=True)
+        url = reverse('listings:listing_detail', args=[listing.pk])
+
+        etag = student_client.get(url)['ETag']
+        response = student_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+
+    def test_detail_missing_listing_is_404(self, async_listing_views, client):
+        """✅ Listing inexistente → 404"""
+        response = client.get(reverse('listings:listing_detail', args=[999999]))
+
+        assert response.status_code == 404
@@ -0,0 +1,232 @@
+# tests/integration/test_comment_threads.py
+"""
+Tests para los hilos de comentarios paginados del detalle
+
+IMPORTANTE: Son tests de INTEGRACIÓN porque prueban:
+- Paginación por cursor (created_at, id) de los comentarios de primer nivel
+- Conteo de respuestas por hilo en la misma query
+- Endpoints JSON de "ver más" y de respuestas bajo demanda
+- Ruta materializada (path/depth) para cargar hilos en una query de rango
+"""
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.test import Client
+from django.urls import reverse
+
+from listings.models import Comment
+from listings.services import CommentThreadService, ListingCounterService
+from tests.factories import CommentFactory, ListingFactory, StudentFactory
+
+
+def logged_client(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+@pytest.mark.django_db
+class TestCommentThreadService:
+    """Tests para CommentThreadService"""
+
+    def test_pages_cover_all_threads_once(self):
+        """✅ Recorrer las páginas por cursor devuelve cada hilo una sola vez y en orden"""
+        listing = ListingFactory()
+        threads = [CommentFactory(listing=listing) for _ in range(7)]
+        CommentFactory(listing=listing, parent=threads[0])
+
+        seen = []
+        cursor = None
+        while True:
+            page = CommentThreadService.page(listing.pk, cursor, size=3)
+            seen.extend(comment.pk for comment in page.comments)
+            if not page.has_more:
+                break
+            cursor = page.next_cursor
+
+        assert seen == [thread.pk for thread in threads]
+        assert page.next_cursor is None
+
+    def test_reply_count_is_annotated(self):
+        """✅ Cada hilo trae su número de respuestas (a cualquier profundidad) sin cargarlas"""
+        listing = ListingFactory()
+        parent = CommentFactory(listing=listing)
+        CommentFactory(listing=listing)
+        replies = [CommentFactory(listing=listing, parent=parent) for _ in range(3)]
+        CommentFactory(listing=listing, parent=replies[0])
+
+        counts = {comment.pk: comment.reply_count for comment in CommentThreadService.page(listing.pk).comments}
+
+        assert counts[parent.pk] == 4
+        assert sorted(counts.values()) == [0, 4]
+
+    def test_invalid_cursor_raises_value_error(self):
+        """✅ Un cursor manipulado se rechaza"""
+        with pytest.raises(ValueError):
+            CommentThreadService.decode_cursor('no-es-un-cursor')
+
+
+@pytest.mark.django_db
+class TestCommentPaths:
+    """Tests para la ruta materializada de Comment"""
+
+    def test_path_and_depth_on_create(self):
+        """✅ path lleva los ids de los ancestros y depth el nivel"""
+        root = CommentFactory()
+        reply = CommentFactory(listing=root.listing, parent=root)
+        nested = CommentFactory(listing=root.listing, parent=reply)
+
+        nested.refresh_from_db()
+        assert root.path == Comment.path_segment(root.pk)
+        assert nested.path == root.path + Comment.path_segment(reply.pk) + Comment.path_segment(nested.pk)
+        assert (root.depth, reply.depth, nested.depth) == (0, 1, 2)
+
+    def test_thread_loads_in_one_query(self, django_assert_num_queries):
+        """✅ El hilo completo sale de una query, en orden de lectura"""
+        root = CommentFactory()
+        first = CommentFactory(listing=root.listing, parent=root)
+        second = CommentFactory(listing=root.listing, parent=root)
+        nested = CommentFactory(listing=root.listing, parent=first)
+        CommentFactory(listing=root.listing)
+
+        with django_assert_num_queries(1):
+            thread = [comment.pk for comment in CommentThreadService.thread(root)]
+
+        assert thread == [root.pk, first.pk, nested.pk, second.pk]
+        assert ListingCounterService.thread_size(first) == 2
+
+    def test_replies_carry_relative_indent(self):
+        """✅ Las respuestas traen su profundidad relativa al comentario pedido"""
+        root = CommentFactory()
+        reply = CommentFactory(listing=root.listing, parent=root)
+        nested = CommentFactory(listing=root.listing, parent=reply)
+
+        indents = {comment.pk: comment.indent for comment in CommentThreadService.replies(root)}
+
+        assert indents == {reply.pk: 0, nested.pk: 1}
+
+    def test_clean_compares_listing_ids_only(self, django_assert_num_queries):
+        """✅ clean() no carga listings para validar el mismo anuncio"""
+        root = CommentFactory()
+        reply = Comment(listing_id=ListingFactory().pk, parent=root, author=root.author, text='Hola')
+
+        with django_assert_num_queries(0):
+            with pytest.raises(ValidationError):
+                reply.clean()
+
+    def test_clean_rejects_threads_past_max_depth(self):
+        """✅ No se responde más allá de MAX_DEPTH"""
+        root = CommentFactory()
+        Comment.objects.filter(pk=root.pk).update(depth=Comment.MAX_DEPTH)
+        root.refresh_from_db()
+        reply = Comment(listing_id=root.listing_id, parent=root, author=root.author, text='Hola')
+
+        with pytest.raises(ValidationError):
+            reply.clean()
+
+    def test_rebuild_paths_fixes_bulk_created_rows(self):
+        """✅ rebuild_paths completa path/depth de filas creadas con bulk_create"""
+        listing = ListingFactory()
+        root = CommentFactory(listing=listing)
+        [reply] = Comment.objects.bulk_create([
+            Comment(listing=listing, parent=root, author=root.author, text='Respuesta')
+        ])
+        if reply.pk is None:
+            reply = Comment.objects.get(parent=root)
+
+        updated = CommentThreadService.rebuild_paths([listing.pk])
+
+        reply.refresh_from_db()
+        assert updated == 1
+        assert reply.path == root.path + Comment.path_segment(reply.pk)
+        assert reply.depth == 1
+
+
+@pytest.mark.django_db
+class TestCommentThreadViews:
+    """Tests para el detalle y los endpoints JSON de comentarios"""
+
+    def test_detail_renders_first_page_only(self):
+        """✅ El detalle muestra solo la primera página y el botón de ver más"""
+        listing = ListingFactory(available=True)
+        for _ in range(CommentThreadService.PAGE_SIZE + 2):
+            CommentFactory(listing=listing)
+        client = logged_client(StudentFactory().user)
+
+        response = client.get(reverse('listings:listing_detail', args=[listing.pk]))
+
+        assert response.status_code == 200
+        assert response.content.count(b'class="comment-item"') == CommentThreadService.PAGE_SIZE
+        assert b'js-load-comments' in response.content
+
+    def test_report_modal_is_shared(self):
+        """✅ Un solo modal de reporte para todos los comentarios"""
+        listing = ListingFactory(available=True)
+        for _ in range(3):
+            CommentFactory(listing=listing)
+        client = logged_client(StudentFactory().user)
+
+        response = client.get(reverse('listings:listing_detail', args=[listing.pk]))
+
+        assert response.content.count(b'id="reportCommentUserModal"') == 1
+        assert response.content.count(b'data-bs-target="#reportCommentUserModal"') == 3
+
+    def test_load_more_returns_next_page(self):
+        """✅ El endpoint de ver más sigue desde el cursor"""
+        listing = ListingFactory(available=True)
+        comments = [CommentFactory(listing=listing) for _ in range(CommentThreadService.PAGE_SIZE + 2)]
+        first_page = CommentThreadService.page(listing.pk)
+
+        response = Client().get(
+            reverse('listings:comment_page', args=[listing.pk]),
+            {'cursor': first_page.next_cursor},
+        )
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data['has_more'] is False
+        assert data['next_cursor'] is None
+        assert f'id="comment-{comments[-1].pk}"' in data['html']
+        assert f'id="comment-{comments[0].pk}"' not in data['html']
+
+    def test_load_more_rejects_invalid_cursor(self):
+        """✅ Cursor inválido responde 400"""
+        listing = ListingFactory(available=True)
+
+        response = Client().get(reverse('listings:comment_page', args=[listing.pk]), {'cursor': '%%%'})
+
+        assert response.status_code == 400
+
+    def test_replies_are_loaded_on_demand(self):
+        """✅ Las respuestas no van en el detalle; el hilo completo se pide aparte"""
+        listing = ListingFactory(available=True)
+        parent = CommentFactory(listing=listing)
+        reply = CommentFactory(listing=listing, parent=parent)
+        nested = CommentFactory(listing=listing, parent=reply)
+        client = logged_client(StudentFactory().user)
+
+        detail = client.get(reverse('listings:listing_detail', args=[listing.pk]))
+        response = client.get(reverse('listings:comment_replies', args=[parent.pk]))
+
+        html = response.json()['html']
+        assert f'id="comment-{reply.pk}"'.encode() not in detail.content
+        assert 'Ver 2 respuestas'.encode() in detail.content
+        assert response.status_code == 200
+        assert html.index(f'id="comment-{reply.pk}"') < html.index(f'id="comment-{nested.pk}"')
+        assert 'margin-left: 1rem' in html
+
+    def test_reply_to_nested_comment(self):
+        """✅ Se puede responder a una respuesta (árbol de cualquier profundidad)"""
+        student = StudentFactory()
+        parent = CommentFactory()
+        reply = CommentFactory(listing=parent.listing, parent=parent)
+
+        response = logged_client(student.user).post(
+            reverse('listings:comment_create', args=[parent.listing_id]),
+            {'text': 'Respuesta anidada', 'parent': reply.pk},
+        )
+
+        created = Comment.objects.get(text='Respuesta anidada')
+        assert response.status_code == 302
+        assert created.parent_id == reply.pk
+        assert created.depth == 2
@@ -0,0 +1,211 @@
+# tests/integration/test_detail_conditional_get.py
+"""
+Tests para el GET condicional del detalle y el beacon de visitas
+
+IMPORTANTE: Son tests de INTEGRACIÓN porque prueban:
+- ETag / Last-Modified a partir de una sola query y las versiones de sección
+- 304 sin render del template
+- Invalidación por fotos, comentarios, reseñas y favoritos
+- Conteo de visitas por beacon (también tras un 304), una por visitante
+"""
+
+import pytest
+from django.contrib.messages import constants
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.db.models import F
+from django.http import HttpRequest, HttpResponse
+from django.test import Client
+from django.urls import reverse
+
+from listings.cache import detail_stamp
+from listings.models import Comment, Listing
+from listings.services import ListingCounterService
+from tests.factories import (
+    CommentFactory,
+    FavoriteFactory,
+    ListingFactory,
+    ListingPhotoFactory,
+    ReviewFactory,
+    StudentFactory,
+)
+
+
+@pytest.fixture
+def student_client():
+    client = Client()
+    client.force_login(StudentFactory().user)
+    return client
+
+
+def detail_url(listing):
+    return reverse('listings:listing_detail', args=[listing.pk])
+
+
+def queue_message(client, text):
+    """Deja un mensaje pendiente en la cookie de mensajes del cliente."""
+    storage = CookieStorage(HttpRequest())
+    storage.add(constants.SUCCESS, text)
+    response = HttpResponse()
+    storage.update(response)
+    client.cookies[storage.cookie_name] = response.cookies[storage.cookie_name].value
+
+
+@pytest.mark.django_db
+class TestDetailConditionalGet:
+    """Tests para ETag / Last-Modified de ListingDetailView"""
+
+    def test_validators_and_cache_headers(self, student_client):
+        """✅ El detalle trae ETag débil, Last-Modified y Cache-Control privado"""
+        listing = ListingFactory(available=True)
+
+        response = student_client.get(detail_url(listing))
+
+        assert response.status_code == 200
+        assert response['ETag'].startswith('W/"')
+        assert response['Last-Modified']
+        assert 'private' in response['Cache-Control']
+        assert 'no-cache' in response['Cache-Control']
+
+    def test_not_modified_skips_render(self, student_client, django_assert_max_num_queries):
+        """✅ Con el ETag vigente responde 304 sin template ni queries del detalle"""
+        listing = ListingFactory(available=True)
+        etag = student_client.get(detail_url(listing))['ETag']
+
+        # sesión + usuario + sello del detalle
+        with django_assert_max_num_queries(3):
+            response = student_client.get(detail_url(listing), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+        assert not response.templates
+
+    def test_if_modified_since(self, student_client):
+        """✅ If-Modified-Since con la fecha devuelta también da 304"""
+        listing = ListingFactory(available=True)
+        last_modified = student_client.get(detail_url(listing))['Last-Modified']
+
+        response = student_client.get(detail_url(listing), HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == 304
+
+    @pytest.mark.parametrize('change', ['photo', 'comment', 'review', 'favorite', 'comment_deleted'])
+    def test_related_changes_invalidate(self, student_client, change):
+        """✅ Fotos, comentarios, reseñas y favoritos cambian el ETag"""
+        listing = ListingFactory(available=True)
+        comment = CommentFactory(listing=listing)
+        ListingCounterService.comment_created(comment)
+        etag = student_client.get(detail_url(listing))['ETag']
+
+        if change == 'photo':
+            ListingPhotoFactory(listing=listing)
+        elif change == 'comment':
+            ListingCounterService.comment_created(CommentFactory(listing=listing))
+        elif change == 'review':
+            ListingCounterService.review_created(ReviewFactory(listing=listing))
+        elif change == 'favorite':
+            FavoriteFactory(listing=listing)
+        else:
+            ListingCounterService.delete_comment(comment)
+
+        response = student_client.get(detail_url(listing), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+
+    def test_views_change_etag(self, student_client):
+        """✅ Las visitas (mostradas en el detalle) cambian el ETag"""
+        listing = ListingFactory(available=True)
+        etag = student_client.get(detail_url(listing))['ETag']
+
+        Listing.objects.filter(pk=listing.pk).update(views=F('views') + 1, updated_at=F('updated_at'))
+        response = student_client.get(detail_url(listing), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+
+    def test_local_cache_reads_sections_from_db(self, student_client):
+        """✅ Con locmem, un comentario de otro worker (sin bump local) invalida el 304"""
+        listing = ListingFactory(available=True)
+        author = StudentFactory().user
+        etag = student_client.get(detail_url(listing))['ETag']
+
+        # bulk_create no dispara la señal que renueva la versión en esta cache
+        Comment.objects.bulk_create([Comment(listing=listing, author=author, text='Desde otro worker')])
+        response = student_client.get(detail_url(listing), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert b'Desde otro worker' in response.content
+
+    def test_etag_depends_on_user(self, student_client):
+        """✅ Otro usuario no recibe el 304 de otro"""
+        listing = ListingFactory(available=True)
+        etag = student_client.get(detail_url(listing))['ETag']
+
+        response = Client().get(detail_url(listing), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+
+    def test_pending_messages_force_render(self, student_client):
+        """✅ Con mensajes pendientes se renderiza la página (y se muestran)"""
+        listing = ListingFactory(available=True)
+        etag = student_client.get(detail_url(listing))['ETag']
+
+        queue_message(student_client, 'Listo')
+        response = student_client.get(detail_url(listing), HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert b'Listo' in response.content
+
+    def test_stamp_is_one_query(self, django_assert_num_queries):
+        """✅ El sello sale de una sola query"""
+        listing = ListingFactory()
+        ListingPhotoFactory.create_batch(2, listing=listing)
+        FavoriteFactory(listing=listing)
+
+        with django_assert_num_queries(1):
+            stamp = detail_stamp(listing.pk).first()
+
+        assert stamp['photo_count'] == 2
+        assert stamp['favorite_count'] == 1
+        assert stamp['last_photo_at'] is not None
+
+
+@pytest.mark.django_db
+class TestViewBeacon:
+    """Tests para listingViewBeacon"""
+
+    def test_get_does_not_count_view(self, student_client):
+        """✅ El GET del detalle ya no suma visitas"""
+        listing = ListingFactory(available=True, views=5)
+
+        student_client.get(detail_url(listing))
+
+        assert Listing.objects.get(pk=listing.pk).views == 5
+
+    def test_beacon_counts_view_without_csrf(self):
+        """✅ El beacon suma una visita sin token CSRF y responde 204"""
+        listing = ListingFactory(available=True, views=5)
+        client = Client(enforce_csrf_checks=True)
+
+        response = client.post(reverse('listings:listing_view_beacon', args=[listing.pk]))
+
+        assert response.status_code == 204
+        assert Listing.objects.get(pk=listing.pk).views == 6
+
+    def test_beacon_counts_each_visitor_once(self, settings):
+        """✅ Repetir el beacon desde la misma IP no infla las visitas"""
+        settings.LISTING_VIEW_DEDUP_SECONDS = 1800
+        listing = ListingFactory(available=True, views=5)
+        url = reverse('listings:listing_view_beacon', args=[listing.pk])
+
+        for _ in range(3):
+            assert Client().post(url).status_code == 204
+        Client().post(url, REMOTE_ADDR='10.0.0.2')
+
+        assert Listing.objects.get(pk=listing.pk).views == 7
+
+    def test_beacon_only_accepts_post(self):
+        """✅ GET al beacon → 405; anuncio inexistente → 404"""
+        listing = ListingFactory()
+
+        assert Client().get(reverse('listings:listing_view_beacon', args=[listing.pk])).status_code == 405
+        assert Client().post(reverse('listings:listing_view_beacon', args=[999999])).status_code == 404
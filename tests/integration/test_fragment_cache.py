@@ -0,0 +1,143 @@
+# tests/integration/test_fragment_cache.py
+"""
+Tests para el fragment caching de listings
+
+IMPORTANTE: Son tests de INTEGRACIÓN porque prueban:
+- Secciones de comentarios/reseñas cacheadas para anónimos
+- Invalidación por versión al crear/borrar comentarios y reseñas
+- Llaves de tarjetas basadas en updated_at y el sello de fotos
+"""
+
+import pytest
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from listings.cache import section_versions
+from listings.models import Listing
+from tests.factories import CommentFactory, ListingFactory, ListingPhotoFactory, ReviewFactory, StudentFactory
+
+
+def detail_url(listing):
+    return reverse('listings:listing_detail', args=[listing.pk])
+
+
+@pytest.fixture
+def shared_fragment_cache(settings, tmp_path):
+    """Cache "fragments" compartida entre workers (como file/shm/redis en producción)"""
+    settings.CACHES = {
+        **settings.CACHES,
+        'fragments': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / 'fragments'),
+        },
+    }
+
+
+@pytest.fixture
+def student_client(client):
+    """La lista pública solo muestra tarjetas a usuarios del grupo Students"""
+    student = StudentFactory()
+    student.user.groups.add(Group.objects.get_or_create(name='Students')[0])
+    client.force_login(student.user)
+    return client
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('shared_fragment_cache')
+class TestDetailSectionCache:
+    """Tests para comentarios y reseñas cacheados en el detalle"""
+
+    def test_anonymous_second_visit_skips_comment_queries(self, client):
+        """✅ Con la sección en cache, no se consultan comentarios ni reseñas"""
+        listing = ListingFactory(available=True)
+        CommentFactory(listing=listing, text='Primer comentario')
+        client.get(detail_url(listing))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(detail_url(listing))
+
+        assert 'Primer comentario' in response.content.decode()
+        tables = ' '.join(q['sql'] for q in ctx.captured_queries)
+        assert '"comment"' not in tables
+        assert '"review"' not in tables
+
+    def test_new_comment_bumps_version(self, client):
+        """✅ Un comentario nuevo invalida la sección y aparece para anónimos"""
+        listing = ListingFactory(available=True)
+        client.get(detail_url(listing))
+        before = section_versions(listing.pk)
+
+        CommentFactory(listing=listing, text='Comentario nuevo')
+        response = client.get(detail_url(listing))
+
+        assert section_versions(listing.pk)['comments'] != before['comments']
+        assert section_versions(listing.pk)['reviews'] == before['reviews']
+        assert 'Comentario nuevo' in response.content.decode()
+
+    def test_deleted_review_disappears(self, client):
+        """✅ Borrar una reseña invalida la sección de reseñas"""
+        listing = ListingFactory(available=True)
+        review = ReviewFactory(listing=listing, text='Reseña temporal')
+        assert 'Reseña temporal' in client.get(detail_url(listing)).content.decode()
+
+        review.delete()
+
+        assert 'Reseña temporal' not in client.get(detail_url(listing)).content.decode()
+
+    def test_authenticated_users_bypass_section_cache(self, authenticated_client):
+        """✅ Usuarios autenticados no reciben section_versions (sin cache de secciones)"""
+        listing = ListingFactory(available=True)
+
+        response = authenticated_client.get(detail_url(listing))
+
+        assert 'section_versions' not in response.context
+
+    def test_view_does_not_change_updated_at(self, client):
+        """✅ Contar una vista no modifica updated_at (llave de los fragmentos)"""
+        listing = ListingFactory(available=True)
+        updated_at = Listing.objects.get(pk=listing.pk).updated_at
+
+        client.get(detail_url(listing))
+
+        assert Listing.objects.get(pk=listing.pk).updated_at == updated_at
+
+
+@pytest.mark.django_db
+class TestPhotoStamp:
+    """Tests para el sello de fotos usado en las llaves de tarjetas y carrusel"""
+
+    def test_new_photo_changes_stamp(self, client):
+        """✅ Agregar una foto cambia photo_count y last_photo_at"""
+        listing = ListingFactory(available=True)
+        ListingPhotoFactory(listing=listing)
+        first = client.get(detail_url(listing)).context['object']
+
+        ListingPhotoFactory(listing=listing)
+        second = client.get(detail_url(listing)).context['object']
+
+        assert (first.photo_count, second.photo_count) == (1, 2)
+        assert second.last_photo_at >= first.last_photo_at
+
+    def test_cached_cards_skip_photo_queries(self, student_client):
+        """✅ Con las tarjetas en cache no se consultan las fotos"""
+        for _ in range(3):
+            ListingPhotoFactory(listing=ListingFactory(available=True))
+        url = reverse('listings:listing_public_list')
+        student_client.get(url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = student_client.get(url)
+
+        assert response.content.count(b'alt="Foto de ') == 3
+        assert not any(q['sql'].startswith('SELECT "listing_photo"') for q in ctx.captured_queries)
+
+    def test_public_list_has_no_group_by(self, student_client):
+        """✅ El sello de fotos no agrega JOIN ni GROUP BY a la lista filtrada"""
+        ListingPhotoFactory(listing=ListingFactory(available=True))
+
+        with CaptureQueriesContext(connection) as ctx:
+            student_client.get(reverse('listings:listing_public_list'))
+
+        assert not any('GROUP BY "listing"' in q['sql'] for q in ctx.captured_queries)
@@ -0,0 +1,168 @@
+# tests/integration/test_listing_analytics.py
+"""
+Tests para las estadísticas diarias/mensuales de anuncios
+
+IMPORTANTE: Son tests de INTEGRACIÓN porque prueban:
+- Upsert de listing_daily_stats desde las vistas de escritura
+- Buffer de visitas del beacon y su flush agrupado
+- Serie de 90 días del panel y compactación mensual
+"""
+
+from datetime import date, timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from listings.analytics import ListingStatsService, ViewCounterBuffer
+from listings.models import Listing, ListingDailyStats, ListingMonthlyStats
+from tests.factories import LandlordFactory, ListingFactory, StudentFactory
+
+
+def logged_client(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def today_stats(listing):
+    return ListingDailyStats.objects.get(listing=listing, day=timezone.localdate())
+
+
+@pytest.mark.django_db
+class TestDailyStatsRecording:
+    """Tests para ListingStatsService.record y las vistas de escritura"""
+
+    def test_record_creates_then_increments(self):
+        """✅ La primera escritura del día crea la fila; las siguientes suman"""
+        listing = ListingFactory()
+
+        ListingStatsService.record(listing.pk, comments=1)
+        ListingStatsService.record(listing.pk, comments=2, reviews=1)
+
+        stats = today_stats(listing)
+        assert (stats.comments, stats.reviews, stats.views) == (3, 1, 0)
+        assert ListingDailyStats.objects.count() == 1
+
+    def test_write_paths_feed_daily_stats(self):
+        """✅ Comentar, reseñar y marcar favorito suman en el día"""
+        listing = ListingFactory(available=True)
+        client = logged_client(StudentFactory().user)
+
+        client.post(reverse('listings:comment_create', args=[listing.pk]), {'text': 'Hola'})
+        client.post(reverse('listings:review_create', args=[listing.pk]), {'text': 'Bien', 'rating': 4})
+        client.post(reverse('listings:addFavorite', args=[listing.pk]))
+        client.post(reverse('listings:addFavorite', args=[listing.pk]))  # ya era favorito
+
+        stats = today_stats(listing)
+        assert (stats.comments, stats.reviews, stats.favorites_added) == (1, 1, 1)
+
+
+@pytest.mark.django_db
+class TestViewCounterBuffer:
+    """Tests para el buffer de visitas"""
+
+    def test_views_are_buffered_until_flush(self, settings):
+        """✅ Con intervalo, las visitas se escriben juntas en el flush"""
+        settings.LISTING_VIEWS_FLUSH_SECONDS = 3600
+        settings.LISTING_VIEWS_FLUSH_MAX = 1000
+        listing = ListingFactory(views=2)
+        buffer = ViewCounterBuffer()
+
+        for _ in range(5):
+            buffer.add(listing.pk)
+        assert Listing.objects.get(pk=listing.pk).views == 2
+
+        assert buffer.flush() == 5
+        assert Listing.objects.get(pk=listing.pk).views == 7
+        assert today_stats(listing).views == 5
+
+    def test_flush_when_buffer_is_full(self, settings):
+        """✅ Al llegar a LISTING_VIEWS_FLUSH_MAX se escribe sin esperar"""
+        settings.LISTING_VIEWS_FLUSH_SECONDS = 3600
+        settings.LISTING_VIEWS_FLUSH_MAX = 3
+        listing = ListingFactory(views=0)
+        buffer = ViewCounterBuffer()
+
+        for _ in range(3):
+            buffer.add(listing.pk)
+
+        assert Listing.objects.get(pk=listing.pk).views == 3
+
+    def test_flush_skips_deleted_listings(self, settings):
+        """✅ Un anuncio borrado antes del flush no rompe el resto"""
+        settings.LISTING_VIEWS_FLUSH_SECONDS = 3600
+        kept = ListingFactory(views=0)
+        gone = ListingFactory()
+        buffer = ViewCounterBuffer()
+        buffer.add(gone.pk)
+        buffer.add(kept.pk)
+        Listing.objects.filter(pk=gone.pk).delete()
+
+        assert buffer.flush() == 1
+        assert Listing.objects.get(pk=kept.pk).views == 1
+
+
+@pytest.mark.django_db
+class TestStatsSeriesAndCompaction:
+    """Tests para la serie del panel y compact_listing_stats"""
+
+    def test_daily_series_fills_gaps(self):
+        """✅ 90 puntos, agregados por día entre los anuncios del arrendador"""
+        landlord = LandlordFactory()
+        first, second = ListingFactory.create_batch(2, owner=landlord)
+        today = date(2026, 3, 31)
+        ListingStatsService.record(first.pk, day=today, views=4)
+        ListingStatsService.record(second.pk, day=today, views=6)
+        ListingStatsService.record(first.pk, day=today - timedelta(days=10), views=5)
+        ListingStatsService.record(ListingFactory().pk, day=today, views=100)  # otro arrendador
+
+        series = ListingStatsService.daily_series(landlord, today=today)
+
+        assert len(series) == ListingStatsService.CHART_DAYS
+        assert series[-1]['views'] == 10
+        assert series[-1]['height'] == 100
+        assert series[-11]['views'] == 5
+        assert series[0]['views'] == 0
+
+    def test_compact_moves_old_months(self):
+        """✅ Los meses viejos pasan a totales mensuales; los recientes quedan"""
+        listing = ListingFactory()
+        today = date(2026, 6, 15)
+        ListingStatsService.record(listing.pk, day=date(2025, 1, 3), views=2, comments=1)
+        ListingStatsService.record(listing.pk, day=date(2025, 1, 20), views=3)
+        ListingStatsService.record(listing.pk, day=date(2026, 6, 1), views=7)
+
+        months, deleted = ListingStatsService.compact(keep_days=400, today=today)
+        again = ListingStatsService.compact(keep_days=400, today=today)
+
+        monthly = ListingMonthlyStats.objects.get(listing=listing)
+        assert (months, deleted) == (1, 2)
+        assert again == (0, 0)
+        assert monthly.month == date(2025, 1, 1)
+        assert (monthly.views, monthly.comments) == (5, 1)
+        assert ListingDailyStats.objects.get(listing=listing).day == date(2026, 6, 1)
+
+    def test_compact_command_rejects_short_retention(self):
+        """✅ No se compactan días que usa la gráfica"""
+        with pytest.raises(CommandError):
+            call_command('compact_listing_stats', keep_days=30, stdout=StringIO())
+
+    def test_stats_page_renders_chart(self):
+        """✅ El panel muestra la gráfica de 90 días"""
+        landlord = LandlordFactory()
+        landlord.user.groups.add(Group.objects.get_or_create(name='Landlords')[0])
+        listing = ListingFactory(owner=landlord)
+        ListingStatsService.record(listing.pk, views=3)
+        client = logged_client(landlord.user)
+
+        response = client.get(reverse('listings:landlord_listing_stats'))
+
+        assert response.status_code == 200
+        assert response.context['daily_totals']['views'] == 3
+        assert response.content.count(b'class="flex-fill bg-primary"') == ListingStatsService.CHART_DAYS
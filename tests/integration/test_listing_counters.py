@@ -0,0 +1,152 @@
+# tests/integration/test_listing_counters.py
+"""
+Tests para los contadores desnormalizados de Listing
+
+- Vistas de comentarios y reseñas mantienen comment_count, review_count y rating_sum
+- Borrar un comentario descuenta también sus respuestas (cascada)
+- reconcile_listing_counters corrige desvíos
+"""
+
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+from listings.models import Comment, Listing
+from listings.services import ListingCounterService
+from tests.factories import CommentFactory, ListingFactory, ReviewFactory, StudentFactory
+
+
+def logged_client(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def student():
+    return StudentFactory()
+
+
+@pytest.fixture
+def listing():
+    return ListingFactory(available=True)
+
+
+@pytest.mark.django_db
+class TestCommentCounters:
+    """Tests para comment_count"""
+
+    def test_comment_and_reply_increment(self, student, listing):
+        """✅ Comentario y respuesta suman 1 cada uno"""
+        client = logged_client(student.user)
+        url = reverse('listings:comment_create', args=[listing.pk])
+
+        client.post(url, {'text': 'Primera pregunta'})
+        parent = Comment.objects.get(listing=listing)
+        client.post(url, {'text': 'Respuesta', 'parent': parent.pk})
+
+        listing.refresh_from_db()
+        assert listing.comment_count == Comment.objects.filter(listing=listing).count()
+
+    def test_delete_discounts_whole_thread(self, student, listing):
+        """✅ Borrar un comentario descuenta sus respuestas borradas en cascada"""
+        parent = CommentFactory(listing=listing, author=student.user)
+        reply = CommentFactory(listing=listing, parent=parent)
+        CommentFactory(listing=listing, parent=reply)
+        CommentFactory(listing=listing)
+        Listing.objects.filter(pk=listing.pk).update(comment_count=4)
+
+        response = logged_client(student.user).post(reverse('listings:comment_delete', args=[parent.pk]))
+
+        assert response.status_code == 302
+        listing.refresh_from_db()
+        assert listing.comment_count == 1
+        assert Comment.objects.filter(listing=listing).count() == 1
+
+    def test_counter_update_keeps_updated_at(self, student, listing):
+        """✅ Actualizar contadores no cuenta como edición del anuncio"""
+        before = Listing.objects.values_list('updated_at', flat=True).get(pk=listing.pk)
+
+        logged_client(student.user).post(
+            reverse('listings:comment_create', args=[listing.pk]),
+            {'text': 'Pregunta'},
+        )
+
+        assert Listing.objects.values_list('updated_at', flat=True).get(pk=listing.pk) == before
+
+    def test_counters_never_negative(self, listing):
+        """✅ Un contador desviado no baja de 0"""
+        ListingCounterService.adjust(listing.pk, comment_count=-3)
+
+        listing.refresh_from_db()
+        assert listing.comment_count == 0
+
+    def test_negative_delta_within_counter(self, listing):
+        """✅ Restar menos que el contador descuenta normalmente"""
+        Listing.objects.filter(pk=listing.pk).update(comment_count=5)
+
+        ListingCounterService.adjust(listing.pk, comment_count=-2)
+
+        listing.refresh_from_db()
+        assert listing.comment_count == 3
+
+
+@pytest.mark.django_db
+class TestReviewCounters:
+    """Tests para review_count y rating_sum"""
+
+    def test_review_create_and_delete(self, student, listing):
+        """✅ Crear y borrar una reseña mantiene conteo y promedio"""
+        ReviewFactory(listing=listing, rating=5)
+        Listing.objects.filter(pk=listing.pk).update(review_count=1, rating_sum=5)
+        client = logged_client(student.user)
+
+        client.post(reverse('listings:review_create', args=[listing.pk]), {'text': 'Buen lugar', 'rating': 2})
+
+        listing.refresh_from_db()
+        assert (listing.review_count, listing.rating_sum) == (2, 7)
+        assert listing.rating_average == 3.5
+
+        review = student.reviews.get()
+        client.post(reverse('listings:review_delete', args=[review.pk]))
+
+        listing.refresh_from_db()
+        assert (listing.review_count, listing.rating_sum) == (1, 5)
+        assert listing.rating_average == 5.0
+
+    def test_rating_average_without_reviews(self, listing):
+        """✅ Sin reseñas no hay promedio"""
+        assert listing.rating_average is None
+
+
+@pytest.mark.django_db
+class TestReconcileCommand:
+    """Tests para reconcile_listing_counters"""
+
+    def test_fixes_drift(self):
+        """✅ Recalcula solo los anuncios desviados"""
+        drifted = ListingFactory()
+        CommentFactory.create_batch(3, listing=drifted)
+        ReviewFactory(listing=drifted, rating=4)
+        ReviewFactory(listing=drifted, rating=3)
+        ListingFactory()
+
+        out = StringIO()
+        call_command('reconcile_listing_counters', '--batch-size', '1', stdout=out)
+
+        drifted.refresh_from_db()
+        assert (drifted.comment_count, drifted.review_count, drifted.rating_sum) == (3, 2, 7)
+        assert '2 anuncios revisados, 1 corregidos.' in out.getvalue()
+
+    def test_dry_run_does_not_write(self):
+        """✅ --dry-run solo informa"""
+        listing = ListingFactory()
+        CommentFactory(listing=listing)
+
+        out = StringIO()
+        call_command('reconcile_listing_counters', '--dry-run', stdout=out)
+
+        listing.refresh_from_db()
+        assert listing.comment_count == 0
+        assert '1 se corregirían' in out.getvalue()
@@ -0,0 +1,149 @@
+# tests/integration/test_listing_export.py
+"""
+Tests para la exportación CSV/JSON de anuncios del arrendador
+
+IMPORTANTE: Son tests de INTEGRACIÓN porque prueban:
+- Agregados (favoritos, comentarios, reseñas) en una sola query
+- Respuesta en streaming con el formato pedido
+- Acceso solo para el arrendador y sus propios anuncios
+"""
+
+import csv
+import io
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from listings.services import ListingCounterService, ListingExportService
+from tests.factories import (
+    CommentFactory,
+    FavoriteFactory,
+    LandlordFactory,
+    ListingFactory,
+    ReviewFactory,
+    StudentFactory,
+)
+
+
+def export_url(fmt):
+    return reverse('listings:landlord_listing_export', args=[fmt])
+
+
+def streamed(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.fixture
+def landlord_client():
+    landlord = LandlordFactory()
+    client = Client()
+    client.force_login(landlord.user)
+    client.landlord = landlord
+    return client
+
+
+@pytest.mark.django_db
+class TestListingExportService:
+    """Tests para ListingExportService"""
+
+    def test_rows_include_aggregates(self):
+        """✅ Cada fila trae vistas, favoritos, comentarios y reseñas"""
+        landlord = LandlordFactory()
+        listing = ListingFactory(owner=landlord, views=9)
+        FavoriteFactory.create_batch(2, listing=listing)
+        ListingCounterService.comment_created(CommentFactory(listing=listing))
+        ListingCounterService.review_created(ReviewFactory(listing=listing, rating=4))
+        ListingFactory()  # de otro arrendador
+
+        [row] = list(ListingExportService.rows(landlord))
+
+        assert row['id'] == listing.pk
+        assert (row['views'], row['favorites'], row['comments'], row['reviews']) == (9, 2, 1, 1)
+        assert row['rating_average'] == 4.0
+
+    def test_one_query_per_chunk(self, django_assert_num_queries):
+        """✅ Una query por lote (pk > último), con los agregados incluidos"""
+        landlord = LandlordFactory()
+        for listing in ListingFactory.create_batch(5, owner=landlord):
+            FavoriteFactory(listing=listing)
+
+        with django_assert_num_queries(3):
+            rows = list(ListingExportService.rows(landlord, chunk_size=2))
+
+        assert [row['id'] for row in rows] == sorted(row['id'] for row in rows)
+        assert len(rows) == 5
+        assert all(row['favorites'] == 1 for row in rows)
+
+    def test_async_chunks_match_sync(self):
+        """✅ achunks() escribe lo mismo que chunks()"""
+        landlord = LandlordFactory()
+        ListingFactory.create_batch(3, owner=landlord)
+
+        async def collect():
+            return [chunk async for chunk in ListingExportService.achunks(landlord, 'json', chunk_size=2)]
+
+        assert ''.join(async_to_sync(collect)()) == ''.join(ListingExportService.chunks(landlord, 'json', chunk_size=2))
+
+
+@pytest.mark.django_db
+class TestListingExportView:
+    """Tests para LandlordListingExportView"""
+
+    def test_csv_export_streams(self, landlord_client):
+        """✅ CSV en streaming con encabezado y una fila por anuncio"""
+        ListingFactory.create_batch(3, owner=landlord_client.landlord)
+
+        response = landlord_client.get(export_url('csv'))
+
+        rows = list(csv.reader(io.StringIO(streamed(response))))
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'].startswith('text/csv')
+        assert 'attachment' in response['Content-Disposition']
+        assert rows[0] == [header for _, header in ListingExportService.COLUMNS]
+        assert len(rows) == 4
+
+    def test_json_export_is_valid_array(self, landlord_client):
+        """✅ JSON válido aunque se escriba por trozos"""
+        ListingFactory.create_batch(2, owner=landlord_client.landlord)
+
+        data = json.loads(streamed(landlord_client.get(export_url('json'))))
+
+        assert len(data) == 2
+        assert {'views', 'favorites', 'comments', 'reviews'} <= set(data[0])
+
+    def test_empty_export(self, landlord_client):
+        """✅ Sin anuncios: arreglo vacío"""
+        assert json.loads(streamed(landlord_client.get(export_url('json')))) == []
+
+    def test_asgi_export_streams_async(self):
+        """✅ Bajo ASGI el contenido es un iterador async (no se bufferiza)"""
+        landlord = LandlordFactory()
+        ListingFactory.create_batch(2, owner=landlord)
+        client = AsyncClient()
+        client.force_login(landlord.user)
+
+        async def export():
+            response = await client.get(export_url('json'))
+            return response, b''.join([chunk async for chunk in response.streaming_content])
+
+        response, content = async_to_sync(export)()
+
+        assert response.is_async
+        assert len(json.loads(content)) == 2
+
+    def test_unknown_format_is_404(self, landlord_client):
+        """✅ Formato desconocido → 404"""
+        assert landlord_client.get(export_url('xml')).status_code == 404
+
+    def test_students_cannot_export(self):
+        """✅ Un estudiante no puede exportar"""
+        client = Client()
+        client.force_login(StudentFactory().user)
+
+        response = client.get(export_url('csv'))
+
+        assert response.status_code == 302
@@ -0,0 +1,172 @@
+# tests/integration/test_listings_api.py
+"""
+Tests para la API JSON de solo lectura de listings
+
+IMPORTANTE: Son tests de INTEGRACIÓN porque prueban:
+- Mismos filtros que la lista pública
+- Selección de campos (fields=) con values()
+- ETag fuerte y 304 Not Modified
+"""
+
+import pytest
+from django.db.models import F
+from django.test import Client
+from django.urls import reverse
+
+from listings.models import Listing, ListingPhoto
+from listings.services import ListingCounterService
+from tests.factories import ListingFactory, ListingPhotoFactory
+
+
+@pytest.fixture
+def api_client():
+    return Client()
+
+
+@pytest.mark.django_db
+class TestListingSearchApi:
+    """Tests para /listings/api/listings/"""
+
+    def test_applies_public_filters(self, api_client):
+        """✅ Solo anuncios disponibles que cumplen los filtros"""
+        cheap = ListingFactory(available=True, price=500000)
+        ListingFactory(available=True, price=2000000)
+        ListingFactory(available=False, price=500000)
+
+        response = api_client.get(reverse('listings:api_listing_search'), {'price_max': 1000000})
+
+        data = response.json()
+        assert response.status_code == 200
+        assert data['count'] == 1
+        assert [row['id'] for row in data['results']] == [cheap.pk]
+
+    def test_sparse_fields(self, api_client, django_assert_max_num_queries):
+        """✅ fields= devuelve solo las columnas pedidas"""
+        ListingFactory.create_batch(3, available=True)
+
+        with django_assert_max_num_queries(2):
+            response = api_client.get(reverse('listings:api_listing_search'), {'fields': 'id,price,zone_name'})
+
+        for row in response.json()['results']:
+            assert set(row) == {'id', 'price', 'zone_name'}
+
+    def test_unknown_field_is_400(self, api_client):
+        """✅ Un campo fuera de la lista blanca responde 400"""
+        response = api_client.get(reverse('listings:api_listing_search'), {'fields': 'id,owner__user__password'})
+
+        assert response.status_code == 400
+        assert 'owner__user__password' in response.json()['error']
+
+    def test_page_size_is_capped(self, api_client):
+        """✅ page_size no supera el máximo"""
+        ListingFactory.create_batch(3, available=True)
+
+        response = api_client.get(reverse('listings:api_listing_search'), {'page_size': 2, 'page': 2})
+
+        data = response.json()
+        assert data['num_pages'] == 2
+        assert len(data['results']) == 1
+
+    def test_etag_changes_when_listing_changes(self, api_client):
+        """✅ Sin cambios → 304; al editar un anuncio el ETag cambia"""
+        listing = ListingFactory(available=True)
+        url = reverse('listings:api_listing_search')
+
+        first = api_client.get(url)
+        repeat = api_client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        listing.rooms += 1
+        listing.save()
+        changed = api_client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+
+        assert repeat.status_code == 304
+        assert repeat['ETag'] == first['ETag']
+        assert changed.status_code == 200
+        assert changed['ETag'] != first['ETag']
+
+
+@pytest.mark.django_db
+class TestListingDetailApi:
+    """Tests para /listings/api/listings/<pk>/"""
+
+    def test_detail_does_not_count_views(self, api_client):
+        """✅ El detalle JSON no suma vistas"""
+        listing = ListingFactory(available=True, views=3)
+
+        response = api_client.get(reverse('listings:api_listing_detail', args=[listing.pk]), {'fields': 'id,views'})
+
+        assert response.json() == {'id': listing.pk, 'views': 3}
+        assert Listing.objects.get(pk=listing.pk).views == 3
+
+    def test_strong_etag_and_not_modified(self, api_client, django_assert_num_queries):
+        """✅ ETag fuerte; el 304 sale de una sola query"""
+        listing = ListingFactory(available=True)
+        url = reverse('listings:api_listing_detail', args=[listing.pk])
+
+        etag = api_client.get(url)['ETag']
+        with django_assert_num_queries(1):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert not etag.startswith('W/')
+        assert response.status_code == 304
+        assert response.content == b''
+
+    def test_etag_changes_with_counters(self, api_client):
+        """✅ Contadores que no tocan updated_at también cambian el ETag"""
+        listing = ListingFactory(available=True)
+        url = reverse('listings:api_listing_detail', args=[listing.pk])
+
+        etag = api_client.get(url)['ETag']
+        ListingCounterService.adjust(listing.pk, comment_count=3)
+        Listing.objects.filter(pk=listing.pk).update(views=10, updated_at=F('updated_at'))
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert response['ETag'] != etag
+        assert (response.json()['views'], response.json()['comment_count']) == (10, 3)
+
+    def test_etag_depends_on_fields(self, api_client):
+        """✅ Otra selección de campos tiene otro ETag"""
+        listing = ListingFactory(available=True)
+        url = reverse('listings:api_listing_detail', args=[listing.pk])
+
+        assert api_client.get(url, {'fields': 'id'})['ETag'] != api_client.get(url)['ETag']
+
+    def test_missing_listing_is_404(self, api_client):
+        """✅ Anuncio inexistente → 404"""
+        response = api_client.get(reverse('listings:api_listing_detail', args=[999999]))
+
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestListingPhotosApi:
+    """Tests para /listings/api/listings/<pk>/photos/"""
+
+    def test_photos_in_order_and_etag_follows_photos(self, api_client):
+        """✅ Fotos en orden; agregar una foto cambia el ETag"""
+        listing = ListingFactory()
+        second = ListingPhotoFactory(listing=listing, sort_order=1)
+        first = ListingPhotoFactory(listing=listing, sort_order=0)
+        url = reverse('listings:api_listing_photos', args=[listing.pk])
+
+        response = api_client.get(url)
+        ListingPhotoFactory(listing=listing, sort_order=2)
+        after_upload = api_client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        assert [photo['id'] for photo in response.json()['photos']] == [first.pk, second.pk]
+        assert after_upload.status_code == 200
+        assert len(after_upload.json()['photos']) == 3
+
+    def test_reordering_photos_changes_etag(self, api_client):
+        """✅ Cambiar sort_order cambia el ETag"""
+        listing = ListingFactory()
+        first = ListingPhotoFactory(listing=listing, sort_order=0)
+        second = ListingPhotoFactory(listing=listing, sort_order=1)
+        url = reverse('listings:api_listing_photos', args=[listing.pk])
+
+        etag = api_client.get(url)['ETag']
+        ListingPhoto.objects.filter(pk=first.pk).update(sort_order=2)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200
+        assert [photo['id'] for photo in response.json()['photos']] == [second.pk, first.pk]
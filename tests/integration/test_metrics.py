@@ -0,0 +1,109 @@
+# tests/integration/test_metrics.py
+"""
+Tests para las métricas Prometheus (umigo/metrics.py)
+
+- /metrics solo existe con METRICS_ENABLED y respeta METRICS_TOKEN
+- Latencia y queries etiquetadas con el nombre de la URL
+- Hits/misses de los caches instrumentados
+- Tamaño de la cola de moderación
+- Middleware híbrido: bajo ASGI no adapta la cadena async a un thread
+"""
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import AsyncClient
+from prometheus_client import REGISTRY
+from tests.factories import UserReportFactory
+from umigo.cache_backends import InstrumentedLocMemCache
+from umigo.metrics import MetricsMiddleware
+
+
+@pytest.fixture
+def metrics_enabled(settings):
+    settings.METRICS_ENABLED = True
+    settings.METRICS_TOKEN = ''
+    return settings
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestMetricsEndpoint:
+    """Tests para la vista /metrics"""
+
+    def test_disabled_returns_404(self, client):
+        """✅ Sin METRICS_ENABLED el endpoint no existe"""
+        assert client.get('/metrics').status_code == 404
+
+    def test_exposes_request_metrics_by_url_name(self, metrics_enabled, client):
+        """✅ Cada request suma latencia, estado y queries bajo su nombre de URL"""
+        before = sample('umigo_request_duration_seconds_count', view='home', method='GET')
+
+        client.get('/')
+        response = client.get('/metrics')
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        assert sample('umigo_request_duration_seconds_count', view='home', method='GET') == before + 1
+        assert sample('umigo_requests_total', view='home', method='GET', status='200') >= 1
+        body = response.content.decode()
+        assert 'umigo_request_db_queries_bucket{' in body
+        assert 'view="home"' in body
+
+    def test_async_chain_stays_async(self, metrics_enabled):
+        """✅ Con un get_response async el middleware también es async"""
+        async def get_response(request):
+            return None
+
+        assert iscoroutinefunction(MetricsMiddleware(get_response))
+        assert not iscoroutinefunction(MetricsMiddleware(lambda request: None))
+
+    def test_async_request_is_measured(self, metrics_enabled, staff_user):
+        """✅ Bajo ASGI se registran latencia y queries del request"""
+        client = AsyncClient()
+        client.force_login(staff_user)
+        count = sample('umigo_request_db_queries_count', view='home')
+        queries = sample('umigo_request_db_queries_sum', view='home')
+
+        async_to_sync(client.get)('/')
+
+        assert sample('umigo_request_db_queries_count', view='home') == count + 1
+        assert sample('umigo_request_db_queries_sum', view='home') > queries
+
+    def test_token_required_when_configured(self, metrics_enabled, client):
+        """✅ Con METRICS_TOKEN solo responde al Bearer correcto"""
+        metrics_enabled.METRICS_TOKEN = 'secreto'
+
+        assert client.get('/metrics').status_code == 401
+        assert client.get('/metrics', HTTP_AUTHORIZATION='Bearer otro').status_code == 401
+        assert client.get('/metrics', HTTP_AUTHORIZATION='Bearer secreto').status_code == 200
+
+    def test_report_queue_size(self, metrics_enabled, client):
+        """✅ La cola de moderación se calcula al leer /metrics"""
+        for _ in range(3):
+            UserReportFactory()
+
+        body = client.get('/metrics').content.decode()
+
+        assert 'umigo_report_queue_size{state="pending"} 3.0' in body
+        assert 'umigo_report_queue_size{state="claimed"} 0.0' in body
+
+
+class TestInstrumentedCache:
+    """Tests para los backends de cache con conteo de hits/misses"""
+
+    def test_counts_hits_and_misses(self):
+        """✅ get y get_many cuentan cada clave una sola vez"""
+        cache = InstrumentedLocMemCache('metrics-test', {'METRICS_NAME': 'metrics-test'})
+        hits = sample('umigo_cache_requests_total', cache='metrics-test', result='hit')
+        misses = sample('umigo_cache_requests_total', cache='metrics-test', result='miss')
+
+        cache.set('a', 1)
+        assert cache.get('a') == 1
+        assert cache.get('b', 'default') == 'default'
+        assert cache.get_many(['a', 'b']) == {'a': 1}
+
+        assert sample('umigo_cache_requests_total', cache='metrics-test', result='hit') == hits + 2
+        assert sample('umigo_cache_requests_total', cache='metrics-test', result='miss') == misses + 2
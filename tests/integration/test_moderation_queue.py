@@ -0,0 +1,194 @@
+# tests/integration/test_moderation_queue.py
+"""
+Tests para la cola de moderación (prioridad + lease) y agrupación por objetivo
+
+IMPORTANTE: Son tests de INTEGRACIÓN porque prueban:
+- Orden por prioridad calculado en BD (subqueries)
+- Lease exclusivo entre moderadores (claim / release / expiración)
+- Liberación automática del lease al resolver el reporte
+"""
+
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from tests.factories import (
+    UserFactory,
+    AdminFactory,
+    ListingFactory,
+    ReportFactory,
+    UserReportFactory,
+    ListingReportFactory,
+)
+from inquiries.models import Report
+from inquiries.services import ModerationQueueService, ReportTargetService
+
+
+@pytest.mark.django_db
+class TestModerationQueuePriority:
+    """Tests para el orden de la cola"""
+
+    def test_target_with_more_reports_comes_first(self):
+        """✅ Un objetivo con varios reportes pendientes tiene más prioridad"""
+        listing = ListingFactory()
+        single = UserReportFactory()
+        repeated = [ListingReportFactory(listing=listing) for _ in range(3)]
+
+        queue = list(ModerationQueueService.pending())
+
+        assert queue[0].pk in {lr.report_id for lr in repeated}
+        assert queue[-1].pk == single.report_id
+        assert queue[0].target_reports == 3
+
+    def test_reporter_history_affects_priority(self):
+        """✅ Reporter con reportes aceptados sube; con rechazados baja"""
+        admin = AdminFactory()
+        trusted = UserFactory()
+        noisy = UserFactory()
+        UserReportFactory(report__reporter=trusted, report__status='ACCEPTED', report__reviewed_by=admin)
+        UserReportFactory(report__reporter=noisy, report__status='REJECTED', report__reviewed_by=admin)
+
+        from_noisy = UserReportFactory(report__reporter=noisy)
+        from_trusted = UserReportFactory(report__reporter=trusted)
+
+        queue = [report.pk for report in ModerationQueueService.pending()]
+
+        assert queue.index(from_trusted.report_id) < queue.index(from_noisy.report_id)
+
+    def test_old_reports_get_boost(self):
+        """✅ Reportes con más de STALE_AFTER_HOURS suben en la cola"""
+        recent = UserReportFactory()
+        old = UserReportFactory()
+        Report.objects.filter(pk=old.report_id).update(
+            created_at=timezone.now() - timedelta(hours=ModerationQueueService.STALE_AFTER_HOURS + 1)
+        )
+        Report.objects.filter(pk=recent.report_id).update(
+            created_at=timezone.now() - timedelta(hours=1)
+        )
+
+        queue = [report.pk for report in ModerationQueueService.pending()]
+
+        assert queue == [old.report_id, recent.report_id]
+
+
+@pytest.mark.django_db
+class TestModerationQueueClaims:
+    """Tests para el lease de reportes"""
+
+    def test_claimed_reports_are_not_handed_out_twice(self):
+        """✅ Dos moderadores nunca reciben el mismo reporte"""
+        for _ in range(4):
+            UserReportFactory()
+        first_admin = AdminFactory()
+        second_admin = AdminFactory()
+
+        first = ModerationQueueService.claim(first_admin, limit=2)
+        second = ModerationQueueService.claim(second_admin, limit=10)
+
+        assert len(first) == 2
+        assert len(second) == 2
+        assert not {r.pk for r in first} & {r.pk for r in second}
+        assert all(r.claimed_by_id == first_admin.pk for r in first)
+
+    def test_expired_lease_returns_to_queue(self):
+        """✅ Si el lease expira, otro moderador puede tomar el reporte"""
+        user_report = UserReportFactory()
+        first_admin = AdminFactory()
+        second_admin = AdminFactory()
+
+        ModerationQueueService.claim(first_admin)
+        assert ModerationQueueService.claim(second_admin) == []
+
+        later = timezone.now() + timedelta(minutes=ModerationQueueService.LEASE_MINUTES + 1)
+        reclaimed = ModerationQueueService.claim(second_admin, now=later)
+
+        assert [r.pk for r in reclaimed] == [user_report.report_id]
+        assert reclaimed[0].claimed_by_id == second_admin.pk
+
+    def test_release_only_by_owner(self):
+        """✅ Solo quien tomó el reporte puede devolverlo a la cola"""
+        UserReportFactory()
+        owner = AdminFactory()
+        other = AdminFactory()
+        report = ModerationQueueService.claim(owner)[0]
+
+        assert ModerationQueueService.release(report, other) is False
+        assert ModerationQueueService.release(report, owner) is True
+
+        report.refresh_from_db()
+        assert report.claimed_by is None
+        assert report.claimed_until is None
+
+    def test_resolving_report_clears_claim(self):
+        """✅ Aceptar/rechazar un reporte libera su lease"""
+        UserReportFactory()
+        admin = AdminFactory()
+        report = ModerationQueueService.claim(admin)[0]
+
+        report.status = 'REJECTED'
+        report.reviewed_by = admin
+        report.save()
+
+        report.refresh_from_db()
+        assert report.claimed_by is None
+        assert report.claimed_until is None
+        assert ModerationQueueService.pending().count() == 0
+
+
+@pytest.mark.django_db
+class TestReportTargets:
+    """Tests para la agrupación de reportes por objetivo"""
+
+    def test_pending_targets_groups_by_target(self):
+        """✅ Una fila por objetivo con conteo y fechas"""
+        target_user = UserFactory()
+        listing = ListingFactory()
+        for _ in range(3):
+            UserReportFactory(reported_user=target_user)
+        ListingReportFactory(listing=listing)
+
+        rows = ReportTargetService.decorate_targets(ReportTargetService.pending_targets())
+
+        assert len(rows) == 2
+        assert rows[0]['target_type'] == 'USER'
+        assert rows[0]['target'] == target_user
+        assert rows[0]['report_count'] == 3
+        assert rows[0]['first_reported_at'] <= rows[0]['last_reported_at']
+        assert len(rows[0]['reasons']) == ReportTargetService.REASON_SAMPLES
+        assert rows[1]['target'] == listing
+
+    def test_pending_targets_skips_reports_without_target(self):
+        """✅ Un Report sin UserReport ni ListingReport no genera fila"""
+        ReportFactory(status='UNDER_REVIEW')
+        listing_report = ListingReportFactory()
+
+        rows = ReportTargetService.decorate_targets(ReportTargetService.pending_targets())
+
+        assert len(rows) == 1
+        assert rows[0]['target_type'] == 'LISTING'
+        assert rows[0]['target_id'] == listing_report.listing_id
+
+    def test_reject_target_resolves_all_pending(self):
+        """✅ Rechazar un objetivo resuelve todos sus reportes pendientes"""
+        listing = ListingFactory()
+        for _ in range(2):
+            ListingReportFactory(listing=listing)
+        other = ListingReportFactory()
+        admin = AdminFactory()
+
+        resolved = ReportTargetService.resolve_target('LISTING', listing.pk, 'REJECTED', admin)
+
+        assert resolved == 2
+        assert not Report.objects.filter(listingreport__listing=listing, status='UNDER_REVIEW').exists()
+        assert Report.objects.get(pk=other.report_id).status == 'UNDER_REVIEW'
+
+    def test_accept_user_target_applies_moderation_once(self):
+        """✅ Aceptar 1 reporte de un usuario lo suspende (no lo elimina)"""
+        target_user = UserFactory(is_active=True)
+        UserReportFactory(reported_user=target_user)
+        admin = AdminFactory()
+
+        ReportTargetService.resolve_target('USER', target_user.pk, 'ACCEPTED', admin)
+
+        target_user.refresh_from_db()
+        assert target_user.is_active is False
+        assert target_user.suspension_end_at is not None
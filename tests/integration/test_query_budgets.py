@@ -0,0 +1,155 @@
+# tests/integration/test_query_budgets.py
+"""
+Presupuestos de queries para las vistas con N+1 recurrentes
+
+Cada test mide la vista con pocos y con muchos objetos: el conteo no debe
+crecer con la cantidad de filas y no debe superar el presupuesto declarado.
+Los conteos se comparan con tests/query_baseline.json (ver tests/query_budget.py).
+"""
+
+import pytest
+from django.contrib.auth.models import Group
+from django.test import Client
+from django.urls import reverse
+from tests.factories import (
+    CommentFactory,
+    LandlordFactory,
+    ListingFactory,
+    ListingPhotoFactory,
+    ReviewFactory,
+    StudentFactory,
+)
+
+
+def logged_client(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+@pytest.mark.django_db
+class TestLandlordListingListQueries:
+    """Tests para el dashboard del arrendador"""
+
+    @pytest.mark.query_budget(7)
+    def test_constant_queries_with_photos(self, query_budget):
+        """✅ Las miniaturas no generan una query por anuncio"""
+        landlord = LandlordFactory()
+        # La tabla solo se muestra a usuarios del grupo Landlords
+        landlord.user.groups.add(Group.objects.get_or_create(name='Landlords')[0])
+        client = logged_client(landlord.user)
+        url = reverse('listings:landlord_listing_list')
+
+        def add_listings(count):
+            for _ in range(count):
+                ListingPhotoFactory(listing=ListingFactory(owner=landlord))
+
+        add_listings(2)
+        with query_budget(label='2 anuncios') as few:
+            client.get(url)
+
+        add_listings(8)
+        with query_budget(label='10 anuncios') as many:
+            response = client.get(url)
+
+        assert response.status_code == 200
+        assert response.content.count(b'class="listing-photo"') == 10
+        assert len(many.context.captured_queries) == len(few.context.captured_queries)
+
+
+@pytest.mark.django_db
+class TestCommentDeleteQueries:
+    """Tests para el borrado de comentarios"""
+
+    @pytest.mark.query_budget(9)
+    def test_author_delete(self, query_budget):
+        """✅ Borrar un comentario propio no carga author ni listing.owner aparte
+        (incluye la transacción que descuenta el hilo de comment_count)"""
+        student = StudentFactory()
+        comment = CommentFactory(author=student.user)
+        client = logged_client(student.user)
+
+        with query_budget():
+            response = client.post(reverse('listings:comment_delete', args=[comment.pk]))
+
+        assert response.status_code == 302
+
+    @pytest.mark.query_budget(9)
+    def test_listing_owner_delete(self, query_budget):
+        """✅ El dueño del anuncio borra comentarios ajenos con el mismo presupuesto"""
+        listing = ListingFactory()
+        comment = CommentFactory(listing=listing)
+        client = logged_client(listing.owner.user)
+
+        with query_budget():
+            response = client.post(reverse('listings:comment_delete', args=[comment.pk]))
+
+        assert response.status_code == 302
+
+    def test_other_user_is_forbidden(self):
+        """✅ Un usuario ajeno sigue recibiendo 403"""
+        comment = CommentFactory()
+        client = logged_client(StudentFactory().user)
+
+        response = client.post(reverse('listings:comment_delete', args=[comment.pk]))
+
+        assert response.status_code == 403
+
+
+@pytest.mark.django_db
+class TestListingDetailQueries:
+    """Tests para reseñas y comentarios del detalle"""
+
+    @pytest.mark.query_budget(16)
+    def test_reviews_and_comments_do_not_scale(self, query_budget):
+        """✅ Autores de reseñas y comentarios vienen en la misma query"""
+        listing = ListingFactory(available=True)
+        ListingPhotoFactory(listing=listing)
+        client = logged_client(StudentFactory().user)
+        url = reverse('listings:listing_detail', args=[listing.pk])
+
+        def add_activity(count):
+            for _ in range(count):
+                ReviewFactory(listing=listing)
+                parent = CommentFactory(listing=listing)
+                CommentFactory(listing=listing, parent=parent)
+
+        add_activity(1)
+        client.get(url)  # el carrusel queda en cache
+        with query_budget(label='1 reseña') as few:
+            client.get(url)
+
+        add_activity(6)
+        with query_budget(label='7 reseñas') as many:
+            response = client.get(url)
+
+        assert response.status_code == 200
+        assert len(many.context.captured_queries) == len(few.context.captured_queries)
+
+
+@pytest.mark.django_db
+class TestCommentPageQueries:
+    """Tests para el endpoint de ver más comentarios"""
+
+    @pytest.mark.query_budget(3)
+    def test_reply_counts_do_not_scale(self, query_budget):
+        """✅ Autores y conteo de respuestas vienen en la query de la página"""
+        listing = ListingFactory(available=True)
+        client = Client()
+        url = reverse('listings:comment_page', args=[listing.pk])
+
+        def add_threads(count):
+            for _ in range(count):
+                parent = CommentFactory(listing=listing)
+                CommentFactory(listing=listing, parent=parent)
+
+        add_threads(1)
+        with query_budget(label='1 hilo') as few:
+            client.get(url)
+
+        add_threads(6)
+        with query_budget(label='7 hilos') as many:
+            response = client.get(url)
+
+        assert response.status_code == 200
+        assert len(many.context.captured_queries) == len(few.context.captured_queries)
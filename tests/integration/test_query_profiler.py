@@ -0,0 +1,115 @@
+# tests/integration/test_query_profiler.py
+"""
+Tests para QueryProfilerMiddleware (umigo/middleware.py)
+
+- Apagado por defecto: sin cabeceras ni logs
+- Cabeceras X-DB-* solo para staff
+- Resumen clave=valor en el logger umigo.queries, con queries repetidas
+- Híbrido: bajo ASGI no adapta la cadena async a un thread
+"""
+
+import logging
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.test import AsyncClient
+from umigo.middleware import QueryProfile, QueryProfilerMiddleware, fingerprint
+
+
+@pytest.fixture
+def profiler(settings):
+    settings.QUERY_PROFILER_ENABLED = True
+    settings.QUERY_PROFILER_SAMPLE_RATE = 1.0
+    settings.QUERY_PROFILER_SLOW_MS = 100
+    return settings
+
+
+class TestFingerprint:
+    """Tests para la normalización de SQL"""
+
+    def test_in_lists_collapse_to_same_fingerprint(self):
+        """✅ IN con distinta cantidad de parámetros tiene la misma huella"""
+        assert fingerprint('SELECT * FROM t WHERE id IN (%s, %s)') == \
+            fingerprint('SELECT *  FROM t\nWHERE id IN (%s, %s, %s)')
+
+    def test_duplicates_only_counts_repeated(self):
+        """✅ duplicates() solo incluye huellas ejecutadas más de una vez"""
+        profile = QueryProfile()
+        profile.queries = [('SELECT 1', 1.0), ('SELECT 1', 2.0), ('SELECT 2', 5.0)]
+
+        assert profile.duplicates() == {'SELECT 1': 2}
+        assert profile.slowest(1) == [('SELECT 2', 5.0)]
+        assert profile.total_ms == 8.0
+
+
+@pytest.mark.django_db
+class TestQueryProfilerMiddleware:
+    """Tests del middleware sobre requests reales"""
+
+    def test_disabled_by_default(self, staff_client, caplog):
+        """✅ Sin QUERY_PROFILER_ENABLED no hay cabeceras ni logs"""
+        with caplog.at_level(logging.INFO, logger='umigo.queries'):
+            response = staff_client.get('/')
+
+        assert 'X-DB-Queries' not in response
+        assert not [r for r in caplog.records if r.name == 'umigo.queries']
+
+    def test_staff_gets_headers(self, profiler, staff_client):
+        """✅ Un usuario staff recibe el conteo de queries en cabeceras"""
+        response = staff_client.get('/')
+
+        assert int(response['X-DB-Queries']) >= 1
+        assert float(response['X-DB-Time-Ms']) >= 0
+        assert 'X-DB-Duplicates' in response
+
+    def test_regular_user_gets_no_headers(self, profiler, authenticated_client):
+        """✅ Usuarios no staff no ven las cabeceras"""
+        response = authenticated_client.get('/')
+
+        assert 'X-DB-Queries' not in response
+
+    def test_logs_summary(self, profiler, authenticated_client, caplog):
+        """✅ Cada request muestreado deja un resumen clave=valor"""
+        with caplog.at_level(logging.INFO, logger='umigo.queries'):
+            authenticated_client.get('/')
+
+        record = next(r for r in caplog.records if r.name == 'umigo.queries')
+        assert record.getMessage().startswith('request_queries method=GET path=/ ')
+        assert record.queries >= 1
+        assert isinstance(record.duplicates, dict)
+
+    def test_slow_queries_are_logged(self, profiler, authenticated_client, caplog):
+        """✅ Con umbral 0 toda query se registra como lenta"""
+        profiler.QUERY_PROFILER_SLOW_MS = 0
+
+        with caplog.at_level(logging.INFO, logger='umigo.queries'):
+            authenticated_client.get('/')
+
+        assert any(r.getMessage().startswith('slow_query ') for r in caplog.records)
+
+    def test_sample_rate_zero_skips_profiling(self, profiler, staff_client):
+        """✅ Con SAMPLE_RATE=0 no se perfila ningún request"""
+        profiler.QUERY_PROFILER_SAMPLE_RATE = 0.0
+
+        response = staff_client.get('/')
+
+        assert 'X-DB-Queries' not in response
+
+    def test_async_chain_stays_async(self, profiler):
+        """✅ Con un get_response async el middleware también es async"""
+        async def get_response(request):
+            return None
+
+        assert iscoroutinefunction(QueryProfilerMiddleware(get_response))
+        assert not iscoroutinefunction(QueryProfilerMiddleware(lambda request: None))
+
+    def test_async_request_counts_queries(self, profiler, staff_user, caplog):
+        """✅ Bajo ASGI se cuentan las queries que corren en el thread del ORM"""
+        client = AsyncClient()
+        client.force_login(staff_user)
+
+        with caplog.at_level(logging.INFO, logger='umigo.queries'):
+            response = async_to_sync(client.get)('/')
+
+        record = next(r for r in caplog.records if r.name == 'umigo.queries')
+        assert record.queries >= 1
+        assert int(response['X-DB-Queries']) == record.queries
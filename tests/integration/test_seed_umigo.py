@@ -0,0 +1,136 @@
+# tests/integration/test_seed_umigo.py
+"""
+Tests para el comando seed_umigo (datos sintéticos con bulk_create)
+
+- Cantidades y relaciones generadas
+- Coordenadas dentro del recuadro de la zona
+- Determinismo con la misma semilla
+- Un solo hash de contraseña para todos los usuarios
+"""
+
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from listings.management.commands.seed_umigo import DEFAULT_PROFILE, ZONE_PROFILES
+from listings.models import Comment, Favorite, Listing, ListingPhoto, Review
+from users.models import Landlord, Student, User
+
+
+def seed(prefix='seed', **options):
+    params = {
+        'landlords': 3,
+        'students': 6,
+        'listings': 10,
+        'chunk_landlords': 2,
+        'prefix': prefix,
+        **options,
+    }
+    out = StringIO()
+    call_command('seed_umigo', stdout=out, **params)
+    return out.getvalue()
+
+
+def seeded_listings(prefix):
+    return Listing.objects.filter(owner__user__username__startswith=f'{prefix}_').order_by('id')
+
+
+@pytest.mark.django_db
+class TestSeedUmigoCommand:
+    """Tests para seed_umigo"""
+
+    def test_creates_requested_volume(self):
+        """✅ Crea usuarios, perfiles, anuncios y sus relaciones"""
+        output = seed()
+
+        assert Landlord.objects.filter(user__username__startswith='seed_l').count() == 3
+        assert Student.objects.filter(user__username__startswith='seed_s').count() == 6
+        listings = seeded_listings('seed')
+        assert listings.count() == 10
+        assert ListingPhoto.objects.filter(listing__in=listings).count() >= 10
+        assert not Listing.objects.filter(pk__in=listings, photos__isnull=True).exists()
+        assert '10 anuncios' in output
+
+    def test_replies_stay_on_parent_listing(self):
+        """✅ Las respuestas se crean en el mismo anuncio que su comentario"""
+        seed(comments=6)
+
+        for reply in Comment.objects.filter(parent__isnull=False).select_related('parent'):
+            assert reply.listing_id == reply.parent.listing_id
+            assert hasattr(reply.author, 'landlord_profile')
+            assert reply.path == reply.parent.path + Comment.path_segment(reply.pk)
+            assert reply.depth == 1
+
+    def test_counters_match_generated_rows(self):
+        """✅ comment_count, review_count y rating_sum cuadran con lo sembrado"""
+        seed(comments=6)
+
+        listings = seeded_listings('seed')
+        assert Comment.objects.filter(listing__in=listings).exists()
+        assert Review.objects.filter(listing__in=listings).exists()
+        for listing in listings:
+            reviews = Review.objects.filter(listing=listing)
+            assert listing.comment_count == Comment.objects.filter(listing=listing).count()
+            assert listing.review_count == reviews.count()
+            assert listing.rating_sum == sum(reviews.values_list('rating', flat=True))
+
+    def test_coordinates_inside_zone_bounds(self):
+        """✅ lat/lng caen dentro del recuadro de la localidad"""
+        seed(listings=30)
+
+        for listing in seeded_listings('seed').select_related('zone'):
+            lat_min, lat_max, lng_min, lng_max = ZONE_PROFILES.get(listing.zone.name, DEFAULT_PROFILE)[0]
+            assert lat_min <= float(listing.lat) <= lat_max
+            assert lng_min <= float(listing.lng) <= lng_max
+
+    def test_same_seed_same_data(self):
+        """✅ Con la misma semilla se generan los mismos anuncios"""
+        seed(prefix='a', seed=7)
+        seed(prefix='b', seed=7)
+        seed(prefix='c', seed=8)
+
+        def snapshot(prefix):
+            return list(seeded_listings(prefix).values_list('price', 'lat', 'lng', 'zone_id', 'rooms'))
+
+        assert snapshot('a') == snapshot('b')
+        assert snapshot('a') != snapshot('c')
+        counts = [Review.objects.filter(listing__in=seeded_listings(p)).count() for p in 'ab']
+        assert counts[0] == counts[1]
+
+    def test_same_seed_same_favorites(self):
+        """✅ Los favoritos dependen solo de la semilla (no de los ids asignados)"""
+        seed(prefix='a', seed=7, favorites=4)
+        seed(prefix='b', seed=7, favorites=4)
+
+        def favorites(prefix):
+            return sorted(
+                (username.split('_', 1)[1], lat, lng)
+                for username, lat, lng in Favorite.objects
+                .filter(student__user__username__startswith=f'{prefix}_')
+                .values_list('student__user__username', 'listing__lat', 'listing__lng')
+            )
+
+        assert favorites('a')
+        assert favorites('a') == favorites('b')
+
+    def test_single_password_hash(self):
+        """✅ Todos los usuarios comparten un hash y pueden autenticarse"""
+        seed(password='clave-de-prueba-1')
+
+        hashes = set(User.objects.filter(username__startswith='seed_').values_list('password', flat=True))
+        assert len(hashes) == 1
+        assert User.objects.get(username='seed_s1').check_password('clave-de-prueba-1')
+
+    def test_favorites_are_unique(self):
+        """✅ Un estudiante no repite un anuncio en favoritos"""
+        seed(favorites=8)
+
+        pairs = list(Favorite.objects.values_list('student_id', 'listing_id'))
+        assert len(pairs) == len(set(pairs))
+
+    def test_existing_prefix_is_rejected(self):
+        """✅ No se puede sembrar dos veces con el mismo prefijo"""
+        seed()
+
+        with pytest.raises(CommandError, match='prefijo'):
+            seed()
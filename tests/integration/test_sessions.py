@@ -0,0 +1,67 @@
+# tests/integration/test_sessions.py
+"""
+Tests para la configuración de sesiones y el comando clear_expired_sessions
+
+- cached_db: un request autenticado no lee django_session
+- Limpieza en lotes: solo se borran sesiones vencidas
+"""
+
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+def run_command(*args):
+    out = StringIO()
+    call_command('clear_expired_sessions', *args, stdout=out)
+    return out.getvalue()
+
+
+def create_session(key, expire_date):
+    return Session.objects.create(session_key=key, session_data='', expire_date=expire_date)
+
+
+@pytest.mark.django_db
+class TestCachedSessions:
+    """Tests para SESSION_ENGINE=cached_db"""
+
+    def test_authenticated_request_does_not_read_session_table(self, authenticated_client):
+        """✅ Con la sesión en cache, el request no consulta django_session"""
+        authenticated_client.get('/')
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = authenticated_client.get('/')
+
+        assert response.status_code == 200
+        assert not any('django_session' in q['sql'] for q in ctx.captured_queries)
+
+
+@pytest.mark.django_db
+class TestClearExpiredSessions:
+    """Tests para la limpieza de sesiones vencidas en lotes"""
+
+    def test_deletes_only_expired_sessions(self):
+        """✅ Borra las vencidas y conserva las vigentes"""
+        now = timezone.now()
+        for n in range(5):
+            create_session(f'expired{n}', now - timedelta(days=n + 1))
+        create_session('active', now + timedelta(days=1))
+
+        output = run_command('--batch-size', '2')
+
+        assert list(Session.objects.values_list('session_key', flat=True)) == ['active']
+        assert '5 sesiones vencidas borradas en 3 lote(s)' in output
+
+    def test_dry_run_deletes_nothing(self):
+        """✅ --dry-run solo cuenta"""
+        create_session('expired', timezone.now() - timedelta(days=1))
+
+        output = run_command('--dry-run')
+
+        assert Session.objects.count() == 1
+        assert '1 sesiones vencidas se borrarían' in output
@@ -0,0 +1,71 @@
+# tests/integration/test_suspension_expiry.py
+"""
+Tests para el comando lift_expired_suspensions
+
+Reemplaza al EVENT evt_auto_unsuspend_users de MySQL: reactiva usuarios
+cuya suspensión ya terminó, en lotes e idempotente.
+"""
+
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.utils import timezone
+from tests.factories import UserFactory
+
+
+def run_command(*args):
+    out = StringIO()
+    call_command('lift_expired_suspensions', *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+class TestLiftExpiredSuspensions:
+    """Tests para la reactivación de suspensiones vencidas"""
+
+    def test_reactivates_only_expired_suspensions(self):
+        """✅ Solo se reactivan usuarios con suspension_end_at < hoy"""
+        today = timezone.localdate()
+        expired = UserFactory(is_active=False, suspension_end_at=today - timedelta(days=1))
+        ends_today = UserFactory(is_active=False, suspension_end_at=today)
+        still_suspended = UserFactory(is_active=False, suspension_end_at=today + timedelta(days=5))
+        deactivated = UserFactory(is_active=False, suspension_end_at=None)
+
+        run_command()
+
+        for user in (expired, ends_today, still_suspended, deactivated):
+            user.refresh_from_db()
+        assert expired.is_active is True
+        assert expired.suspension_end_at is None
+        assert ends_today.is_active is False
+        assert still_suspended.is_active is False
+        assert deactivated.is_active is False
+
+    def test_processes_in_batches_and_reports_counts(self):
+        """✅ Procesa en lotes y reporta los conteos"""
+        yesterday = timezone.localdate() - timedelta(days=1)
+        UserFactory.create_batch(5, is_active=False, suspension_end_at=yesterday)
+
+        output = run_command('--batch-size', '2')
+
+        assert '5 usuarios con suspensión vencida, 5 reactivados en 3 lote(s)' in output
+
+    def test_is_idempotent(self):
+        """✅ Ejecutarlo dos veces no tiene efectos dobles"""
+        UserFactory(is_active=False, suspension_end_at=timezone.localdate() - timedelta(days=3))
+
+        run_command()
+        output = run_command()
+
+        assert '0 usuarios con suspensión vencida' in output
+
+    def test_dry_run_does_not_modify(self):
+        """✅ --dry-run solo cuenta"""
+        user = UserFactory(is_active=False, suspension_end_at=timezone.localdate() - timedelta(days=1))
+
+        output = run_command('--dry-run')
+
+        user.refresh_from_db()
+        assert user.is_active is False
+        assert '1 se reactivarían' in output
@@ -0,0 +1 @@
+"""Performance benchmarks package (run on demand with -m slow)."""
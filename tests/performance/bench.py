@@ -0,0 +1,132 @@
+"""
+Utilidades mínimas para los benchmarks de tests/performance.
+
+Los benchmarks se marcan con @pytest.mark.slow y se corren a demanda (sin
+-m slow ni RUN_BENCHMARKS=1 se saltan, ver conftest.py):
+    pytest tests/performance -m slow -s
+
+save_results() guarda los resultados en BENCH_RESULTS_DIR/<commit>.json para
+comparar entre commits:
+    python -m tests.performance.bench results/abc1234.json results/def5678.json
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def summarize(timings):
+    """p50, p95 y media (ms) de una lista de latencias en ms."""
+    timings = sorted(timings)
+    return {
+        'p50': statistics.median(timings),
+        'p95': timings[max(0, int(round(len(timings) * 0.95)) - 1)],
+        'mean': statistics.fmean(timings),
+    }
+
+
+def timed(fn, runs=50, warmup=3):
+    """Latencias (ms) de `runs` llamadas a fn(), sin capturar queries."""
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def measure(fn, runs=50, warmup=3):
+    """
+    Ejecuta fn() `runs` veces y devuelve latencias (ms) y queries por llamada.
+
+    Returns:
+        dict con p50, p95, mean (ms) y queries (promedio por llamada)
+    """
+    for _ in range(warmup):
+        fn()
+
+    timings = []
+    with CaptureQueriesContext(connection) as ctx:
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        **summarize(timings),
+        'queries': len(ctx.captured_queries) / runs,
+    }
+
+
+def report(title, results, extra='queries'):
+    """Imprime una tabla con los resultados de measure() (visible con -s)."""
+    print(f"\n{title}")
+    print(f"  {'caso':<28}{'p50 ms':>10}{'p95 ms':>10}{extra:>10}")
+    for name, r in results.items():
+        print(f"  {name:<28}{r['p50']:>10.3f}{r['p95']:>10.3f}{r[extra]:>10.1f}")
+
+
+RESULTS_DIR = Path(os.getenv('BENCH_RESULTS_DIR', Path(__file__).parent / 'results'))
+
+
+def git_revision():
+    """Commit actual (con sufijo -dirty si hay cambios sin commitear)."""
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def save_results(suite, results, meta=None):
+    """
+    Agrega los resultados de `suite` a RESULTS_DIR/<commit>.json.
+
+    Cada suite se guarda bajo su propia clave, así varios benchmarks del mismo
+    commit comparten archivo. Devuelve la ruta escrita.
+    """
+    revision = git_revision()
+    path = RESULTS_DIR / f'{revision}.json'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.loads(path.read_text()) if path.exists() else {'revision': revision, 'suites': {}}
+    data['suites'][suite] = {
+        'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'meta': meta or {},
+        'results': results,
+    }
+    path.write_text(json.dumps(data, indent=2, sort_keys=True))
+    return path
+
+
+def compare(old_path, new_path, metric='p50'):
+    """Imprime la variación de `metric` por caso entre dos archivos de resultados."""
+    old = json.loads(Path(old_path).read_text())
+    new = json.loads(Path(new_path).read_text())
+    print(f"{old['revision']} -> {new['revision']} ({metric} ms)")
+    for suite, entry in new['suites'].items():
+        before = old['suites'].get(suite, {}).get('results', {})
+        print(f"\n{suite}")
+        for name, r in entry['results'].items():
+            if name not in before:
+                print(f"  {name:<28}{'nuevo':>10}{r[metric]:>10.3f}")
+                continue
+            delta = (r[metric] - before[name][metric]) / before[name][metric] * 100 if before[name][metric] else 0
+            print(f"  {name:<28}{before[name][metric]:>10.3f}{r[metric]:>10.3f}{delta:>+9.1f}%")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        sys.exit('uso: python -m tests.performance.bench <viejo.json> <nuevo.json>')
+    compare(sys.argv[1], sys.argv[2])
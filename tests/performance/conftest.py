@@ -0,0 +1,23 @@
+"""
+Los benchmarks de tests/performance solo corren a pedido, con un -m que
+mencione "slow" o con RUN_BENCHMARKS=1:
+    pytest tests/performance -m slow -s
+
+En un `pytest` normal se saltan, así no alargan la suite ni escriben en
+tests/performance/results.
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+PERFORMANCE_DIR = Path(__file__).parent
+
+
+def pytest_collection_modifyitems(config, items):
+    if 'slow' in (config.getoption('markexpr') or '') or os.getenv('RUN_BENCHMARKS') == '1':
+        return
+    skip = pytest.mark.skip(reason='Benchmark: correr con -m slow o RUN_BENCHMARKS=1')
+    for item in items:
+        if PERFORMANCE_DIR in item.path.parents:
+            item.add_marker(skip)
@@ -0,0 +1,143 @@
+"""
+Load test simple para comparar los modos de gunicorn (wsgi/gthread vs asgi/uvicorn).
+
+Contra un servidor ya levantado:
+    python tests/performance/loadtest.py --base-url http://localhost:8000 \\
+        --path / --path /listings/listings/ --concurrency 20 --duration 15
+
+Levantando gunicorn con gunicorn.conf.py en cada modo y comparando:
+    python tests/performance/loadtest.py --spawn wsgi --spawn asgi --port 8001
+
+Solo usa la librería estándar (threads + urllib) para poder correrlo dentro
+del contenedor web sin dependencias extra.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = max(0, int(round(len(sorted_values) * fraction)) - 1)
+    return sorted_values[index]
+
+
+def run_load(base_url, paths, concurrency, duration, timeout):
+    """Lanza `concurrency` threads que piden `paths` en ronda durante `duration` segundos."""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker(offset):
+        i = offset
+        while time.monotonic() < deadline:
+            url = base_url.rstrip('/') + paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=timeout) as response:
+                    response.read()
+                    ok = response.status < 500
+            except urllib.error.HTTPError as exc:
+                ok = exc.code < 500
+            except OSError:
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                (latencies if ok else errors).append(elapsed)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.monotonic() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': len(latencies) / wall if wall else 0.0,
+        'p50': statistics.median(latencies) if latencies else 0.0,
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+    }
+
+
+def wait_until_up(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(base_url, timeout=2).read()
+            return True
+        except urllib.error.HTTPError:
+            return True
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+
+def spawn_gunicorn(mode, port):
+    env = {**os.environ, 'GUNICORN_APP': mode, 'GUNICORN_BIND': f'127.0.0.1:{port}', 'GUNICORN_ACCESSLOG': ''}
+    return subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'],
+        cwd=BASE_DIR,
+        env=env,
+    )
+
+
+def print_table(results):
+    print(f"\n{'modo':<12}{'req':>8}{'err':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for label, r in results.items():
+        print(
+            f"{label:<12}{r['requests']:>8}{r['errors']:>6}{r['rps']:>10.1f}"
+            f"{r['p50']:>10.1f}{r['p95']:>10.1f}{r['p99']:>10.1f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default=None, help='Servidor ya levantado (ignora --spawn)')
+    parser.add_argument('--path', action='append', dest='paths', help='Ruta a pedir (repetible)')
+    parser.add_argument('--spawn', action='append', choices=['wsgi', 'asgi'], help='Modo de gunicorn a levantar (repetible)')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=15.0)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    args = parser.parse_args(argv)
+    paths = args.paths or ['/', '/listings/listings/']
+
+    results = {}
+    if args.base_url:
+        results['remoto'] = run_load(args.base_url, paths, args.concurrency, args.duration, args.timeout)
+    else:
+        for mode in args.spawn or ['wsgi', 'asgi']:
+            base_url = f'http://127.0.0.1:{args.port}'
+            process = spawn_gunicorn(mode, args.port)
+            try:
+                if not wait_until_up(base_url):
+                    print(f'gunicorn ({mode}) no respondió', file=sys.stderr)
+                    return 1
+                results[mode] = run_load(base_url, paths, args.concurrency, args.duration, args.timeout)
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+
+    print_table(results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
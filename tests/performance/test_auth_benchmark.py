@@ -0,0 +1,88 @@
+# tests/performance/test_auth_benchmark.py
+"""
+Benchmark de registro y login (validadores + hashing)
+
+Mide p50/p95 de:
+- Registro: validate_password() + make_password()
+- Login: check_password()
+con PBKDF2 (default) y Argon2 ajustado (si argon2-cffi está instalado).
+Correr con:
+    pytest tests/performance/test_auth_benchmark.py -m slow -s
+"""
+
+import pytest
+from django.contrib.auth.hashers import check_password, get_hasher, make_password
+from django.contrib.auth.password_validation import (
+    get_default_password_validators,
+    validate_password,
+)
+
+from tests.factories import UserFactory
+from tests.performance.bench import measure, report
+from users.passwordValidation import CustomUserCommonPasswordValidator, load_common_passwords
+
+PASSWORD = 'Umig0-Benchmark!'
+
+HASHERS = {
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'argon2': 'users.hashers.TunedArgon2PasswordHasher',
+}
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestCommonPasswordList:
+    """La lista de contraseñas comunes se carga una vez por proceso"""
+
+    def test_validators_share_cached_frozenset(self):
+        """✅ Dos instancias del validador comparten el mismo frozenset"""
+        first = CustomUserCommonPasswordValidator()
+        second = CustomUserCommonPasswordValidator()
+
+        assert isinstance(first.passwords, frozenset)
+        assert first.passwords is second.passwords
+        assert len(first.passwords) > 10000
+
+    def test_cold_vs_warm_load(self):
+        """✅ Instanciar el validador con la lista precargada es casi gratis"""
+        path = str(CustomUserCommonPasswordValidator().DEFAULT_PASSWORD_LIST_PATH)
+
+        def cold():
+            load_common_passwords.cache_clear()
+            load_common_passwords(path)
+
+        results = {
+            'lista en frío (gzip)': measure(cold, runs=10),
+            'lista precargada': measure(CustomUserCommonPasswordValidator, runs=10),
+        }
+        report('Carga de contraseñas comunes', results)
+
+        assert results['lista precargada']['p50'] < results['lista en frío (gzip)']['p50']
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestAuthBenchmark:
+    """p50/p95 de registro y login por hasher"""
+
+    @pytest.mark.parametrize('hasher', sorted(HASHERS))
+    def test_signup_and_login_latency(self, settings, hasher):
+        """✅ Registro y login con cada hasher (reporta p50/p95)"""
+        if hasher == 'argon2':
+            pytest.importorskip('argon2')
+        settings.PASSWORD_HASHERS = [HASHERS[hasher]]
+        get_default_password_validators()
+        user = UserFactory.build(username='bench', email='bench@example.com')
+        encoded = make_password(PASSWORD)
+
+        results = {
+            f'{hasher} registro': measure(
+                lambda: (validate_password(PASSWORD, user), make_password(PASSWORD)),
+                runs=5, warmup=1,
+            ),
+            f'{hasher} login': measure(lambda: check_password(PASSWORD, encoded), runs=5, warmup=1),
+        }
+        report(f'Auth con {hasher}', results)
+
+        assert check_password(PASSWORD, encoded)
+        assert not get_hasher().must_update(encoded)
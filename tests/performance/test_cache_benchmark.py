@@ -0,0 +1,68 @@
+# tests/performance/test_cache_benchmark.py
+"""
+Benchmark de los backends de cache (CACHE_BACKEND en settings)
+
+Mide get/set de un fragmento HTML típico (~5 KB) en locmem, file, shm y
+Redis (solo si REDIS_URL responde). Correr con:
+    pytest tests/performance/test_cache_benchmark.py -m slow -s
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from tests.performance.bench import report, summarize, timed
+
+FRAGMENT = '<div class="listing-card">' + 'x' * 5000 + '</div>'
+KEYS = [f'bench:fragment:{n}' for n in range(200)]
+SHM_DIR = f'/dev/shm/umigo-bench-{os.getpid()}'
+
+
+def build_backends(tmp_path):
+    backends = {
+        'locmem': LocMemCache('bench', {}),
+        'file': FileBasedCache(str(tmp_path / 'file-cache'), {}),
+    }
+    if Path('/dev/shm').is_dir():
+        backends['shm'] = FileBasedCache(SHM_DIR, {})
+
+    redis_url = os.getenv('REDIS_URL')
+    if redis_url:
+        try:
+            from django.core.cache.backends.redis import RedisCache
+
+            redis_cache = RedisCache(f"{redis_url.rstrip('/')}/15", {})
+            redis_cache.get('bench:ping')
+            backends['redis'] = redis_cache
+        except Exception:
+            pass
+    return backends
+
+
+@pytest.mark.slow
+class TestCacheBackendBenchmark:
+    """p50/p95 de set y get por backend"""
+
+    def test_backends_get_and_set(self, tmp_path):
+        """✅ Todos los backends guardan y devuelven el fragmento (reporta latencias)"""
+        results = {}
+        for name, backend in build_backends(tmp_path).items():
+            keys = iter(KEYS * 10)
+            set_timings = timed(lambda: backend.set(next(keys), FRAGMENT), runs=len(KEYS), warmup=0)
+            keys = iter(KEYS * 10)
+            get_timings = timed(lambda: backend.get(next(keys)), runs=len(KEYS), warmup=0)
+
+            assert backend.get(KEYS[0]) == FRAGMENT
+            backend.clear()
+
+            results[f'{name} set'] = {**summarize(set_timings), 'ops': len(set_timings)}
+            results[f'{name} get'] = {**summarize(get_timings), 'ops': len(get_timings)}
+
+        shutil.rmtree(SHM_DIR, ignore_errors=True)
+
+        report('Cache: fragmento de 5 KB', results, extra='ops')
+        assert {'locmem set', 'file get'} <= set(results)
@@ -0,0 +1,67 @@
+# tests/performance/test_db_connection_benchmark.py
+"""
+Benchmark de conexiones a BD por request
+
+Simula el ciclo de un request (request_started → query → request_finished)
+con CONN_MAX_AGE=0 (conexión nueva + init_command en cada request) y con
+conexiones persistentes + CONN_HEALTH_CHECKS. Correr contra MySQL con:
+    pytest tests/performance/test_db_connection_benchmark.py -m slow -s
+"""
+
+import pytest
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+from tests.performance.bench import report, summarize, timed
+from users.models import User
+
+REQUESTS = 100
+
+
+def simulate_request():
+    request_started.send(sender=None)
+    try:
+        User.objects.filter(pk=0).exists()
+    finally:
+        request_finished.send(sender=None)
+
+
+def run_requests(conn_max_age, health_checks):
+    connects = []
+
+    def on_connect(sender, connection, **kwargs):
+        connects.append(connection.alias)
+
+    saved = {key: connection.settings_dict[key] for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+    connection.settings_dict.update(CONN_MAX_AGE=conn_max_age, CONN_HEALTH_CHECKS=health_checks)
+    connection.close()
+    connection_created.connect(on_connect)
+    try:
+        timings = timed(simulate_request, runs=REQUESTS, warmup=0)
+    finally:
+        connection_created.disconnect(on_connect)
+        connection.settings_dict.update(saved)
+        connection.close()
+
+    return {**summarize(timings), 'connects': len(connects)}
+
+
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+class TestConnectionReuseBenchmark:
+    """Conexiones abiertas por cada REQUESTS requests"""
+
+    def test_persistent_connections_remove_per_request_connect(self):
+        """✅ Con CONN_MAX_AGE > 0 se abre 1 conexión en lugar de 1 por request"""
+        if getattr(connection, 'is_in_memory_db', lambda: False)():
+            pytest.skip('SQLite en memoria nunca cierra la conexión; correr contra MySQL')
+
+        results = {
+            'CONN_MAX_AGE=0': run_requests(0, False),
+            'CONN_MAX_AGE=60 + checks': run_requests(60, True),
+        }
+        report(f'Conexiones por {REQUESTS} requests', results, extra='connects')
+
+        assert results['CONN_MAX_AGE=0']['connects'] == REQUESTS
+        assert results['CONN_MAX_AGE=60 + checks']['connects'] == 1
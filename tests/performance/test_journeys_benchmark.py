@@ -0,0 +1,179 @@
+# tests/performance/test_journeys_benchmark.py
+"""
+Benchmark de los recorridos principales de usuarios
+
+Siembra un dataset con tests/factories (arrendadores, anuncios con fotos,
+reseñas, comentarios y favoritos) y mide latencia, queries y throughput de:
+- navegar la lista pública con filtros
+- ver el detalle de un anuncio
+- agregar y quitar un favorito
+- comentar
+- publicar un anuncio con fotos
+- reportar un anuncio
+
+Los resultados quedan en tests/performance/results/<commit>.json (ver bench.py).
+Tamaño del dataset y repeticiones con BENCH_LANDLORDS y BENCH_RUNS:
+    BENCH_LANDLORDS=20 pytest tests/performance/test_journeys_benchmark.py -m slow -s
+"""
+
+import io
+import itertools
+import os
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.urls import reverse
+from PIL import Image
+
+from listings.models import Listing
+from tests.factories import (
+    CommentFactory,
+    FavoriteFactory,
+    LandlordFactory,
+    ListingFactory,
+    ListingPhotoFactory,
+    ReviewFactory,
+    StudentFactory,
+)
+from tests.performance.bench import measure, report, save_results
+
+LANDLORDS = int(os.getenv('BENCH_LANDLORDS', '5'))
+LISTINGS_PER_LANDLORD = 4
+PHOTOS_PER_LISTING = 2
+STUDENTS = 10
+COMMENTS_PER_LISTING = 3
+REVIEWS_PER_LISTING = 2
+FAVORITES_PER_STUDENT = 3
+RUNS = int(os.getenv('BENCH_RUNS', '20'))
+
+
+def png_upload(name):
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), 'white').save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+def logged_client(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+@pytest.fixture
+def dataset(db):
+    landlords = LandlordFactory.create_batch(LANDLORDS)
+    students = StudentFactory.create_batch(STUDENTS)
+    listings = []
+    for landlord in landlords:
+        for _ in range(LISTINGS_PER_LANDLORD):
+            listing = ListingFactory(owner=landlord, available=True)
+            ListingPhotoFactory.create_batch(PHOTOS_PER_LISTING, listing=listing)
+            CommentFactory.create_batch(COMMENTS_PER_LISTING, listing=listing, author=students[0].user)
+            for student in students[:REVIEWS_PER_LISTING]:
+                ReviewFactory(listing=listing, author=student)
+            listings.append(listing)
+    for student in students:
+        for listing in listings[:FAVORITES_PER_STUDENT]:
+            FavoriteFactory(student=student, listing=listing)
+    return {'landlords': landlords, 'students': students, 'listings': listings}
+
+
+def journey(fn):
+    """measure() más throughput secuencial (un solo cliente)."""
+    result = measure(fn, runs=RUNS, warmup=2)
+    result['rps'] = 1000 / result['mean'] if result['mean'] else 0
+    return result
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestUserJourneysBenchmark:
+    """Latencia, queries y throughput por recorrido"""
+
+    def test_core_journeys(self, dataset):
+        """✅ Todos los recorridos responden y quedan registrados en JSON"""
+        listings = dataset['listings']
+        students = dataset['students']
+        # authenticatedLayout.html solo muestra el contenido a usuarios logueados
+        student_client = logged_client(students[-1].user)
+        landlord_client = logged_client(dataset['landlords'][0].user)
+
+        detail_ids = itertools.cycle(listing.pk for listing in listings)
+        favorite_ids = itertools.cycle(listing.pk for listing in listings[FAVORITES_PER_STUDENT:])
+        # Un reporte por (estudiante, anuncio): nunca se repite el par
+        report_pairs = iter(itertools.product(
+            [logged_client(student.user) for student in students],
+            [listing.pk for listing in listings],
+        ))
+        browse_params = {
+            'zone': listings[0].zone_id,
+            'price_max': '9999999',
+            'rooms_min': '1',
+            'order': 'price_asc',
+        }
+
+        def browse():
+            response = student_client.get(reverse('listings:listing_public_list'), browse_params)
+            assert response.status_code == 200
+
+        def detail():
+            response = student_client.get(reverse('listings:listing_detail', args=[next(detail_ids)]))
+            assert response.status_code == 200
+
+        def favorite():
+            pk = next(favorite_ids)
+            assert student_client.post(reverse('listings:addFavorite', args=[pk])).status_code == 302
+            assert student_client.post(reverse('listings:removeFavorite', args=[pk])).status_code == 302
+
+        def comment():
+            response = student_client.post(
+                reverse('listings:comment_create', args=[next(detail_ids)]),
+                {'text': 'Comentario de benchmark'},
+            )
+            assert response.status_code == 302
+
+        def create_listing():
+            response = landlord_client.post(reverse('listings:listing_create'), {
+                'price': '1200000.00',
+                'location_text': 'Calle 45 # 13-20',
+                'lat': '4.636000',
+                'lng': '-74.066000',
+                'zone': listings[0].zone_id,
+                'rooms': 2,
+                'bathrooms': 1,
+                'shared_with_people': 1,
+                'utilities_price': '150000.00',
+                'available': 'on',
+                'images': [png_upload('a.png'), png_upload('b.png')],
+            })
+            assert response.status_code == 302
+
+        def file_report():
+            client, pk = next(report_pairs)
+            response = client.post(
+                reverse('inquiries:report_listing', args=[pk]),
+                {'reason': 'Anuncio con información engañosa'},
+            )
+            assert response.status_code == 302
+
+        listings_before = Listing.objects.count()
+        results = {
+            'lista con filtros': journey(browse),
+            'detalle': journey(detail),
+            'favorito (agregar+quitar)': journey(favorite),
+            'comentar': journey(comment),
+            'publicar con 2 fotos': journey(create_listing),
+            'reportar anuncio': journey(file_report),
+        }
+        report('Recorridos de usuario', results)
+        path = save_results('journeys', results, meta={
+            'landlords': LANDLORDS,
+            'listings': len(listings),
+            'students': STUDENTS,
+            'runs': RUNS,
+        })
+        print(f"\n  resultados: {path}")
+
+        assert Listing.objects.count() == listings_before + RUNS + 2
+        assert all(r['rps'] > 0 for r in results.values())
@@ -0,0 +1,68 @@
+# tests/performance/test_login_benchmark.py
+"""
+Benchmark del update de last_login en el login
+
+Compara el receiver original de Django (user.save(update_fields=...), que
+recorre pre_save/post_save) contra users.signals.update_last_login (UPDATE
+directo). Correr con:
+    pytest tests/performance/test_login_benchmark.py -m slow -s
+"""
+
+import pytest
+from django.contrib.auth.models import update_last_login as django_update_last_login
+from django.db import connection
+from django.db.models.signals import pre_save
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tests.factories import UserFactory
+from tests.performance.bench import measure, report
+from users.models import User
+from users.signals import update_last_login
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestLastLoginBenchmark:
+    """Benchmark de queries y latencia por login"""
+
+    def test_last_login_receiver_before_and_after(self):
+        """✅ El receiver nuevo hace 1 UPDATE y no pasa por save()"""
+        user = User.objects.get(pk=UserFactory().pk)
+
+        results = {
+            'django (save)': measure(lambda: django_update_last_login(User, user)),
+            'umigo (UPDATE directo)': measure(lambda: update_last_login(User, user)),
+        }
+        report('last_login por login', results)
+
+        assert results['umigo (UPDATE directo)']['queries'] == 1
+        assert results['umigo (UPDATE directo)']['queries'] <= results['django (save)']['queries']
+
+    def test_login_view_uses_single_last_login_update(self, client):
+        """✅ El POST de login solo escribe last_login con un UPDATE de esa columna"""
+        user = UserFactory()
+        saves = []
+
+        def track_save(sender, **kwargs):
+            saves.append(kwargs['instance'].pk)
+
+        pre_save.connect(track_save, sender=User)
+        try:
+            with CaptureQueriesContext(connection) as ctx:
+                response = client.post(
+                    reverse('users:login'),
+                    {'username': user.username, 'password': 'testpass123'},
+                )
+        finally:
+            pre_save.disconnect(track_save, sender=User)
+
+        assert response.status_code == 302
+        user_updates = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('UPDATE') and 'users_user' in q['sql']
+        ]
+        assert len(user_updates) == 1
+        assert 'last_login' in user_updates[0]
+        assert 'is_active' not in user_updates[0]
+        assert saves == []
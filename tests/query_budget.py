@@ -0,0 +1,60 @@
+"""
+Presupuestos de queries por test y comparación contra una línea base.
+
+El fixture `query_budget` (tests/conftest.py) registra aquí las queries de
+cada bloque medido. Al final de la sesión se comparan con
+tests/query_baseline.json y los cambios se escriben en QUERY_REPORT_PATH
+(default tests/performance/results/query_report.json).
+
+Para actualizar la línea base tras un cambio intencional:
+    QUERY_BASELINE_UPDATE=1 pytest tests/integration/test_query_budgets.py
+"""
+import json
+import os
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).parent / 'query_baseline.json'
+REPORT_PATH = Path(os.getenv(
+    'QUERY_REPORT_PATH',
+    Path(__file__).parent / 'performance' / 'results' / 'query_report.json',
+))
+
+# {"<nodeid>" o "<nodeid>::<label>": queries} de la sesión actual
+recorded = {}
+
+
+def load_baseline(path=BASELINE_PATH):
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def compare(baseline, current):
+    """Tests cuyo conteo cambió, tests nuevos y (con baseline) sin cambios."""
+    changed = {
+        key: {'baseline': baseline[key], 'current': count}
+        for key, count in current.items()
+        if key in baseline and baseline[key] != count
+    }
+    new = {key: count for key, count in current.items() if key not in baseline}
+    return {'changed': changed, 'new': new}
+
+
+def finish(terminal):
+    """Escribe el reporte (y la línea base si se pidió) y lo resume en consola."""
+    if not recorded:
+        return
+
+    baseline = load_baseline()
+    report = compare(baseline, recorded)
+    REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    REPORT_PATH.write_text(json.dumps(report, indent=2, sort_keys=True, ensure_ascii=False))
+
+    if os.getenv('QUERY_BASELINE_UPDATE'):
+        BASELINE_PATH.write_text(json.dumps({**baseline, **recorded}, indent=2, sort_keys=True, ensure_ascii=False) + '\n')
+
+    if report['changed'] or report['new']:
+        terminal.section('query budgets')
+        for key, counts in sorted(report['changed'].items()):
+            terminal.line(f"{counts['baseline']:>4} -> {counts['current']:<4} {key}")
+        for key, count in sorted(report['new'].items()):
+            terminal.line(f"nuevo {count:<4} {key}")
+        terminal.line(f"reporte: {REPORT_PATH}")
@@ -284,3 +284,71 @@ class TestUserRelationships:
         user.refresh_from_db()
         with pytest.raises(Student.DoesNotExist):
             _ = user.student_profile
+
+
+# ============================================================================
+# LANDLORD DEACTIVATION SIGNAL TESTS
+# ============================================================================
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestLandlordDeactivationSignal:
+    """Test the pre_save signal that hides listings of deactivated users."""
+
+    def test_deactivating_landlord_hides_listings(self):
+        """✅ Desactivar al usuario oculta todos sus listings"""
+        from listings.models import Listing
+        from tests.factories import ListingFactory
+
+        landlord = LandlordFactory()
+        ListingFactory.create_batch(2, owner=landlord, available=True)
+        user = User.objects.get(pk=landlord.user_id)
+
+        user.is_active = False
+        user.save()
+
+        assert not Listing.objects.filter(owner=landlord, available=True).exists()
+
+    def test_reactivating_does_not_restore_listings(self):
+        """✅ Reactivar al usuario NO vuelve a publicar sus listings"""
+        from listings.models import Listing
+        from tests.factories import ListingFactory
+
+        landlord = LandlordFactory()
+        listing = ListingFactory(owner=landlord, available=True)
+        user = landlord.user
+
+        user.is_active = False
+        user.save()
+        user.is_active = True
+        user.save()
+
+        listing.refresh_from_db()
+        assert listing.available is False
+
+    def test_hand_built_instance_hides_listings(self):
+        """✅ Un User(pk=...) construido a mano consulta is_active en BD y oculta listings"""
+        from listings.models import Listing
+        from tests.factories import ListingFactory
+
+        landlord = LandlordFactory()
+        ListingFactory.create_batch(2, owner=landlord, available=True)
+        stored = User.objects.get(pk=landlord.user_id)
+        user = User(**{field.attname: getattr(stored, field.attname) for field in User._meta.concrete_fields})
+
+        user.is_active = False
+        user.save()
+
+        assert not Listing.objects.filter(owner=landlord, available=True).exists()
+
+    def test_save_without_deactivation_does_not_query_state(self, django_assert_num_queries):
+        """✅ Un save() que no desactiva no hace SELECT extra (solo el UPDATE)"""
+        user = User.objects.get(pk=UserFactory().pk)
+
+        with django_assert_num_queries(1):
+            user.last_login = timezone.now()
+            user.save(update_fields=['last_login'])
+
+        with django_assert_num_queries(1):
+            user.first_name = 'Nuevo'
+            user.save()
@@ -0,0 +1,89 @@
+# tests/unit/test_password_validation.py
+"""
+Tests para CharacterTypesValidator y la normalización de nombres de usuario
+
+- Fuzz: el scanner de una pasada da el mismo resultado que las expresiones
+  regulares originales
+- Tiempo: entradas adversarias de 10k caracteres se validan en tiempo lineal
+"""
+
+import random
+import re
+import time
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from users.forms import collapse_spaces
+from users.passwordValidation import CharacterTypesValidator, has_required_character_types
+
+ORIGINAL_PATTERN = "^([^0-9]*|[^A-Z]*|[^a-z]*|[a-zA-Z0-9]*)$"
+ALPHABET = "aZ09 !_-.\n\téÉ٣Ａ"
+
+ADVERSARIAL = {
+    'solo minúsculas': 'a' * 10000,
+    'sin especial': 'aA1' * 3333 + 'a',
+    'especial al final': 'aA1' * 3333 + '!',
+    'salto de línea final': 'aA1' * 3333 + '\n',
+    'dígitos unicode': 'aA!' + '٣' * 9997,
+    'espacios': ' ' * 10000,
+}
+
+
+def fuzz_samples(count=3000, seed=2024):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 12)))
+
+
+@pytest.mark.unit
+class TestCharacterTypesValidator:
+    """Tests para el scanner de tipos de caracter"""
+
+    def test_matches_original_regex(self):
+        """✅ Mismo resultado que el patrón original en entradas aleatorias"""
+        for password in fuzz_samples():
+            rejected_before = re.search(ORIGINAL_PATTERN, password) is not None
+            assert has_required_character_types(password) is not rejected_before, repr(password)
+
+    def test_validator_accepts_and_rejects(self):
+        """✅ El validador acepta contraseñas completas y rechaza las incompletas"""
+        validator = CharacterTypesValidator()
+        validator.validate('Umigo-2025')
+
+        for password in ['umigo-2025', 'UMIGO-2025', 'Umigo-umigo', 'Umigo2025', 'Umigo2025\n']:
+            with pytest.raises(ValidationError):
+                validator.validate(password)
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize('name', sorted(ADVERSARIAL))
+    def test_adversarial_inputs_are_linear(self, name):
+        """✅ Entradas de 10k caracteres: el doble de largo cuesta ~el doble"""
+        password = ADVERSARIAL[name]
+
+        def elapsed(value, repeat=20):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                has_required_character_types(value)
+            return time.perf_counter() - start
+
+        small = elapsed(password)
+        large = elapsed(password * 4)
+
+        assert small < 0.5
+        # 4x la entrada: con margen amplio para ruido, lejos de un costo cuadrático (16x)
+        assert large < small * 10 + 0.01
+
+
+@pytest.mark.unit
+class TestCollapseSpaces:
+    """Tests para la normalización de espacios del nombre de usuario"""
+
+    def test_matches_original_substitution(self):
+        """✅ Mismo resultado que re.sub('  +', ' ', ...)"""
+        for value in fuzz_samples():
+            assert collapse_spaces(value) == re.sub("  +", " ", value)
+
+    def test_collapses_long_runs(self):
+        """✅ Secuencias largas de espacios quedan en uno solo"""
+        assert collapse_spaces('Ana' + ' ' * 10000 + 'María') == 'Ana María'
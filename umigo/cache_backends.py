@@ -0,0 +1,46 @@
+"""
+Backends de cache que cuentan aciertos y fallos en umigo_cache_requests_total.
+
+Se usan en lugar de los de Django cuando METRICS_ENABLED (ver cache_config en
+settings). El alias llega en la clave METRICS_NAME de la configuración del cache.
+"""
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache
+
+from umigo.metrics import CACHE_REQUESTS
+
+_MISSING = object()
+
+
+class InstrumentedCacheMixin:
+    def __init__(self, location, params):
+        super().__init__(location, params)
+        name = params.get('METRICS_NAME', location)
+        self._hits = CACHE_REQUESTS.labels(name, 'hit')
+        self._misses = CACHE_REQUESTS.labels(name, 'miss')
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            self._misses.inc()
+            return default
+        self._hits.inc()
+        return value
+
+class InstrumentedLocMemCache(InstrumentedCacheMixin, LocMemCache):
+    pass
+
+
+class InstrumentedFileBasedCache(InstrumentedCacheMixin, FileBasedCache):
+    pass
+
+
+class InstrumentedRedisCache(InstrumentedCacheMixin, RedisCache):
+    # locmem/file resuelven get_many con get(); Redis usa MGET y se cuenta aparte
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = super().get_many(keys, version)
+        self._hits.inc(len(found))
+        self._misses.inc(len(keys) - len(found))
+        return found
@@ -0,0 +1,158 @@
+"""
+Métricas Prometheus de UMIGO.
+
+- MetricsMiddleware: latencia y cantidad de queries por request, etiquetadas
+  con el nombre de la URL (listing_public_list, listing_detail, ...).
+- umigo.cache_backends: aciertos/fallos de cada cache nombrado.
+- ReportQueueCollector: tamaño de la cola de moderación, calculado al leer
+  /metrics (no en cada request).
+
+MetricsMiddleware es híbrido (sync y async), igual que
+umigo.middleware.QueryProfilerMiddleware, para no forzar las vistas async a
+un thread bajo ASGI.
+
+Con varios workers de gunicorn, PROMETHEUS_MULTIPROC_DIR debe apuntar a un
+directorio compartido ANTES de arrancar: cada proceso escribe sus contadores
+en archivos mmap y /metrics los agrega (ver gunicorn.conf.py).
+"""
+import os
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.models import Count, Q
+from django.utils import timezone
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from .middleware import wrap_queries
+
+REQUEST_LATENCY = Histogram(
+    'umigo_request_duration_seconds',
+    'Duración del request por nombre de URL',
+    ['view', 'method'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter(
+    'umigo_requests_total',
+    'Requests atendidos por nombre de URL y código de estado',
+    ['view', 'method', 'status'],
+)
+DB_QUERIES = Histogram(
+    'umigo_request_db_queries',
+    'Queries SQL ejecutadas por request',
+    ['view'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+CACHE_REQUESTS = Counter(
+    'umigo_cache_requests_total',
+    'Lecturas de cache por alias y resultado (hit/miss)',
+    ['cache', 'result'],
+)
+
+
+class QueryCounter:
+    """execute_wrapper mínimo: solo cuenta queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.url_name or match.view_name or 'unnamed'
+
+
+class ReportQueueCollector:
+    """Reportes pendientes de moderación (totales y con lease vigente)."""
+
+    def collect(self):
+        # Import diferido: este módulo se carga al crear los caches, antes que las apps
+        from inquiries.models import Report
+
+        totals = Report.objects.filter(status='UNDER_REVIEW').aggregate(
+            pending=Count('pk'),
+            claimed=Count('pk', filter=Q(claimed_until__gt=timezone.now())),
+        )
+        gauge = GaugeMetricFamily(
+            'umigo_report_queue_size',
+            'Reportes en estado UNDER_REVIEW',
+            labels=['state'],
+        )
+        gauge.add_metric(['pending'], totals['pending'])
+        gauge.add_metric(['claimed'], totals['claimed'])
+        yield gauge
+
+
+def build_registry():
+    """Registry para /metrics: agrega los archivos multiproceso si corresponde."""
+    registry = CollectorRegistry()
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        MultiProcessCollector(registry)
+    else:
+        for collector in (REQUEST_LATENCY, REQUESTS, DB_QUERIES, CACHE_REQUESTS):
+            registry.register(collector)
+    registry.register(ReportQueueCollector())
+    return registry
+
+
+def render_metrics():
+    return generate_latest(build_registry()), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """
+    Registra latencia, código de estado y cantidad de queries de cada request.
+    Va primero en MIDDLEWARE para medir también al resto de middlewares.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with wrap_queries(counter, ['default']):
+            response = self.get_response(request)
+        return self.observe(request, response, counter, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        # execute_wrapper es por thread: se instala en el de sync_to_async del request
+        stack = await sync_to_async(wrap_queries)(counter, ['default'])
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.observe(request, response, counter, time.perf_counter() - start)
+
+    def observe(self, request, response, counter, duration):
+        view = view_label(request)
+        REQUEST_LATENCY.labels(view, request.method).observe(duration)
+        REQUESTS.labels(view, request.method, str(response.status_code)).inc()
+        DB_QUERIES.labels(view).observe(counter.count)
+        return response
@@ -0,0 +1,172 @@
+"""
+Middleware de perfilado de queries por request (opt-in).
+
+Activación (settings / variables de entorno):
+    QUERY_PROFILER_ENABLED=True        habilita el middleware
+    QUERY_PROFILER_SAMPLE_RATE=0.05    fracción de requests perfilados
+    QUERY_PROFILER_SLOW_MS=100         umbral de query lenta (ms)
+
+Por cada request muestreado registra, con connection.execute_wrapper:
+- cantidad de queries y tiempo total en BD
+- queries repetidas (misma "huella": SQL con listas IN colapsadas)
+- las QUERY_PROFILER_TOP queries más lentas
+
+El resumen va al logger "umigo.queries" (formato clave=valor, con los datos
+completos en `extra`) y, si el usuario es staff, a las cabeceras
+X-DB-Queries, X-DB-Time-Ms y X-DB-Duplicates.
+
+Es un middleware híbrido (sync y async): bajo ASGI no obliga a adaptar las
+vistas async a un thread. execute_wrapper vale por thread, así que en modo
+async se instala con wrap_queries dentro del thread de sync_to_async del
+request (thread_sensitive), que es donde corren las queries del ORM.
+"""
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('umigo.queries')
+
+_IN_LIST = re.compile(r'IN \((?:%s|\?)(?:, (?:%s|\?))*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """SQL normalizado para agrupar queries repetidas (IN (%s, %s, ...) → IN (...))."""
+    return _IN_LIST.sub('IN (...)', _WHITESPACE.sub(' ', sql)).strip()
+
+
+class QueryProfile:
+    """execute_wrapper que acumula (sql, duración en ms) de cada query."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - start) * 1000))
+
+    @property
+    def total_ms(self):
+        return sum(duration for _, duration in self.queries)
+
+    def duplicates(self):
+        """{huella: repeticiones} de las queries ejecutadas más de una vez."""
+        counts = Counter(fingerprint(sql) for sql, _ in self.queries)
+        return {sql: count for sql, count in counts.items() if count > 1}
+
+    def slowest(self, limit):
+        return sorted(self.queries, key=lambda query: query[1], reverse=True)[:limit]
+
+
+def wrap_queries(wrapper, aliases=None):
+    """
+    ExitStack con `wrapper` instalado en las conexiones de este thread
+    (todas, o solo `aliases`). Se cierra con .close() en el mismo thread.
+    """
+    stack = ExitStack()
+    targets = [connections[alias] for alias in aliases] if aliases else connections.all()
+    for connection in targets:
+        stack.enter_context(connection.execute_wrapper(wrapper))
+    return stack
+
+
+class QueryProfilerMiddleware:
+    """
+    Perfila las queries de una muestra de requests. Va primero en MIDDLEWARE
+    para incluir también las queries de sesión y autenticación.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.QUERY_PROFILER_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.QUERY_PROFILER_SAMPLE_RATE
+        self.slow_ms = settings.QUERY_PROFILER_SLOW_MS
+        self.top = settings.QUERY_PROFILER_TOP
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = QueryProfile()
+        with wrap_queries(profile):
+            response = self.get_response(request)
+        return self.finish(request, response, profile)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        profile = QueryProfile()
+        stack = await sync_to_async(wrap_queries)(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, profile)
+
+    def finish(self, request, response, profile):
+        self.log(request, response, profile)
+
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated and user.is_staff:
+            response['X-DB-Queries'] = str(len(profile.queries))
+            response['X-DB-Time-Ms'] = f'{profile.total_ms:.1f}'
+            response['X-DB-Duplicates'] = str(sum(count - 1 for count in profile.duplicates().values()))
+        return response
+
+    def log(self, request, response, profile):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else ''
+        duplicates = profile.duplicates()
+        slowest = [
+            {'sql': sql[:500], 'ms': round(duration, 2)}
+            for sql, duration in profile.slowest(self.top)
+        ]
+
+        logger.info(
+            "request_queries method=%s path=%s view=%s status=%s queries=%s db_ms=%.1f duplicated=%s",
+            request.method,
+            request.path,
+            view,
+            response.status_code,
+            len(profile.queries),
+            profile.total_ms,
+            len(duplicates),
+            extra={
+                'view': view,
+                'status': response.status_code,
+                'queries': len(profile.queries),
+                'db_ms': round(profile.total_ms, 2),
+                'duplicates': duplicates,
+                'slowest': slowest,
+            },
+        )
+
+        for sql, duration in profile.queries:
+            if duration >= self.slow_ms:
+                logger.warning(
+                    "slow_query view=%s ms=%.1f sql=%s",
+                    view,
+                    duration,
+                    sql[:500],
+                    extra={'view': view, 'ms': round(duration, 2), 'sql': sql},
+                )
@@ -54,6 +54,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'umigo.metrics.MetricsMiddleware',
+    'umigo.middleware.QueryProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,14 +65,28 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Perfilado de queries por request (umigo/middleware.py); apagado por defecto
+QUERY_PROFILER_ENABLED = os.getenv('QUERY_PROFILER_ENABLED', 'False').lower() == 'true'
+QUERY_PROFILER_SAMPLE_RATE = float(os.getenv('QUERY_PROFILER_SAMPLE_RATE', '1.0'))
+QUERY_PROFILER_SLOW_MS = float(os.getenv('QUERY_PROFILER_SLOW_MS', '100'))
+QUERY_PROFILER_TOP = int(os.getenv('QUERY_PROFILER_TOP', '5'))
+
 ROOT_URLCONF = 'umigo.urls'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if not DEBUG:
+    # Producción: cada template se compila una sola vez por proceso
+    TEMPLATE_LOADERS = [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'], 
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -96,13 +112,105 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        # Conexiones persistentes: cada worker reutiliza su conexión durante
+        # DB_CONN_MAX_AGE segundos (0 = una conexión nueva por request)
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '0')),
+        # Verifica la conexión reutilizada al inicio de cada request (solo si CONN_MAX_AGE > 0)
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true',
         'OPTIONS': {
             'charset': 'utf8mb4',
-            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
         },
     }
 }
 
+# Bajo ASGI (GUNICORN_APP=asgi) cada llamada al ORM corre en un thread del
+# executor y las conexiones persistentes se acumulan sin cerrarse: Django
+# recomienda desactivarlas, así que DB_CONN_MAX_AGE se ignora en ese modo
+if os.getenv('GUNICORN_APP', 'wsgi').lower() == 'asgi':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
+# sql_mode: si el servidor ya arranca con --sql-mode=STRICT_TRANS_TABLES
+# (docker-compose.prod.yaml), DB_SET_SQL_MODE=False evita el SET por conexión
+if os.getenv('DB_SET_SQL_MODE', 'True').lower() == 'true':
+    DATABASES['default']['OPTIONS']['init_command'] = "SET sql_mode='STRICT_TRANS_TABLES'"
+
+
+# Métricas Prometheus en /metrics (umigo/metrics.py)
+# Con varios workers, PROMETHEUS_MULTIPROC_DIR debe estar definido en el entorno
+# antes de arrancar gunicorn (ver gunicorn.conf.py)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False').lower() == 'true'
+# Si está definido, /metrics exige "Authorization: Bearer <METRICS_TOKEN>"
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+INSTRUMENTED_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache': 'umigo.cache_backends.InstrumentedLocMemCache',
+    'django.core.cache.backends.filebased.FileBasedCache': 'umigo.cache_backends.InstrumentedFileBasedCache',
+    'django.core.cache.backends.redis.RedisCache': 'umigo.cache_backends.InstrumentedRedisCache',
+}
+
+
+# Cache
+# CACHE_BACKEND elige el backend de todas las caches con nombre:
+# - locmem (default): por proceso, no se comparte entre workers de gunicorn
+# - file: FileBasedCache en CACHE_DIR, compartida entre workers del mismo host
+# - shm: igual que file pero en /dev/shm (memoria compartida, sin disco)
+# - redis: RedisCache en REDIS_URL, una base de datos de Redis por cache
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem').lower()
+CACHE_DIR = os.getenv('CACHE_DIR', '/dev/shm/umigo-cache' if CACHE_BACKEND == 'shm' else '/tmp/umigo-cache')
+REDIS_URL = os.getenv('REDIS_URL', 'redis://redis:6379').rstrip('/')
+
+# alias: (timeout por defecto en segundos, base de datos de Redis)
+CACHE_ALIASES = {
+    'default': (300, 0),
+    'sessions': (1209600, 1),  # = SESSION_COOKIE_AGE por defecto (2 semanas)
+    'ratelimit': (3600, 2),
+    'fragments': (3600, 3),
+}
+
+
+def cache_config(alias, timeout, redis_db):
+    if CACHE_BACKEND == 'redis':
+        config = {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': f'{REDIS_URL}/{redis_db}',
+            'TIMEOUT': timeout,
+        }
+    elif CACHE_BACKEND in ('file', 'shm'):
+        config = {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(CACHE_DIR, alias),
+            'TIMEOUT': timeout,
+            'OPTIONS': {'MAX_ENTRIES': 10000},
+        }
+    else:
+        config = {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': f'umigo-{alias}',
+            'TIMEOUT': timeout,
+        }
+    if METRICS_ENABLED:
+        # Mismo backend, contando hits/misses por alias (umigo/cache_backends.py)
+        config['BACKEND'] = INSTRUMENTED_CACHE_BACKENDS[config['BACKEND']]
+        config['METRICS_NAME'] = alias
+    return config
+
+
+CACHES = {
+    alias: cache_config(alias, timeout, redis_db)
+    for alias, (timeout, redis_db) in CACHE_ALIASES.items()
+}
+
+# Vistas públicas de listings servidas en su variante async (ver listings/urls.py).
+# Ej: LISTINGS_ASYNC_VIEWS=listing_public_list,listing_detail junto con GUNICORN_APP=asgi
+LISTINGS_ASYNC_VIEWS = {name.strip() for name in os.getenv('LISTINGS_ASYNC_VIEWS', '').split(',') if name.strip()}
+
+# Visitas del beacon de detalle (listings/analytics.py): se escriben agrupadas cada
+# LISTING_VIEWS_FLUSH_SECONDS o al juntar LISTING_VIEWS_FLUSH_MAX por worker. 0 = en cada visita
+LISTING_VIEWS_FLUSH_SECONDS = float(os.getenv('LISTING_VIEWS_FLUSH_SECONDS', '0'))
+LISTING_VIEWS_FLUSH_MAX = int(os.getenv('LISTING_VIEWS_FLUSH_MAX', '500'))
+# Un visitante (usuario o IP) suma una sola visita por anuncio en esta ventana. 0 = sin filtro
+LISTING_VIEW_DEDUP_SECONDS = int(os.getenv('LISTING_VIEW_DEDUP_SECONDS', '1800'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -122,6 +230,24 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# PASSWORD_HASHER=argon2 usa users.hashers.TunedArgon2PasswordHasher (requiere
+# argon2-cffi). Los hashes PBKDF2 existentes siguen validando y se migran a
+# Argon2 en el siguiente login.
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', '2'))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', '19456'))  # KiB
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', '1'))
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'users.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+if os.getenv('PASSWORD_HASHER', 'pbkdf2').lower() == 'argon2':
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(2))
+
 AUTH_USER_MODEL = "users.User"
 
 # Internationalization
@@ -162,6 +288,36 @@ EMAIL_PORT = 587
 EMAIL_HOST_USER = str(os.getenv('EMAIL_USER'))
 EMAIL_HOST_PASSWORD = str(os.getenv('EMAIL_PASSWORD'))
 
+# Logging: salida a consola (docker logs) con formato clave=valor
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'keyvalue': {
+            'format': 'time=%(asctime)s level=%(levelname)s logger=%(name)s %(message)s',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'keyvalue',
+        },
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': os.getenv('LOG_LEVEL', 'INFO'),
+    },
+}
+
+# Sesiones: se leen de la cache "sessions" y se respaldan en django_session
+# (cached_db). Un request autenticado no consulta la BD mientras la sesión
+# esté en cache. Las vencidas se borran con `manage.py clear_expired_sessions`.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Mensajes en cookie: messages.success/error no escriben la sesión
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+
 # Messages framework - Bootstrap 5 CSS classes mapping
 from django.contrib.messages import constants as messages
 MESSAGE_TAGS = {
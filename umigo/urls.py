@@ -23,6 +23,7 @@ from . import views
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', views.home, name="home"),
+    path('metrics', views.metrics, name="metrics"),
     path('users/', include('users.urls')),
     path('listings/', include('listings.urls')),
     path('inquiries/', include('inquiries.urls')),
@@ -10,6 +10,18 @@ class UsersConfig(AppConfig):
         Importa signals cuando la app se inicializa.
         
         Este método se ejecuta una vez cuando Django arranca,
-        registrando todos los signals definidos en users/signals.py
+        registrando todos los signals definidos en users/signals.py.
+
+        También cambia el receiver de last_login de django.contrib.auth por
+        users.signals.update_last_login (un UPDATE sin pasar por save()),
+        y precarga los validadores de contraseña (lista de contraseñas comunes).
         """
-        import users.signals  # noqa: F401
+        from django.contrib.auth.password_validation import get_default_password_validators
+        from django.contrib.auth.signals import user_logged_in
+
+        import users.signals
+
+        user_logged_in.disconnect(dispatch_uid='update_last_login')
+        user_logged_in.connect(users.signals.update_last_login, dispatch_uid='update_last_login')
+
+        get_default_password_validators()
@@ -6,6 +6,14 @@ from django.utils.translation import gettext_lazy as _
 
 from .models import User, Student, Landlord
 
+_REPEATED_SPACES = re.compile(" {2,}")
+
+
+def collapse_spaces(value):
+    """Reemplaza cada secuencia de 2+ espacios por uno solo (una pasada, patrón precompilado)."""
+    return _REPEATED_SPACES.sub(" ", value)
+
+
 class CustomUserChangeForm(UserChangeForm):
     email = forms.EmailField(label = "Correo")
     first_name = forms.CharField(label = "Nombre")
@@ -76,7 +84,7 @@ class CustomUserCreationForm(UserCreationForm):
 
     def save(self, commit=True):
         user = super(CustomUserCreationForm, self).save(commit=False)
-        user.username = re.sub("  +", " ", self.cleaned_data["first_name"]) + " " + re.sub("  +", " ", self.cleaned_data["last_name"])
+        user.username = collapse_spaces(self.cleaned_data["first_name"]) + " " + collapse_spaces(self.cleaned_data["last_name"])
 
         if commit:
             user.save()
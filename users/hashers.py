@@ -0,0 +1,27 @@
+"""
+Password hashers de UMIGO.
+
+TunedArgon2PasswordHasher es el Argon2PasswordHasher de Django con parámetros
+configurables desde settings (ARGON2_TIME_COST, ARGON2_MEMORY_COST,
+ARGON2_PARALLELISM). Se activa con PASSWORD_HASHER=argon2 y requiere
+argon2-cffi.
+
+El algoritmo sigue siendo "argon2", así que los hashes son compatibles con el
+hasher estándar de Django, y must_update() re-hashea en el siguiente login
+cualquier hash creado con otros parámetros.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id con los parámetros de settings.
+
+    Por defecto usa el perfil mínimo recomendado por OWASP (19 MiB, t=2, p=1):
+    con workers gthread varios hashes corren en paralelo, así que
+    parallelism=1 evita sobre-suscribir CPU y la memoria por login queda acotada.
+    """
+    time_cost = getattr(settings, 'ARGON2_TIME_COST', 2)
+    memory_cost = getattr(settings, 'ARGON2_MEMORY_COST', 19456)
+    parallelism = getattr(settings, 'ARGON2_PARALLELISM', 1)
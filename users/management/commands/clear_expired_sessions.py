@@ -0,0 +1,82 @@
+"""
+Borra las sesiones vencidas de django_session en lotes.
+
+Alternativa a `python manage.py clearsessions`, que ejecuta un único
+DELETE ... WHERE expire_date < NOW() sobre toda la tabla y puede bloquearla
+por varios segundos. Aquí cada lote toma las claves más antiguas por
+django_session_expire_date_idx y las borra por clave primaria.
+
+Uso:
+    python manage.py clear_expired_sessions
+    python manage.py clear_expired_sessions --batch-size 500 --sleep 0.1
+    python manage.py clear_expired_sessions --dry-run
+
+Con SESSION_ENGINE=cached_db las entradas de la cache "sessions" vencen
+solas (mismo timeout que la sesión), así que no hace falta tocarlas.
+"""
+import time
+
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = "Borra sesiones vencidas de django_session en lotes por expire_date."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Sesiones borradas por lote (default: 1000)',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Segundos de pausa entre lotes para no saturar la BD',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo cuenta las sesiones vencidas',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            expired = Session.objects.filter(expire_date__lt=timezone.now()).count()
+            self.stdout.write(self.style.SUCCESS(f"{expired} sesiones vencidas se borrarían."))
+            return
+
+        deleted, batches = self.clear_expired(
+            batch_size=options['batch_size'],
+            sleep=options['sleep'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"{deleted} sesiones vencidas borradas en {batches} lote(s)."
+        ))
+
+    def clear_expired(self, batch_size=1000, sleep=0):
+        """
+        Borra lotes de sesiones con expire_date < ahora, de la más antigua a la
+        más nueva, hasta que no quede ninguna.
+
+        Returns:
+            tuple: (sesiones borradas, lotes)
+        """
+        now = timezone.now()
+        expired = Session.objects.filter(expire_date__lt=now).order_by('expire_date')
+
+        deleted = batches = 0
+        while True:
+            keys = list(expired.values_list('session_key', flat=True)[:batch_size])
+            if not keys:
+                break
+
+            batches += 1
+            deleted += Session.objects.filter(session_key__in=keys, expire_date__lt=now).delete()[0]
+            if sleep:
+                time.sleep(sleep)
+
+        return deleted, batches
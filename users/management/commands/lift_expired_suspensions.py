@@ -0,0 +1,103 @@
+"""
+Reactiva a los usuarios cuya suspensión ya terminó.
+
+Reemplaza al EVENT evt_auto_unsuspend_users y al trigger
+trg_check_suspension_on_login de MySQL, que no existen en SQLite y
+requieren el event_scheduler activo en producción.
+
+Uso:
+    python manage.py lift_expired_suspensions
+    python manage.py lift_expired_suspensions --batch-size 500 --dry-run
+    python manage.py lift_expired_suspensions --interval 3600   # modo worker
+
+Es idempotente: cada UPDATE vuelve a comprobar las condiciones, así que
+puede ejecutarse varias veces (o en paralelo) sin efectos dobles. Si se
+interrumpe, la siguiente ejecución continúa con los usuarios que falten.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Reactiva usuarios con suspension_end_at vencida, en lotes por índice."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Usuarios procesados por lote (default: 1000)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo cuenta los usuarios que se reactivarían',
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Segundos entre ejecuciones; si es 0 se ejecuta una sola vez',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            scanned, reactivated, batches = self.lift_expired(
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run'],
+            )
+            verb = 'se reactivarían' if options['dry_run'] else 'reactivados'
+            self.stdout.write(self.style.SUCCESS(
+                f"{scanned} usuarios con suspensión vencida, {reactivated} {verb} "
+                f"en {batches} lote(s)."
+            ))
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
+
+    def lift_expired(self, batch_size=1000, dry_run=False):
+        """
+        Recorre los usuarios suspendidos con suspension_end_at < hoy en orden
+        (suspension_end_at, id), usando idx_users_user_suspension_end, y
+        los reactiva lote por lote.
+
+        Returns:
+            tuple: (usuarios encontrados, usuarios reactivados, lotes)
+        """
+        today = timezone.localdate()
+        expired = User.objects.filter(
+            is_active=False,
+            suspension_end_at__isnull=False,
+            suspension_end_at__lt=today,
+        )
+
+        scanned = reactivated = batches = 0
+        last_end_at, last_pk = None, None
+        while True:
+            page = expired.order_by('suspension_end_at', 'pk')
+            if last_pk is not None:
+                page = page.filter(
+                    Q(suspension_end_at__gt=last_end_at)
+                    | Q(suspension_end_at=last_end_at, pk__gt=last_pk)
+                )
+            rows = list(page.values_list('suspension_end_at', 'pk')[:batch_size])
+            if not rows:
+                break
+
+            batches += 1
+            scanned += len(rows)
+            last_end_at, last_pk = rows[-1]
+            if not dry_run:
+                reactivated += expired.filter(pk__in=[pk for _, pk in rows]).update(
+                    is_active=True,
+                    suspension_end_at=None,
+                )
+            else:
+                reactivated += len(rows)
+
+        return scanned, reactivated, batches
@@ -26,6 +26,20 @@ class User(AbstractUser):
     class Meta:
         managed = False
         db_table = 'users_user'
+        indexes = [
+            models.Index(fields=['suspension_end_at'], name='idx_users_user_suspension_end'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Guarda el is_active leído de la BD para que los signals detecten la
+        transición activo → inactivo sin otro SELECT en cada save().
+        """
+        instance = super().from_db(db, field_names, values)
+        if 'is_active' in field_names:
+            instance._loaded_is_active = values[field_names.index('is_active')]
+        return instance
 
     def __str__(self):
         return self.username
@@ -1,4 +1,6 @@
-import re
+import functools
+import gzip
+import string
 from django.core.exceptions import (
     ValidationError,
 )
@@ -38,16 +40,65 @@ class CustomUserAttributeSimilarityValidator(UserAttributeSimilarityValidator):
         return "Tu contraseña no puede ser muy similar al resto de información que ingresas."
     
 
+@functools.lru_cache(maxsize=None)
+def load_common_passwords(password_list_path):
+    """
+    Lee (y descomprime) la lista de contraseñas comunes una sola vez por proceso.
+
+    Django relee el .gz de 20k entradas cada vez que se instancia el
+    validador; aquí queda como frozenset compartido. UsersConfig.ready()
+    lo precarga para que no lo pague la primera petición de registro.
+    """
+    try:
+        with gzip.open(password_list_path, "rt", encoding="utf-8") as f:
+            return frozenset(x.strip() for x in f)
+    except OSError:
+        with open(password_list_path) as f:
+            return frozenset(x.strip() for x in f)
+
+
 class CustomUserCommonPasswordValidator(CommonPasswordValidator):
+    def __init__(self, password_list_path=None):
+        if password_list_path is None:
+            password_list_path = self.DEFAULT_PASSWORD_LIST_PATH
+        self.passwords = load_common_passwords(str(password_list_path))
+
     def get_error_message(self):
         return "La contraseña escogida es muy común."
 
     def get_help_text(self):
         return "Tu contraseña no puede ser una contraseña comúnmente utilizada."
     
+_DIGITS = frozenset(string.digits)
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_LOWERCASE = frozenset(string.ascii_lowercase)
+_ALPHANUMERIC = _DIGITS | _UPPERCASE | _LOWERCASE
+
+
+def has_required_character_types(password):
+    """
+    True si la contraseña tiene dígito, mayúscula, minúscula y un caracter
+    especial (cualquiera fuera de [a-zA-Z0-9]), todos ASCII.
+
+    Recorre la contraseña una sola vez (set()) en lugar de la alternancia
+    ^([^0-9]*|[^A-Z]*|[^a-z]*|[a-zA-Z0-9]*)$, que re-escanea el texto por cada
+    rama. Mantiene su semántica exacta: como `$` también acepta un "\n"
+    final, ese salto de línea no cuenta como caracter especial.
+    """
+    if password.endswith("\n"):
+        password = password[:-1]
+    chars = set(password)
+    return (
+        not chars.isdisjoint(_DIGITS)
+        and not chars.isdisjoint(_UPPERCASE)
+        and not chars.isdisjoint(_LOWERCASE)
+        and not chars <= _ALPHANUMERIC
+    )
+
+
 class CharacterTypesValidator:
     def validate(self, password, user=None):
-        if re.search("^([^0-9]*|[^A-Z]*|[^a-z]*|[a-zA-Z0-9]*)$", password):
+        if not has_required_character_types(password):
             raise ValidationError(
                 self.get_error_message(),
                 code="password_not_alphanumeric_and_special_char",
@@ -4,10 +4,15 @@ Signals para el módulo de usuarios.
 Este módulo contiene signals que se ejecutan automáticamente
 cuando ocurren ciertos eventos en los modelos de usuarios.
 """
-from django.db.models.signals import pre_save
+import logging
+
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
+
+from users.models import Landlord, User
 
-from users.models import User, Landlord
+logger = logging.getLogger(__name__)
 
 
 @receiver(pre_save, sender=User)
@@ -40,41 +45,87 @@ def deactivate_landlord_listings_on_user_deactivate(sender, instance: User, **kw
     - Este signal funciona en dev/SQLite y producción/MySQL
     - El Trigger 12 en MySQL hace lo mismo (redundancia es buena aquí)
     - Si ambos se ejecutan, es idempotente (ambos ponen available=False)
+
+    RENDIMIENTO:
+    - El estado anterior sale de User._loaded_is_active (guardado en from_db),
+      así que un save() normal (p. ej. last_login en el login) no hace SELECT.
+    - Solo si la instancia no viene de la BD (User(pk=...)) se consulta is_active.
+    - Los listings se ocultan con un único UPDATE cuyo filtro de owner es una
+      subconsulta sobre landlord, sin cargar el Landlord. (Con owner__user_id
+      MySQL resolvería el JOIN con un SELECT de pks previo al UPDATE.)
     
     Args:
         sender: La clase del modelo (User)
         instance: La instancia del User siendo guardada
         **kwargs: Argumentos adicionales del signal
     """
-    # Si es usuario nuevo (no tiene pk), no aplica
+    # Si es usuario nuevo (no tiene pk), no aplica. No se mira _state.adding:
+    # un User(pk=...) construido a mano también lo tiene en True
     if not instance.pk:
         return
-    
-    # Obtener el estado anterior del usuario desde la BD
-    try:
-        old_user = User.objects.get(pk=instance.pk)
-    except User.DoesNotExist:
-        # Usuario no existe aún en BD (caso raro pero posible)
+
+    # save(update_fields=[...]) que no toca is_active (ej. last_login)
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'is_active' not in update_fields:
         return
-    
-    # Detectar transición: activo → inactivo
-    if old_user.is_active and not instance.is_active:
-        # Verificar si este usuario tiene perfil de Landlord
-        try:
-            landlord = Landlord.objects.get(user=instance)
-        except Landlord.DoesNotExist:
-            # No es landlord, no hacer nada
-            return
-        
-        # Importar aquí para evitar circular imports
-        from listings.models import Listing
-        
-        # Marcar como NO disponibles todos los listings activos de este landlord
-        updated_count = Listing.objects.filter(
-            owner=landlord,
-            available=True
-        ).update(available=False)
-        
-        # Log para debugging (opcional, puedes comentarlo en producción)
-        if updated_count > 0:
-            print(f"[SIGNAL] Ocultados {updated_count} listings del landlord {landlord.user.username} (user_id={instance.pk})")
+
+    # Solo interesa la transición hacia inactivo
+    if instance.is_active:
+        return
+
+    was_active = getattr(instance, '_loaded_is_active', None)
+    if was_active is None:
+        # Instancia construida a mano: no conocemos su estado en BD
+        was_active = (
+            User.objects
+            .filter(pk=instance.pk)
+            .values_list('is_active', flat=True)
+            .first()
+        )
+
+    if not was_active:
+        return
+
+    # Importar aquí para evitar circular imports
+    from listings.models import Listing
+
+    # Marcar como NO disponibles todos los listings activos de este usuario
+    # (si no es landlord, el UPDATE simplemente no afecta filas)
+    hidden_count = Listing.objects.filter(
+        owner__in=Landlord.objects.filter(user_id=instance.pk).values('pk'),
+        available=True
+    ).update(available=False)
+
+    if hidden_count > 0:
+        logger.info(
+            "landlord_listings_hidden user_id=%s hidden_count=%s",
+            instance.pk,
+            hidden_count,
+            extra={'user_id': instance.pk, 'hidden_count': hidden_count},
+        )
+
+
+@receiver(post_save, sender=User)
+def remember_saved_user_state(sender, instance: User, **kwargs):
+    """
+    Tras guardar, el estado en BD es el de la instancia: se actualiza
+    _loaded_is_active para que el próximo save() compare contra él.
+    """
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None or 'is_active' in update_fields:
+        instance._loaded_is_active = instance.is_active
+
+
+def update_last_login(sender, user, **kwargs):
+    """
+    Reemplaza a django.contrib.auth.models.update_last_login.
+
+    La versión de Django hace user.save(update_fields=['last_login']), que
+    recorre pre_save/post_save en cada login. Aquí basta un UPDATE directo
+    de la columna: last_login nunca cambia is_active, así que no hay nada
+    que revisar en deactivate_landlord_listings_on_user_deactivate.
+
+    Se conecta en UsersConfig.ready() con el mismo dispatch_uid que Django.
+    """
+    user.last_login = timezone.now()
+    type(user)._default_manager.filter(pk=user.pk).update(last_login=user.last_login)